@@ -1,4 +1,5 @@
 import streamlit as st
+from interfaz import precarga
 
 st.set_page_config(
     page_title="Simulador TAC",
@@ -39,3 +40,5 @@ st.markdown(
 """
 )
 
+# la primera visita deja listo el simulador para las demás páginas y sesiones
+precarga()
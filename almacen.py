@@ -0,0 +1,156 @@
+"""Almacén en disco de resultados de barridos.
+
+Cada barrido se guarda en un directorio con arreglos .npy abiertos como
+memmap: los parámetros P (N, 7), la grilla de tiempo t y las trayectorias
+completas Y (N, 5, n_t). Los bloques se escriben a medida que terminan, de
+modo que la memoria no crece con el tamaño del barrido, y las lecturas
+(valores finales, una trayectoria, exportaciones) tocan sólo lo necesario.
+"""
+import os
+import csv
+import json
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from modelo import PARAMETROS, Reactor
+
+
+VARIABLES = ("Ca", "Cb", "Cc", "Cm", "T")
+FINALES = ("Ca_final", "Cb_final", "Cc_final", "Cm_final", "T_final", "X_final")
+
+DIRECTORIO = os.environ.get("TAC_RESULTADOS_DIR",
+                            os.path.join(tempfile.gettempdir(), "tac_barridos"))
+
+
+class AlmacenBarrido:
+    """Trayectorias de un barrido guardadas por bloques en memmaps .npy"""
+
+    def __init__(self, directorio, modo="r"):
+        self.directorio = directorio
+        with open(os.path.join(directorio, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.V = self.meta["V"]
+        self.P = np.load(os.path.join(directorio, "P.npy"), mmap_mode="r")
+        self.t = np.load(os.path.join(directorio, "t.npy"))
+        self.Y = np.load(os.path.join(directorio, "Y.npy"), mmap_mode=modo)
+        self.hecho = np.load(os.path.join(directorio, "hecho.npy"), mmap_mode=modo)
+
+    @classmethod
+    def crear(cls, P, V, t_eval, directorio=None, **meta):
+        """Reserva en disco el espacio para len(P) trayectorias"""
+        P = np.atleast_2d(np.asarray(P, dtype=float))
+        os.makedirs(DIRECTORIO, exist_ok=True)
+        directorio = directorio or tempfile.mkdtemp(prefix="barrido_", dir=DIRECTORIO)
+        os.makedirs(directorio, exist_ok=True)
+
+        np.save(os.path.join(directorio, "P.npy"), P)
+        np.save(os.path.join(directorio, "t.npy"), np.asarray(t_eval, dtype=float))
+        np.lib.format.open_memmap(os.path.join(directorio, "Y.npy"), mode="w+",
+                                  dtype=float, shape=(len(P), 5, len(t_eval))).flush()
+        np.lib.format.open_memmap(os.path.join(directorio, "hecho.npy"), mode="w+",
+                                  dtype=bool, shape=(len(P),)).flush()
+        with open(os.path.join(directorio, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(dict(meta, V=V), f)
+        return cls(directorio, modo="r+")
+
+    def __len__(self):
+        return len(self.P)
+
+    @property
+    def completo(self):
+        return bool(self.hecho.all())
+
+    def escribir(self, idx, Y):
+        """Guarda el bloque Y (len(idx), 5, n_t) en las filas idx"""
+        self.Y[idx] = Y
+        self.Y.flush()
+        self.hecho[idx] = True
+        self.hecho.flush()
+
+    # --- lecturas perezosas ---
+
+    def trayectoria(self, i):
+        return np.array(self.Y[i])
+
+    def finales(self, idx=None, bloque=4096):
+        """Tabla (n, 6) con los valores finales y la conversión de las filas idx"""
+        idx = np.arange(len(self)) if idx is None else np.asarray(idx)
+        salida = np.empty((len(idx), len(FINALES)))
+        for a in range(0, len(idx), bloque):
+            sel = idx[a:a + bloque]
+            y = np.array(self.Y[sel, :, -1])
+            salida[a:a + bloque, :5] = y
+            for k, (i, Ca) in enumerate(zip(sel, y[:, 0])):
+                salida[a + k, 5] = Reactor.desde_fila(self.P[i], self.V).conversion(Ca)
+        return salida
+
+    def filas_resumen(self, bloque=4096):
+        """Itera las filas (parámetros..., finales...) por bloques"""
+        for a in range(0, len(self), bloque):
+            sel = np.arange(a, min(a + bloque, len(self)))
+            yield from np.hstack([self.P[sel], self.finales(sel)]).tolist()
+
+    def filas_trayectorias(self, bloque=256):
+        """Itera filas (punto, parámetros..., t, Ca..T) en formato largo"""
+        for a in range(0, len(self), bloque):
+            Yb = np.array(self.Y[a:a + bloque])
+            for k, Yi in enumerate(Yb):
+                p = self.P[a + k].tolist()
+                for j, t in enumerate(self.t):
+                    yield [a + k] + p + [t] + Yi[:, j].tolist()
+
+    # --- exportaciones ---
+
+    def exportar_csv(self, trayectorias=False):
+        """Escribe el CSV en el directorio del almacén por bloques y devuelve la ruta.
+        Un barrido terminado no cambia, así que el archivo se genera una sola vez."""
+        nombre = "trayectorias.csv" if trayectorias else "resumen.csv"
+        ruta = os.path.join(self.directorio, nombre)
+        if os.path.exists(ruta):
+            return ruta
+        if trayectorias:
+            encabezado = ["punto", *PARAMETROS, "t", *VARIABLES]
+            filas = self.filas_trayectorias()
+        else:
+            encabezado = [*PARAMETROS, *FINALES]
+            filas = self.filas_resumen()
+        _escribir_csv(ruta, encabezado, filas)
+        return ruta
+
+    def eliminar(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+
+def _escribir_csv(ruta, encabezado, filas):
+    tmp = ruta + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(encabezado)
+        w.writerows(filas)
+    os.replace(tmp, ruta)
+
+
+def _escribir_excel(ruta, encabezado, filas, hoja):
+    # libro en modo write_only: las filas se vuelcan sin armar la hoja en memoria
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(hoja)
+    ws.append(list(encabezado))
+    for fila in filas:
+        ws.append(fila)
+    tmp = ruta + ".tmp"
+    wb.save(tmp)
+    os.replace(tmp, ruta)
+    return ruta
+
+
+# Un hilo alcanza: openpyxl no escala con más hilos y así no compite con el barrido
+_hilo_excel = ThreadPoolExecutor(max_workers=1)
+
+
+def excel_en_segundo_plano(ruta, encabezado, filas, hoja="Barrido"):
+    """Genera el Excel en un hilo aparte y devuelve el Future con la ruta"""
+    return _hilo_excel.submit(_escribir_excel, ruta, encabezado, filas, hoja)
@@ -0,0 +1,80 @@
+import os
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from modelo import Reactor
+
+
+# Pools de procesos compartidos entre reruns de Streamlit (el módulo queda
+# importado en el servidor, así que los workers se crean una sola vez).
+# Se usa "spawn" para no hacer fork del servidor, que tiene hilos activos.
+# Hay un pool por cantidad de workers: los comparten el emulador, el
+# optimizador, los mapas y los hilos de trabajos, y cerrar uno para cambiar
+# de tamaño cancelaría en silencio lo que otro tiene en vuelo.
+_pools = {}
+_lock = threading.Lock()
+
+
+def obtener_pool(workers=None):
+    workers = workers or os.cpu_count() or 1
+    with _lock:
+        if workers not in _pools:
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers,
+                                                  mp_context=multiprocessing.get_context("spawn"))
+        return _pools[workers]
+
+
+@atexit.register
+def cerrar_pool():
+    with _lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def _resolver_bloque(P, V, t_span, t_eval, y0, method, rtol, atol):
+    # cada punto se resuelve por separado, igual que en el barrido en serie,
+    # para que el resultado no dependa del tamaño de bloque; los que fallan quedan en NaN
+    Y = np.full((len(P), 5, len(t_eval)), np.nan)
+    for i, fila in enumerate(P):
+        sol = Reactor.desde_fila(fila, V).simulate(t_span, t_eval, y0=y0, method=method,
+                                                   rtol=rtol, atol=atol)
+        if sol.success:
+            Y[i] = sol.y
+    return Y
+
+
+def barrido_paralelo(P, V, t_span, t_eval, y0=None, chunk=8, workers=None,
+                     method="BDF", rtol=1e-3, atol=1e-6):
+    """Reparte el barrido en bloques de `chunk` puntos y va devolviendo
+    (indices, Y) a medida que termina cada bloque"""
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    pool = obtener_pool(workers)
+
+    futuros = {}
+    for inicio in range(0, len(P), chunk):
+        idx = np.arange(inicio, min(inicio + chunk, len(P)))
+        fut = pool.submit(_resolver_bloque, P[idx], V, t_span, t_eval, y0,
+                          method, rtol, atol)
+        futuros[fut] = idx
+
+    try:
+        for fut in as_completed(futuros):
+            yield futuros[fut], fut.result()
+    finally:
+        # si el consumidor abandona el generador (rerun), no dejar trabajo colgado
+        for fut in futuros:
+            fut.cancel()
+
+
+def resolver_barrido(P, V, t_span, t_eval, y0=None, **kwargs):
+    """Versión bloqueante: devuelve Y (N, 5, len(t_eval)) en el orden de P"""
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    Y = np.empty((len(P), 5, len(t_eval)))
+    for idx, bloque in barrido_paralelo(P, V, t_span, t_eval, y0, **kwargs):
+        Y[idx] = bloque
+    return Y
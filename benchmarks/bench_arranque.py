@@ -0,0 +1,75 @@
+"""Tiempo de arranque en frío: imports de cada página y precarga.
+
+Cada medición corre en un intérprete nuevo, como el primer pedido de un pod
+recién creado. Los imports de cada página se leen de su código (nivel
+superior, sin streamlit ni interfaz, que necesitan el servidor).
+
+Uso: python benchmarks/bench_arranque.py [--repeticiones 3] [--omitir pandas plotly]
+"""
+import os
+import ast
+import sys
+import glob
+import argparse
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGINAS = [os.path.join(RAIZ, "Planteo_del_problema.py")] \
+    + sorted(glob.glob(os.path.join(RAIZ, "pages", "*.py")))
+OMITIR = {"streamlit", "interfaz"}
+
+
+def imports_de(ruta, omitir=OMITIR):
+    lineas = []
+    for nodo in ast.parse(open(ruta, encoding="utf-8").read()).body:
+        if isinstance(nodo, ast.Import):
+            modulos = [a.name for a in nodo.names]
+        elif isinstance(nodo, ast.ImportFrom):
+            modulos = [nodo.module]
+        else:
+            continue
+        if not any(m.split(".")[0] in omitir for m in modulos):
+            lineas.append(ast.unparse(nodo))
+    return lineas
+
+
+def en_frio(codigo):
+    """Milisegundos que tarda `codigo` en un intérprete nuevo"""
+    programa = ("import sys, time\n"
+                f"sys.path.insert(0, {RAIZ!r})\n"
+                "t_ini = time.perf_counter()\n"
+                f"{codigo}\n"
+                "print((time.perf_counter() - t_ini) * 1e3)")
+    salida = subprocess.run([sys.executable, "-c", programa], cwd=RAIZ,
+                            capture_output=True, text=True)
+    if salida.returncode != 0:
+        return None, salida.stderr.strip().splitlines()[-1]
+    return float(salida.stdout.strip().splitlines()[-1]), None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--omitir", nargs="*", default=[],
+                        help="paquetes a no importar (p. ej. si no están instalados)")
+    args = parser.parse_args(argv)
+
+    omitir = OMITIR | set(args.omitir)
+    casos = {os.path.relpath(p, RAIZ): "\n".join(imports_de(p, omitir)) for p in PAGINAS}
+    casos["precarga (sin gráficos)"] = "from precarga import precargar\nprecargar(graficos=False)"
+    if not {"pandas", "plotly"} & omitir:
+        casos["precarga completa"] = "from precarga import precargar\nprecargar()"
+
+    print(f"{'':42s}{'mín (ms)':>10s}")
+    for nombre, codigo in casos.items():
+        tiempos, error = [], None
+        for _ in range(args.repeticiones):
+            ms, error = en_frio(codigo)
+            if ms is None:
+                break
+            tiempos.append(ms)
+        print(f"{nombre:42s}" + (f"{min(tiempos):10.0f}" if tiempos else f"  falla: {error}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Peso de las figuras antes y después de graficos.serie.
+
+Para cada caso arma la figura con go.Scatter sobre todos los puntos (antes) y
+con serie() (después) y mide:
+  - KB del JSON que se manda al navegador,
+  - ms de armado + serialización en el servidor (lo que paga cada rerun),
+  - ms de sólo serialización, que es lo que queda cuando la figura se reutiliza
+    desde st.cache_resource.
+El dibujo en el navegador no se mide acá; crece con los puntos enviados, que
+es la columna "puntos".
+
+Uso: python benchmarks/bench_graficos.py [--repeticiones 5]
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modelo import Reactor, DEFECTO  # noqa: E402
+from sensibilidad_global import evaluar  # noqa: E402
+from graficos import serie, carga  # noqa: E402
+
+
+V = (1/7.484)*500
+Fa0, Fb0, Fm0, T0, Ta1, UA, mc = DEFECTO
+
+
+def casos():
+    """nombre -> lista de (x, y, modo) de cada traza"""
+    reactor = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+    y0 = [0.0, 3.45, 0.0, 0.0, T0]
+    sol = reactor.simulate((0, 4), np.linspace(0, 4, 300), y0=y0)
+    t, y = sol.t, sol.y
+    sol = reactor.simulate((0, 24), np.linspace(0, 24, 50_000), y0=y0)
+    t_l, y_l = sol.t, sol.y
+    P = np.tile(DEFECTO, (1000, 1))
+    P[:, 0] = np.linspace(50, 150, 1000)
+    F = evaluar(P, V)
+    rng = np.random.default_rng(0)
+    return {
+        "arranque (300 puntos, 3 figuras)": [(t, y[0], "lines"), (t, y[4], "lines"),
+                                             (y[4], y[0], "lines")],
+        "arranque 24 h (50 000 puntos)": [(t_l, y_l[0], "lines"), (t_l, y_l[4], "lines"),
+                                          (y_l[4], y_l[0], "lines")],
+        "barrido 1000 puntos": [(P[:, 0], F[:, 0], "lines+markers"),
+                                (P[:, 0], F[:, 1], "lines+markers")],
+        "mapa 20 000 puntos": [(rng.random(20_000), rng.random(20_000), "markers")],
+    }
+
+
+def armar(trazas, traza):
+    fig = go.Figure()
+    for x, y, modo in trazas:
+        fig.add_trace(traza(x, y, mode=modo))
+    return fig
+
+
+def medir(trazas, traza, repeticiones):
+    armado, serializado = [], []
+    for _ in range(repeticiones):
+        t_ini = time.perf_counter()
+        fig = armar(trazas, traza)
+        t_medio = time.perf_counter()
+        fig.to_json()
+        t_fin = time.perf_counter()
+        armado.append(t_fin - t_ini)
+        serializado.append(t_fin - t_medio)
+    return {"puntos": sum(len(tr.x) for tr in fig.data), "KB": carga(fig) / 1024,
+            "ms": min(armado) * 1e3, "ms_reutilizada": min(serializado) * 1e3,
+            "tipo": type(fig.data[0]).__name__}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    serie(np.arange(10_000.0), np.arange(10_000.0))     # compila LTTB fuera de la medición
+    antes = lambda x, y, mode: go.Scatter(x=x, y=y, mode=mode)  # noqa: E731
+
+    print(f"{'caso':34s} {'':8s} {'tipo':10s} {'puntos':>8s} {'KB':>9s} {'ms':>8s} "
+          f"{'ms reutil.':>10s}")
+    for nombre, trazas in casos().items():
+        for etiqueta, traza in (("antes", antes), ("después", serie)):
+            r = medir(trazas, traza, args.repeticiones)
+            print(f"{nombre:34s} {etiqueta:8s} {r['tipo']:10s} {r['puntos']:8d} "
+                  f"{r['KB']:9.1f} {r['ms']:8.1f} {r['ms_reutilizada']:10.1f}")
@@ -0,0 +1,57 @@
+"""Compara el arranque BDF con Jacobiano por diferencias finitas vs analítico.
+
+Uso: python benchmarks/bench_jacobiano.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modelo import cstr_odes, cstr_jac  # noqa: E402
+
+
+# parámetros por defecto de la barra lateral
+Fa0, Fb0, Fm0 = 80.0, 1000.0, 100.0
+T0, Ta1, UA, mc = 75, 60, 16000.0, 1000.0
+V = (1/7.484)*500
+
+y0 = [0.0, 3.45, 0.0, 0.0, T0]
+t_span = (0, 4)
+t_eval = np.linspace(0, 4, 300)
+args = (Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+
+
+def correr(jac, repeticiones=20):
+    # cuenta todas las llamadas reales a cstr_odes, incluidas las que
+    # SciPy usa para estimar el Jacobiano (no aparecen en sol.nfev)
+    llamadas = [0]
+
+    def odes(t, y, *p):
+        llamadas[0] += 1
+        return cstr_odes(t, y, *p)
+
+    tiempos = []
+    for _ in range(repeticiones):
+        llamadas[0] = 0
+        t_ini = time.perf_counter()
+        sol = solve_ivp(odes, t_span, y0, args=args, t_eval=t_eval,
+                        method="BDF", jac=jac)
+        tiempos.append(time.perf_counter() - t_ini)
+    return sol, llamadas[0], min(tiempos)
+
+
+if __name__ == "__main__":
+    sol_fd, n_fd, t_fd = correr(None)
+    sol_an, n_an, t_an = correr(cstr_jac)
+
+    print(f"{'':20s}{'nfev':>8s}{'llamadas':>10s}{'njev':>8s}{'nlu':>8s}{'t (ms)':>10s}")
+    for nombre, sol, n, t in (("Diferencias finitas", sol_fd, n_fd, t_fd),
+                              ("Analítico", sol_an, n_an, t_an)):
+        print(f"{nombre:20s}{sol.nfev:8d}{n:10d}{sol.njev:8d}{sol.nlu:8d}{t*1e3:10.2f}")
+
+    dif = np.max(np.abs(sol_fd.y - sol_an.y) / (np.abs(sol_fd.y) + 1e-6))
+    print(f"Máx. diferencia relativa entre trayectorias: {dif:.2e}")
+    print(f"Speed-up: {t_fd / t_an:.2f}x")
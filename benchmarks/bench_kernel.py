@@ -0,0 +1,77 @@
+"""Llamadas por segundo del lado derecho: modelo.cstr_odes vs kernel (Python / Numba).
+
+Uso: python benchmarks/bench_kernel.py
+"""
+import os
+import sys
+import time
+import subprocess
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import kernel  # noqa: E402
+from modelo import cstr_odes, cstr_jac  # noqa: E402
+
+
+V = (1/7.484)*500
+args = (80.0, 1000.0, 100.0, V, 16000.0, 60.0, 1000.0, 75)
+y = np.array([0.1, 3.0, 0.2, 0.3, 120.0])
+
+
+def llamadas_por_segundo(f, n=200_000):
+    t_ini = time.perf_counter()
+    for _ in range(n):
+        f(0.0, y)
+    return n / (time.perf_counter() - t_ini)
+
+
+def tiempo_solve(fun, jac, repeticiones=20):
+    tiempos = []
+    for _ in range(repeticiones):
+        t_ini = time.perf_counter()
+        solve_ivp(fun, (0, 4), [0.0, 3.45, 0.0, 0.0, 75], t_eval=np.linspace(0, 4, 300),
+                  method="BDF", jac=jac)
+        tiempos.append(time.perf_counter() - t_ini)
+    return min(tiempos)
+
+
+def medir():
+    fun, jac = kernel.crear_rhs(*args)
+    return {
+        "rhs": llamadas_por_segundo(fun),
+        "jac": llamadas_por_segundo(jac),
+        "solve": tiempo_solve(fun, jac),
+        "backend": kernel.BACKEND,
+    }
+
+
+if __name__ == "__main__":
+    if "--solo-kernel" in sys.argv:
+        print(repr(medir()))
+        sys.exit()
+
+    def fun(t, y):
+        return cstr_odes(t, y, *args)
+
+    def jac(t, y):
+        return cstr_jac(t, y, *args)
+
+    resultados = {"modelo.cstr_odes": {
+        "rhs": llamadas_por_segundo(fun),
+        "jac": llamadas_por_segundo(jac),
+        "solve": tiempo_solve(fun, jac),
+    }}
+
+    # cada backend del kernel en su propio proceso (el backend se elige al importar)
+    for backend in ("python", "numba"):
+        entorno = dict(os.environ, TAC_BACKEND=backend)
+        salida = subprocess.run([sys.executable, __file__, "--solo-kernel"], env=entorno,
+                                capture_output=True, text=True, check=True).stdout
+        r = eval(salida)
+        resultados[f"kernel ({r['backend']})"] = r
+
+    print(f"{'':22s}{'rhs/s':>12s}{'jac/s':>12s}{'solve (ms)':>12s}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:22s}{r['rhs']:12.0f}{r['jac']:12.0f}{r['solve']*1e3:12.2f}")
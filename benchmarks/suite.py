@@ -0,0 +1,258 @@
+"""Suite de rendimiento y regresión del núcleo de simulación.
+
+Casos: una llamada a cstr_odes, el arranque BDF con los valores por defecto
+de la barra lateral, el barrido de 20 puntos de la página 2, los perfiles de
+la página 3, el cálculo de estados estacionarios y su detección por evento.
+De cada caso se mide el tiempo (mínimo y mediana de varias repeticiones),
+llamadas o resoluciones por segundo, nfev/njev/nlu y el pico de memoria, y se
+compara contra la línea base (linea_base.json): falla si el tiempo o la
+memoria empeoran más que el umbral. Los tiempos se guardan y comparan como la
+mediana de su cociente con una calibración (un trabajo fijo de Python y numpy
+chicos, como el de un integrador) que se corre antes de cada repetición, para
+que la línea base sirva en otra máquina o con otra carga; un caso sólo falla
+si sigue por encima del umbral al volver a medirlo.
+
+La columna "error" es la diferencia con las trayectorias de referencia
+(referencias.npz, calculadas con tolerancias estrictas) a las tolerancias por
+defecto, sólo informativa: la física se verifica aparte, en
+tests/test_referencias.py, con las tolerancias de VERIFICACION.
+
+Uso:
+    python benchmarks/suite.py                  # medir y comparar
+    python benchmarks/suite.py --guardar-base   # actualizar la línea base
+    python benchmarks/suite.py --referencias    # regenerar las referencias
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIR))
+from modelo import (cstr_odes, Reactor, simular_lote, estados_estacionarios,  # noqa: E402
+                    PARAMETROS, DEFECTO, TASA_ESTACIONARIA)
+from perfiles import compilar_perfil, simular_perfil  # noqa: E402
+
+
+RUTA_BASE = os.path.join(DIR, "linea_base.json")
+RUTA_REFERENCIAS = os.path.join(DIR, "referencias.npz")
+
+V = (1/7.484)*500
+Fa0, Fb0, Fm0, T0, Ta1, UA, mc = DEFECTO
+y0 = [0.0, 3.45, 0.0, 0.0, T0]
+t_span = (0, 4)
+t_eval = np.linspace(0, 4, 300)
+
+# tolerancias de las integraciones de referencia
+ESTRICTO = dict(rtol=1e-10, atol=1e-12)
+
+
+def _conteos(sol):
+    return {k: int(getattr(sol, k)) for k in ("nfev", "njev", "nlu")}
+
+
+def _sumar(conteos):
+    return {k: sum(c[k] for c in conteos) for k in ("nfev", "njev", "nlu")}
+
+
+# --- Casos ---
+# Cada caso recibe las opciones del integrador y devuelve (resultado, conteos);
+# `unidad` es cuántas operaciones representa una ejecución (para el "por segundo").
+
+def caso_rhs(**tol):
+    y = np.array([0.1, 3.0, 0.2, 0.3, 120.0])
+    for _ in range(999):
+        cstr_odes(0.0, y, Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+    return np.asarray(cstr_odes(0.0, y, Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)), {}
+
+
+def caso_arranque(**tol):
+    sol = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0).simulate(t_span, t_eval, y0=y0, **tol)
+    return sol.y, _conteos(sol)
+
+
+def caso_barrido(**tol):
+    # barrido por defecto de la página 2 (Fa0 de 50 a 150) con 20 puntos
+    P = np.tile(DEFECTO, (20, 1)).astype(float)
+    P[:, PARAMETROS.index("Fa0")] = np.linspace(50, 150, 20)
+    _, Y = simular_lote(P, V, t_span, t_eval, y0=y0, **tol)
+    return Y[:, :, -1], {}
+
+
+def caso_perfiles(**tol):
+    # valores por defecto de la página 3
+    resultados, conteos = [], []
+    for nombre in ("Step", "Rampa lineal", "Exponencial"):
+        perfil = compilar_perfil(nombre, 1000, 2000, 1.0, 3.0, 1.0)
+        _, y, stats = simular_perfil(perfil, Fa0, Fb0, Fm0, V, UA, Ta1, T0, t_span, t_eval,
+                                     y0=y0, **tol)
+        resultados.append(y)
+        conteos.append(stats)
+    return np.stack(resultados), _sumar(conteos)
+
+
+def caso_estacionario(**tol):
+    for _ in range(49):
+        estados_estacionarios(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+    estados = estados_estacionarios(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+    return np.array([e["y"] for e in estados]), {}
+
+
+def caso_evento(**tol):
+    # arranque detenido por el evento de estado estacionario
+    sol = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0).simulate(
+        t_span, t_eval, y0=y0, tasa_estacionaria=TASA_ESTACIONARIA, **tol)
+    t_est = sol.t_events[0][0] if len(sol.t_events[0]) else np.nan
+    return np.array([t_est]), _conteos(sol)
+
+
+CASOS = {
+    "rhs": (caso_rhs, 1000),
+    "arranque": (caso_arranque, 1),
+    "barrido_20": (caso_barrido, 20),
+    "perfiles": (caso_perfiles, 3),
+    "estacionario": (caso_estacionario, 50),
+    "evento": (caso_evento, 1),
+}
+
+# eje del resultado que recorre las variables (cada una se escala por separado)
+EJE_VARIABLES = {"rhs": 0, "arranque": 0, "barrido_20": 1, "perfiles": 1, "estacionario": 1,
+                 "evento": 0}
+
+# tolerancias del integrador al verificar contra las referencias y error
+# admitido ahí, relativo a la escala de cada variable (con VERIFICACION los
+# casos integrados quedan en ~1e-7)
+VERIFICACION = dict(rtol=1e-8, atol=1e-10)
+TOLERANCIAS = {
+    "rhs": 1e-12,
+    "arranque": 1e-5,
+    "barrido_20": 1e-5,
+    "perfiles": 1e-5,
+    "estacionario": 1e-8,
+    "evento": 1e-5,
+}
+
+
+def error_relativo(resultado, referencia, eje):
+    resultado, referencia = np.asarray(resultado), np.asarray(referencia)
+    if resultado.shape != referencia.shape:
+        return np.inf
+    otros = tuple(i for i in range(referencia.ndim) if i != eje)
+    escala = np.max(np.abs(referencia), axis=otros, keepdims=True)
+    return float(np.nanmax(np.abs(resultado - referencia) / np.where(escala > 0, escala, 1.0)))
+
+
+def calibrar(iteraciones=50_000):
+    """Segundos de un trabajo fijo con el perfil del núcleo: bucle de Python con
+    operaciones de numpy sobre vectores chicos"""
+    x = np.linspace(0.0, 1.0, 5)
+    t_ini = time.perf_counter()
+    s = 0.0
+    for i in range(iteraciones):
+        s += float(np.dot(x, x)) + i % 7
+    return time.perf_counter() - t_ini
+
+
+def medir(nombre, repeticiones):
+    funcion, unidad = CASOS[nombre]
+    funcion()   # calentamiento (imports, compilación JIT)
+
+    # la calibración se intercala con las repeticiones para que cada par vea la
+    # misma frecuencia de CPU y la misma carga de la máquina
+    tiempos, calibraciones = [], []
+    for _ in range(repeticiones):
+        calibraciones.append(calibrar())
+        t_ini = time.perf_counter()
+        resultado, conteos = funcion()
+        tiempos.append(time.perf_counter() - t_ini)
+    relativo = float(np.median(np.array(tiempos) / np.array(calibraciones)))
+
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    tiempo = min(tiempos)
+    return resultado, dict(tiempo=tiempo, mediana=float(np.median(tiempos)),
+                           por_segundo=unidad / tiempo, pico_kb=pico / 1024,
+                           calibracion=float(np.median(calibraciones)), relativo=relativo,
+                           **conteos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--casos", nargs="*", default=list(CASOS), choices=list(CASOS))
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--umbral", type=float, default=0.4,
+                        help="empeoramiento admitido frente a la línea base (0.4 = 40%%)")
+    parser.add_argument("--reintentos", type=int, default=2,
+                        help="veces que se vuelve a medir un caso lento antes de fallar")
+    parser.add_argument("--guardar-base", action="store_true")
+    parser.add_argument("--referencias", action="store_true",
+                        help="recalcular las referencias con tolerancias estrictas")
+    args = parser.parse_args(argv)
+
+    if args.referencias:
+        referencias = {n: CASOS[n][0](**ESTRICTO)[0] for n in CASOS}
+        np.savez(RUTA_REFERENCIAS, **referencias)
+        print(f"Referencias guardadas en {RUTA_REFERENCIAS}")
+        return 0
+
+    base = {}
+    if os.path.exists(RUTA_BASE):
+        with open(RUTA_BASE, encoding="utf-8") as f:
+            base = json.load(f)
+        if any("relativo" not in b for b in base.values()):
+            base = {}   # línea base en tiempos absolutos: no es comparable
+    referencias = np.load(RUTA_REFERENCIAS) if os.path.exists(RUTA_REFERENCIAS) else {}
+
+    fallas = []
+    medidas = {}
+    print(f"{'caso':14s}{'tiempo (ms)':>12s}{'base':>10s}{'/s':>12s}{'nfev':>7s}{'njev':>6s}"
+          f"{'nlu':>6s}{'pico (kB)':>11s}{'error':>10s}")
+    for nombre in args.casos:
+        resultado, m = medir(nombre, args.repeticiones)
+        b = base.get(nombre)
+        if b is not None and not args.guardar_base:
+            # una medición lenta suelta es ruido de la máquina: se repite
+            for _ in range(args.reintentos):
+                if m["relativo"] <= b["relativo"] * (1 + args.umbral):
+                    break
+                _, otra = medir(nombre, args.repeticiones)
+                m = min(m, otra, key=lambda x: x["relativo"])
+        medidas[nombre] = m
+        # tiempo de la línea base llevado a la velocidad de esta corrida
+        tiempo_base = b["relativo"] * m["calibracion"] if b else np.nan
+
+        error = error_relativo(resultado, referencias[nombre], EJE_VARIABLES[nombre]) \
+            if nombre in referencias else np.nan
+        if b is not None and not args.guardar_base:
+            if m["relativo"] > b["relativo"] * (1 + args.umbral):
+                fallas.append(f"{nombre}: {m['relativo']:.2f} calibraciones frente a "
+                              f"{b['relativo']:.2f} de la línea base")
+            if m["pico_kb"] > b["pico_kb"] * (1 + args.umbral) + 64:
+                fallas.append(f"{nombre}: pico de memoria {m['pico_kb']:.0f} kB frente a "
+                              f"{b['pico_kb']:.0f} kB")
+
+        print(f"{nombre:14s}{m['tiempo']*1e3:12.2f}"
+              f"{tiempo_base*1e3:10.2f}{m['por_segundo']:12.1f}"
+              f"{m.get('nfev', 0):7d}{m.get('njev', 0):6d}{m.get('nlu', 0):6d}"
+              f"{m['pico_kb']:11.0f}{error:10.1e}")
+
+    if args.guardar_base:
+        base.update(medidas)
+        with open(RUTA_BASE, "w", encoding="utf-8") as f:
+            json.dump(base, f, indent=2, sort_keys=True)
+        print(f"Línea base guardada en {RUTA_BASE}")
+
+    for f in fallas:
+        print("FALLA", f)
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from modelo import Reactor
+
+
+# se incrementa cuando cambia el resultado numérico del modelo, para no
+# reutilizar soluciones viejas guardadas en disco
+VERSION = 2
+
+
+class CacheSimulacion:
+    """Cache de soluciones de cstr_odes: LRU en memoria + copia opcional en disco (.npz)"""
+
+    def __init__(self, maxsize=256, directorio=None):
+        self.maxsize = maxsize
+        self.directorio = directorio
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits_memoria": 0, "hits_disco": 0, "misses": 0}
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+    @staticmethod
+    def clave(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval, y0,
+              method, rtol, atol, tasa_estacionaria=None):
+        h = hashlib.sha1(f"v{VERSION}".encode())
+        tasa = -1.0 if tasa_estacionaria is None else tasa_estacionaria
+        escalares = [Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, *t_span, rtol, atol, tasa]
+        h.update(np.asarray(escalares, dtype=float).tobytes())
+        h.update(np.asarray(y0, dtype=float).tobytes())
+        if t_eval is not None:
+            h.update(np.asarray(t_eval, dtype=float).tobytes())
+        h.update(method.encode())
+        return h.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + ".npz")
+
+    def _guardar_memoria(self, clave, valor):
+        with self._lock:
+            self._memoria[clave] = valor
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.maxsize:
+                self._memoria.popitem(last=False)
+
+    def _leer_disco(self, clave):
+        try:
+            with np.load(self._ruta(clave)) as datos:
+                t_est = float(datos["t_est"])
+                return datos["t"], datos["y"], None if np.isnan(t_est) else t_est
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _escribir_disco(self, clave, t, y, t_est):
+        # escritura atómica: varios procesos del servidor pueden compartir el directorio
+        fd, tmp = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, t=t, y=y,
+                                    t_est=np.nan if t_est is None else t_est)
+            os.replace(tmp, self._ruta(clave))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def simular(self, Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval,
+                y0=None, method="BDF", rtol=1e-3, atol=1e-6, tasa_estacionaria=None):
+        """Devuelve (t, y, t_est).
+
+        Con tasa_estacionaria (1/h) la integración se detiene al alcanzar el
+        estado estacionario (ver modelo.evento_estacionario): la trayectoria
+        termina en t_est con el estado exacto del evento. t_est es None si no
+        se pidió o no se alcanzó dentro de t_span.
+        """
+        if y0 is None:
+            y0 = [0.0, 3.45, 0.0, 0.0, T0]
+        clave = self.clave(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval,
+                           y0, method, rtol, atol, tasa_estacionaria)
+
+        with self._lock:
+            valor = self._memoria.get(clave)
+            if valor is not None:
+                self._memoria.move_to_end(clave)
+                self.stats["hits_memoria"] += 1
+                return valor
+
+        if self.directorio:
+            valor = self._leer_disco(clave)
+            if valor is not None:
+                with self._lock:
+                    self.stats["hits_disco"] += 1
+                valor = self._congelar(*valor)
+                self._guardar_memoria(clave, valor)
+                return valor
+
+        with self._lock:
+            self.stats["misses"] += 1
+        sol = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0).simulate(
+            t_span, t_eval, y0=y0, method=method, rtol=rtol, atol=atol,
+            tasa_estacionaria=tasa_estacionaria)
+
+        t, y, t_est = sol.t, sol.y, None
+        if tasa_estacionaria is not None and len(sol.t_events[0]):
+            t_est = float(sol.t_events[0][0])
+            if not len(t) or t[-1] < t_est:
+                t = np.append(t, t_est)
+                y = np.column_stack([y, sol.y_events[0][0]])
+        valor = self._congelar(t, y, t_est)
+        self._guardar_memoria(clave, valor)
+        if self.directorio:
+            self._escribir_disco(clave, *valor)
+        return valor
+
+    @staticmethod
+    def _congelar(t, y, t_est):
+        # los resultados se comparten entre llamadas: se marcan como solo lectura
+        t, y = np.array(t), np.array(y)
+        t.flags.writeable = False
+        y.flags.writeable = False
+        return t, y, t_est
+
+    def limpiar(self):
+        with self._lock:
+            self._memoria.clear()
+            for k in self.stats:
+                self.stats[k] = 0
+
+
+# instancia compartida por todas las páginas del servidor;
+# TAC_CACHE_DIR activa la copia en disco
+cache = CacheSimulacion(directorio=os.environ.get("TAC_CACHE_DIR"))
+
+
+def simular(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval, **kwargs):
+    """Devuelve (t, y, t_est) para los parámetros dados, reutilizando soluciones previas"""
+    return cache.simular(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval, **kwargs)
@@ -0,0 +1,184 @@
+import numpy as np
+
+from modelo import (cstr_odes, cstr_jac, cstr_dfdp, estados_estacionarios, PARAMETROS,
+                    _params_lote)
+
+
+# Continuación por pseudo-longitud de arco de los estados estacionarios de
+# cstr_odes respecto de uno de los siete parámetros de PARAMETROS.
+# Las incógnitas x = (Ca, Cb, Cc, Cm, T, p) se escalan para que el paso de
+# arco no quede dominado por magnitudes grandes como UA.
+
+class _Sistema:
+
+    def __init__(self, base, param, V, escala):
+        self.base = np.asarray(base, dtype=float)
+        self.i = PARAMETROS.index(param)
+        self.V = V
+        self.s = escala
+
+    def args(self, p):
+        fila = self.base.copy()
+        fila[self.i] = p
+        return _params_lote(fila, self.V)
+
+    def F(self, z):
+        x = z * self.s
+        return np.asarray(cstr_odes(0.0, x[:5], *self.args(x[5])))
+
+    def dF(self, z):
+        x = z * self.s
+        args = self.args(x[5])
+        Jy = cstr_jac(0.0, x[:5], *args)
+        # derivada respecto del parámetro: la columna analítica de cstr_dfdp
+        Fp = cstr_dfdp(0.0, x[:5], *args)[:, self.i]
+        return np.column_stack([Jy * self.s[:5], Fp * self.s[5]]), Jy
+
+    def tangente(self, z, t_prev):
+        A, _ = self.dF(z)
+        M = np.vstack([A, t_prev])
+        t = np.linalg.solve(M, np.r_[np.zeros(5), 1.0])
+        return t / np.linalg.norm(t)
+
+    def corregir(self, z_pred, t, tol=1e-9, max_iter=8):
+        z = z_pred.copy()
+        for it in range(1, max_iter + 1):
+            A, _ = self.dF(z)
+            r = np.r_[self.F(z), t @ (z - z_pred)]
+            dz = np.linalg.solve(np.vstack([A, t]), -r)
+            z += dz
+            if np.linalg.norm(dz) < tol * (1 + np.linalg.norm(z)):
+                return z, it
+        return None, max_iter
+
+    def autovalores(self, z):
+        x = z * self.s
+        return np.linalg.eigvals(cstr_jac(0.0, x[:5], *self.args(x[5])))
+
+
+def _test_hopf(ev):
+    # mayor parte real entre los autovalores complejos (nan si no hay)
+    complejos = ev[np.abs(ev.imag) > 1e-8]
+    return complejos.real.max() if len(complejos) else np.nan
+
+
+def _localizar(sis, z0, t0, ds, funcion, n_iter=40):
+    """Bisección en la longitud de arco del cero de funcion(z, t) entre 0 y ds"""
+    a, b = 0.0, ds
+    fa = funcion(z0, t0)
+    z_m, t_m = z0, t0
+    for _ in range(n_iter):
+        m = (a + b) / 2
+        z_m, _ = sis.corregir(z0 + m*t0, t0)
+        if z_m is None:
+            break
+        t_m = sis.tangente(z_m, t0)
+        fm = funcion(z_m, t_m)
+        if np.sign(fm) == np.sign(fa):
+            a, fa = m, fm
+        else:
+            b = m
+        if b - a < 1e-10 * abs(ds):
+            break
+    return z_m
+
+
+def _rama(sis, z, t, p_min, p_max, ds, ds_min, ds_max, max_pasos):
+    escala = sis.s
+    ev = sis.autovalores(z)
+    zs, evs, especiales = [z], [ev], []
+    for _ in range(max_pasos):
+        z_nuevo, iters = sis.corregir(z + ds*t, t)
+        if z_nuevo is None:
+            ds /= 2
+            if ds < ds_min:
+                break
+            continue
+
+        t_nuevo = sis.tangente(z_nuevo, t)
+        # adaptación del paso según convergencia y curvatura (ángulo entre tangentes)
+        angulo = np.arccos(np.clip(t @ t_nuevo, -1.0, 1.0))
+        if angulo > 0.3 and ds > ds_min:
+            ds /= 2
+            continue
+        ev_nuevo = sis.autovalores(z_nuevo)
+
+        # punto límite: dp/ds cambia de signo
+        if np.sign(t_nuevo[5]) != np.sign(t[5]):
+            z_lp = _localizar(sis, z, t, ds, lambda zz, tt: tt[5])
+            especiales.append({"tipo": "LP", "x": z_lp * escala})
+        # Hopf: un par complejo cruza el eje imaginario
+        h0, h1 = _test_hopf(ev), _test_hopf(ev_nuevo)
+        if np.isfinite(h0) and np.isfinite(h1) and np.sign(h0) != np.sign(h1):
+            z_h = _localizar(sis, z, t, ds, lambda zz, tt: _test_hopf(sis.autovalores(zz)))
+            especiales.append({"tipo": "H", "x": z_h * escala})
+
+        z, t, ev = z_nuevo, t_nuevo, ev_nuevo
+        zs.append(z)
+        evs.append(ev)
+
+        if iters <= 3 and angulo < 0.1:
+            ds = min(ds * 1.5, ds_max)
+        p = z[5] * escala[5]
+        if p < p_min - 1e-9 or p > p_max + 1e-9:
+            break
+
+    X = np.array(zs) * escala
+    rama = {
+        "p": X[:, 5],
+        "y": X[:, :5],
+        "estable": np.array([np.all(e.real < 0) for e in evs]),
+    }
+    return rama, especiales
+
+
+def _cruces(rama, p_borde):
+    """Temperaturas (interpoladas) donde la rama pasa por p = p_borde"""
+    p, T = rama["p"], rama["y"][:, 4]
+    cruces = []
+    for j in range(len(p) - 1):
+        if (p[j] - p_borde) * (p[j+1] - p_borde) <= 0 and p[j] != p[j+1]:
+            w = (p_borde - p[j]) / (p[j+1] - p[j])
+            cruces.append(T[j] + w * (T[j+1] - T[j]))
+    return cruces
+
+
+def continuar(param, p_min, p_max, base, V, ds=0.01, ds_min=1e-6, ds_max=0.2,
+              max_pasos=2000):
+    """Traza las ramas de estados estacionarios entre p_min y p_max.
+
+    base: valores de los siete parámetros (orden de PARAMETROS); el de `param`
+    se reemplaza. Cada estado estacionario en los bordes del intervalo que no
+    esté ya en una rama trazada inicia una rama nueva. Devuelve un dict con la
+    lista de ramas (p, y (n, 5), estable) y los puntos especiales
+    (LP = punto límite, H = Hopf).
+    """
+    i = PARAMETROS.index(param)
+    fila = np.array(base, dtype=float)
+
+    semillas = []
+    for p_borde, sentido in ((p_min, 1.0), (p_max, -1.0)):
+        fila[i] = p_borde
+        Fa0, Fb0, Fm0, T0, Ta1, UA, mc = fila
+        for e in estados_estacionarios(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0):
+            semillas.append((p_borde, sentido, e["y"]))
+
+    # escala común para todas las ramas
+    Y = np.array([y for _, _, y in semillas])
+    escala = np.r_[np.maximum(np.abs(Y).max(axis=0), 1.0), max(abs(p_max - p_min), 1e-8)]
+    sis = _Sistema(fila, param, V, escala)
+
+    ramas, especiales = [], []
+    for p_borde, sentido, y in semillas:
+        tol_T = 1e-3 * escala[4]
+        if any(abs(T - y[4]) < tol_T for r in ramas for T in _cruces(r, p_borde)):
+            continue
+        z = np.r_[y, p_borde] / escala
+        t = sis.tangente(z, np.r_[np.zeros(5), sentido])
+        rama, esp = _rama(sis, z, t, p_min, p_max, ds, ds_min, ds_max, max_pasos)
+        ramas.append(rama)
+        especiales.extend(esp)
+
+    for e in especiales:
+        e["p"], e["y"] = e["x"][5], e["x"][:5]
+    return {"param": param, "ramas": ramas, "especiales": especiales}
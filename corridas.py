@@ -0,0 +1,208 @@
+"""Ejecución de escenarios sin Streamlit.
+
+Uso como programa:
+
+    python corridas.py escenarios.yaml -o resultados.parquet --workers 32
+
+Los escenarios se leen de un CSV (una fila por escenario, columnas con los
+nombres de PARAMETROS; las que falten toman el valor por defecto) o de un YAML:
+
+    base: {Fa0: 80, UA: 16000}          # opcional, sobre DEFECTO
+    opciones: {t_final: 4, puntos: 300}
+    escenarios:                         # lista explícita
+      - {nombre: caso1, Ta1: 90}
+    barridos:                           # un parámetro por vez
+      - {param: Ta1, desde: 20, hasta: 200, puntos: 50}
+    grilla:                             # producto cartesiano
+      Ta1: [40, 60, 80]
+      UA: {desde: 5000, hasta: 30000, puntos: 10}
+
+La salida es una tabla por columnas (CSV o Parquet según la extensión) con los
+parámetros y los valores finales de cada escenario.
+"""
+import os
+import sys
+import argparse
+import itertools
+
+import numpy as np
+
+from modelo import Reactor, PARAMETROS, DEFECTO, TASA_ESTACIONARIA
+from barrido import obtener_pool
+
+
+V = (1/7.484)*500
+
+COLUMNAS = ("Ca_final", "Cb_final", "Cc_final", "Cm_final", "T_final", "X_final",
+            "T_pico", "t_est")
+
+
+# --- Lectura de escenarios ---
+
+def _valores(spec):
+    if isinstance(spec, dict):
+        return np.linspace(spec["desde"], spec["hasta"], int(spec["puntos"]))
+    return np.atleast_1d(np.asarray(spec, dtype=float))
+
+
+def escenarios_desde_dict(datos):
+    """Devuelve (nombres, P, opciones) con P de forma (N, 7) en el orden de PARAMETROS"""
+    base = np.array(DEFECTO, dtype=float)
+    for p, v in (datos.get("base") or {}).items():
+        base[PARAMETROS.index(p)] = v
+
+    nombres, filas = [], []
+    for i, esc in enumerate(datos.get("escenarios") or []):
+        fila = base.copy()
+        for p, v in esc.items():
+            if p != "nombre":
+                fila[PARAMETROS.index(p)] = v
+        nombres.append(str(esc.get("nombre", f"escenario_{i}")))
+        filas.append(fila)
+
+    for b in datos.get("barridos") or []:
+        j = PARAMETROS.index(b["param"])
+        for v in _valores(b):
+            fila = base.copy()
+            fila[j] = v
+            nombres.append(f"{b['param']}={v:g}")
+            filas.append(fila)
+
+    grilla = datos.get("grilla") or {}
+    if grilla:
+        params = list(grilla)
+        for combinacion in itertools.product(*(_valores(grilla[p]) for p in params)):
+            fila = base.copy()
+            for p, v in zip(params, combinacion):
+                fila[PARAMETROS.index(p)] = v
+            nombres.append(",".join(f"{p}={v:g}" for p, v in zip(params, combinacion)))
+            filas.append(fila)
+
+    return nombres, np.array(filas).reshape(-1, len(PARAMETROS)), datos.get("opciones") or {}
+
+
+def leer_escenarios(ruta):
+    """Lee un archivo .csv o .yaml/.yml de escenarios"""
+    ext = os.path.splitext(ruta)[1].lower()
+    if ext in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("Para leer escenarios YAML hace falta PyYAML (pip install pyyaml)")
+        with open(ruta, encoding="utf-8") as f:
+            return escenarios_desde_dict(yaml.safe_load(f) or {})
+
+    if ext == ".csv":
+        import csv
+        with open(ruta, newline="", encoding="utf-8") as f:
+            filas = list(csv.DictReader(f))
+        escenarios = [{k: (v if k == "nombre" else float(v)) for k, v in fila.items()
+                       if v not in (None, "")} for fila in filas]
+        return escenarios_desde_dict({"escenarios": escenarios})
+
+    raise SystemExit(f"Formato de escenarios no soportado: {ext}")
+
+
+# --- Ejecución ---
+
+def _resumir_bloque(P, V, t_final, n_puntos):
+    # sólo se devuelven los valores finales: las trayectorias no viajan entre procesos
+    t_eval = np.linspace(0, t_final, n_puntos)
+    salida = np.empty((len(P), len(COLUMNAS)))
+    for i, fila in enumerate(P):
+        reactor = Reactor.desde_fila(fila, V)
+        sol = reactor.simulate((0, t_final), t_eval, tasa_estacionaria=TASA_ESTACIONARIA)
+        y = sol.y[:, -1]
+        t_est = sol.t_events[0][0] if len(sol.t_events[0]) else np.nan
+        if np.isfinite(t_est):
+            y = sol.y_events[0][0]
+        salida[i, :5] = y
+        salida[i, 5] = reactor.conversion(y[0])
+        salida[i, 6] = max(sol.y[4].max(), y[4])
+        salida[i, 7] = t_est
+    return salida
+
+
+def ejecutar(P, V=V, t_final=4.0, n_puntos=300, workers=None, chunk=64, progreso=None):
+    """Simula las filas de P en paralelo y devuelve (N, len(COLUMNAS)) en el orden de P.
+
+    progreso(hechos, total) se llama cada vez que termina un bloque.
+    """
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    salida = np.empty((len(P), len(COLUMNAS)))
+    if len(P) == 0:
+        return salida
+
+    pool = obtener_pool(workers)
+    futuros = {}
+    for inicio in range(0, len(P), chunk):
+        fin = min(inicio + chunk, len(P))
+        futuros[pool.submit(_resumir_bloque, P[inicio:fin], V, t_final, n_puntos)] = (inicio, fin)
+
+    from concurrent.futures import as_completed
+    hechos = 0
+    for fut in as_completed(futuros):
+        inicio, fin = futuros[fut]
+        salida[inicio:fin] = fut.result()
+        hechos += fin - inicio
+        if progreso is not None:
+            progreso(hechos, len(P))
+    return salida
+
+
+def guardar(ruta, nombres, P, resultados):
+    """Escribe la tabla de resultados en CSV o Parquet (según la extensión)"""
+    columnas = {"nombre": np.asarray(nombres, dtype=object)}
+    columnas.update({p: P[:, j] for j, p in enumerate(PARAMETROS)})
+    columnas.update({c: resultados[:, j] for j, c in enumerate(COLUMNAS)})
+
+    if ruta.lower().endswith(".parquet"):
+        import pandas as pd
+        pd.DataFrame(columnas).to_parquet(ruta, index=False)
+    else:
+        import csv
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(columnas)
+            w.writerows(zip(*columnas.values()))
+
+
+def graficar(ruta, nombres, resultados, variable="X_final"):
+    # plotly sólo se importa si se pide un gráfico
+    import plotly.graph_objects as go
+    j = COLUMNAS.index(variable)
+    fig = go.Figure(go.Scatter(x=np.arange(len(nombres)), y=resultados[:, j],
+                               mode="markers", text=nombres))
+    fig.update_layout(xaxis_title="Escenario", yaxis_title=variable)
+    fig.write_html(ruta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corre escenarios del reactor TAC sin interfaz")
+    parser.add_argument("escenarios", help="archivo .csv o .yaml con los escenarios")
+    parser.add_argument("-o", "--salida", default="resultados.csv",
+                        help="archivo de salida .csv o .parquet")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--chunk", type=int, default=64, help="escenarios por bloque")
+    parser.add_argument("--t-final", type=float, default=None, help="horizonte máximo (h)")
+    parser.add_argument("--grafico", default=None, help="archivo .html con un gráfico de X_final")
+    args = parser.parse_args(argv)
+
+    nombres, P, opciones = leer_escenarios(args.escenarios)
+    t_final = args.t_final or float(opciones.get("t_final", 4.0))
+    n_puntos = int(opciones.get("puntos", 300))
+
+    def progreso(hechos, total):
+        print(f"\r{hechos}/{total} escenarios", end="", file=sys.stderr, flush=True)
+
+    resultados = ejecutar(P, V, t_final, n_puntos, workers=args.workers, chunk=args.chunk,
+                          progreso=progreso)
+    print(file=sys.stderr)
+    guardar(args.salida, nombres, P, resultados)
+    if args.grafico:
+        graficar(args.grafico, nombres, resultados)
+    print(f"{len(P)} escenarios -> {args.salida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Instrumentación de las integraciones.
+
+`resolver` reemplaza a solve_ivp: integra igual y además registra tiempo,
+nfev/njev/nlu, pasos aceptados y rechazados y método. Cada registro queda en
+`sol.diagnostico`, en el historial global `registro`, en la captura del hilo
+actual (ver `iniciar_captura`) y se emite como JSON por el logger
+"tac.solver". Con la variable TAC_LOG_SOLVER=stderr (o una ruta de archivo)
+los registros se escriben sin configurar logging a mano.
+
+Los rechazos son exactos para los integradores propios; para BDF y Radau se
+cuentan los pasos que terminaron con un h menor al intentado (al menos un
+rechazo), y LSODA no los expone.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from collections import deque
+
+import numpy as np
+from scipy.integrate import solve_ivp, RK23, RK45, DOP853, Radau, BDF, LSODA
+
+from integradores import METODOS as METODOS_PROPIOS
+
+
+logger = logging.getLogger("tac.solver")
+_destino = os.environ.get("TAC_LOG_SOLVER")
+if _destino:
+    _handler = logging.StreamHandler(sys.stderr) if _destino == "stderr" \
+        else logging.FileHandler(_destino)
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+registro = deque(maxlen=500)
+_local = threading.local()
+
+METODOS = ("BDF", "Radau", "LSODA", "Rosenbrock23")
+# nombre -> clase, como los acepta solve_ivp más los integradores propios
+CLASES = {"RK23": RK23, "RK45": RK45, "DOP853": DOP853, "Radau": Radau, "BDF": BDF,
+          "LSODA": LSODA, **METODOS_PROPIOS}
+
+
+def iniciar_captura():
+    """Empieza a juntar en una lista los registros de este hilo (un rerun de Streamlit)"""
+    _local.captura = []
+    return _local.captura
+
+
+def _clase(method):
+    if isinstance(method, str):
+        return CLASES[method]
+    return method
+
+
+def instrumentar(method):
+    """Subclase del método que cuenta pasos aceptados y rechazados.
+    Se crea una por integración, así los contadores quedan en la clase."""
+    base = _clase(method)
+
+    class Medido(base):
+        aceptados = 0
+        rechazados = 0
+
+        def _step_impl(self):
+            t, h = self.t, getattr(self, "h_abs", None)
+            exito, mensaje = super()._step_impl()
+            if exito:
+                Medido.aceptados += 1
+                if h is not None and not hasattr(self, "n_rechazados") \
+                        and abs(self.t - t) < h * (1 - 1e-9) and self.t != self.t_bound:
+                    Medido.rechazados += 1
+            if hasattr(self, "n_rechazados"):
+                Medido.rechazados = self.n_rechazados
+            return exito, mensaje
+
+    Medido.__name__ = base.__name__
+    return Medido
+
+
+def registrar(etiqueta, metodo, resultado, tiempo, n, t0, t1, estado, rtol):
+    """Arma el registro de una integración (resultado: sol de solve_ivp o el
+    OdeSolver usado paso a paso) y lo publica en el historial, la captura del
+    hilo y el logger"""
+    datos = {
+        "etiqueta": etiqueta,
+        "metodo": metodo.__name__,
+        "n": int(n),
+        "t0": float(t0),
+        "t1": float(t1),
+        "tiempo_ms": tiempo * 1e3,
+        "nfev": int(resultado.nfev),
+        "njev": int(resultado.njev),
+        "nlu": int(resultado.nlu),
+        "aceptados": metodo.aceptados,
+        "rechazados": None if metodo.__name__ == "LSODA" else metodo.rechazados,
+        "estado": estado,
+        "rtol": rtol,
+    }
+    registro.append(datos)
+    captura = getattr(_local, "captura", None)
+    if captura is not None:
+        captura.append(datos)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(datos))
+    return datos
+
+
+def resolver(fun, t_span, y0, method="BDF", etiqueta="", **kwargs):
+    """solve_ivp instrumentado; acepta además method="Rosenbrock23" """
+    metodo = instrumentar(method)
+    t_ini = time.perf_counter()
+    sol = solve_ivp(fun, t_span, y0, method=metodo, **kwargs)
+    tiempo = time.perf_counter() - t_ini
+
+    t1 = sol.t[-1] if len(sol.t) else t_span[0]
+    sol.diagnostico = registrar(etiqueta, metodo, sol, tiempo, np.size(y0), t_span[0], t1,
+                                int(sol.status), kwargs.get("rtol", 1e-3))
+    return sol
+
+
+def _error(sol, ref):
+    if sol.status < 0 or sol.y.shape != ref.y.shape:
+        return np.inf
+    escala = np.abs(ref.y).max(axis=1, keepdims=True)
+    return float(np.max(np.abs(sol.y - ref.y) / np.where(escala > 0, escala, 1.0)))
+
+
+def carrera(simular, metodos=METODOS, tolerancia=2e-2, rtol=1e-3, atol=1e-6, repeticiones=3):
+    """Compara métodos sobre el mismo problema y recomienda el más rápido que
+    cumple la tolerancia.
+
+    simular(method, rtol, atol) debe devolver el resultado de `resolver` (o de
+    Reactor.simulate) sobre una grilla t_eval fija. El error de cada método se
+    mide contra Radau con rtol=1e-10, relativo a la escala de cada variable.
+    Devuelve (filas, recomendado).
+    """
+    ref = simular("Radau", rtol=1e-10, atol=1e-12)
+    filas = []
+    for m in metodos:
+        tiempos = []
+        for _ in range(repeticiones):
+            t_ini = time.perf_counter()
+            sol = simular(m, rtol=rtol, atol=atol)
+            tiempos.append(time.perf_counter() - t_ini)
+        error = _error(sol, ref)
+        d = getattr(sol, "diagnostico", {})
+        filas.append({
+            "metodo": m,
+            "tiempo_ms": min(tiempos) * 1e3,
+            "error": error,
+            "cumple": error <= tolerancia,
+            "nfev": int(sol.nfev),
+            "njev": int(sol.njev),
+            "nlu": int(sol.nlu),
+            "aceptados": d.get("aceptados"),
+            "rechazados": d.get("rechazados"),
+        })
+    validos = [f for f in filas if f["cumple"]]
+    recomendado = min(validos, key=lambda f: f["tiempo_ms"])["metodo"] if validos else None
+    return filas, recomendado
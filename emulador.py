@@ -0,0 +1,221 @@
+"""Emulador de (parámetros -> X_final, T_final, T_pico) para respuestas instantáneas.
+
+Interpolación RBF cúbica (φ(r) = r³ con cola lineal) sobre simulaciones por
+lotes en la caja de RANGOS, con las coordenadas llevadas a [0, 1]. El error de
+dejar-uno-afuera de cada punto de entrenamiento sale cerrado de la inversa del
+sistema (Rippa, 1999); el error estimado en un punto nuevo es el promedio, por
+inverso de la distancia, de esos errores en los vecinos más cercanos, escalado
+con un conjunto de validación para que cubra ~90 % de los casos. Cerca de la
+frontera de ignición los errores son grandes y ahí conviene simular.
+
+Uso como programa: python emulador.py --n 3000 [--salida emulador.npz]
+"""
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+from modelo import RANGOS, PARAMETROS, DEFECTO
+from sensibilidad_global import evaluar, evaluar_paralelo, SALIDAS, _escalar
+
+
+RUTA = os.environ.get("TAC_EMULADOR", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                   "emulador.npz"))
+VECINOS = 8
+COBERTURA = 0.9
+# el sistema es denso de (n + 8)²: con 3000 puntos la matriz ya ocupa ~72 MB
+MAX_ENTRENAMIENTO = 3000
+# error máximo aceptado por salida (X_final, T_final, T_pico) antes de simular
+TOLERANCIAS = (0.01, 2.0, 2.0)
+
+
+def _cola(X):
+    return np.hstack([np.ones((len(X), 1)), X])
+
+
+class Emulador:
+
+    def __init__(self, centros, pesos, cola, residuos, limites, media_y, escala_y, factor,
+                 V, t_span, validacion=None):
+        self.centros = centros          # (N, 7) en [0, 1]
+        self.pesos = pesos              # (N, 3)
+        self.cola = cola                # (8, 3) polinomio lineal
+        self.residuos = residuos        # (N, 3) errores LOO en unidades de salida
+        self.limites = limites          # (7, 2)
+        self.media_y = media_y
+        self.escala_y = escala_y
+        self.factor = factor            # (3,) calibración del error estimado
+        self.V = V
+        self.t_span = tuple(t_span)
+        self.validacion = validacion or {}
+
+    # --- entrenamiento ---
+
+    @classmethod
+    def entrenar(cls, V, n=2000, limites=RANGOS, t_span=(0, 4), n_validacion=None, semilla=0,
+                 workers=None, progreso=None):
+        """Simula n puntos (LHS) en la caja `limites` más n_validacion (n/4) para
+        calibrar el error. progreso(hechos, total) se llama a medida que avanzan
+        las simulaciones."""
+        from scipy.stats import qmc
+        if n > MAX_ENTRENAMIENTO:
+            raise ValueError(f"A lo sumo {MAX_ENTRENAMIENTO} simulaciones de entrenamiento "
+                             f"(se pidieron {n})")
+        limites = np.asarray(limites, dtype=float)
+        n_validacion = n // 4 if n_validacion is None else n_validacion
+        U = qmc.LatinHypercube(d=len(PARAMETROS), seed=semilla).random(n + n_validacion)
+        P = _escalar(U, limites)
+        F = evaluar_paralelo(P, V, t_span, workers=workers, progreso=progreso)
+
+        media_y, escala_y = F[:n].mean(axis=0), F[:n].std(axis=0) + 1e-12
+        Yn = (F[:n] - media_y) / escala_y
+        X = U[:n]
+
+        # sistema [Φ Pᵀ; P 0] con Φ = r³; con su LU salen los pesos y la diagonal
+        # de la inversa que dan los errores LOO, sin formar la inversa entera
+        A = np.zeros((n + X.shape[1] + 1, n + X.shape[1] + 1))
+        A[:n, :n] = _distancias(X, X)**3
+        A[:n, n:] = _cola(X)
+        A[n:, :n] = _cola(X).T
+        lu = lu_factor(A, overwrite_a=True, check_finite=False)
+        coef = lu_solve(lu, np.vstack([Yn, np.zeros((len(A) - n, Yn.shape[1]))]),
+                        check_finite=False)
+        residuos = coef[:n] / _diagonal_inversa(lu, n)[:, None] * escala_y
+
+        emulador = cls(X, coef[:n], coef[n:], np.abs(residuos), limites, media_y, escala_y,
+                       np.ones(len(SALIDAS)), V, t_span)
+
+        if n_validacion:
+            pred, err = emulador.predecir(P[n:])
+            real = np.abs(pred - F[n:])
+            emulador.factor = np.quantile(real / np.maximum(err, 1e-12), COBERTURA, axis=0)
+            err = err * emulador.factor
+            emulador.validacion = {
+                "n": n_validacion,
+                "rmse": np.sqrt((real**2).mean(axis=0)),
+                "max": real.max(axis=0),
+                "cobertura": (real <= err).mean(axis=0),
+            }
+        return emulador
+
+    # --- predicción ---
+
+    def predecir(self, P, bloque=2048):
+        """Devuelve (Y, err) de forma (n, 3): predicción y error estimado"""
+        P = np.atleast_2d(np.asarray(P, dtype=float))
+        lo, hi = self.limites.T
+        X = (P - lo) / (hi - lo)
+        Y = np.empty((len(X), len(SALIDAS)))
+        E = np.empty_like(Y)
+        k = min(VECINOS, len(self.centros))
+        for i in range(0, len(X), bloque):
+            Xb = X[i:i + bloque]
+            D = _distancias(Xb, self.centros)
+            Y[i:i + bloque] = (D**3 @ self.pesos + _cola(Xb) @ self.cola) * self.escala_y \
+                + self.media_y
+            vecinos = np.argpartition(D, k - 1, axis=1)[:, :k]
+            w = 1 / (np.take_along_axis(D, vecinos, axis=1) + 1e-9)
+            E[i:i + bloque] = np.einsum("nk,nkj->nj", w, self.residuos[vecinos]) \
+                / w.sum(axis=1, keepdims=True)
+        # fuera de la caja no hay garantía: error infinito para forzar la simulación
+        fuera = ((X < 0) | (X > 1)).any(axis=1)
+        E = E * self.factor
+        E[fuera] = np.inf
+        return Y, E
+
+    # --- disco ---
+
+    def guardar(self, ruta=RUTA):
+        # temporal único en el mismo directorio: dos entrenamientos a la vez no
+        # se pisan y os.replace sigue siendo atómico
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=os.path.dirname(os.path.abspath(ruta)))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, centros=self.centros, pesos=self.pesos, cola=self.cola,
+                         residuos=self.residuos, limites=self.limites, media_y=self.media_y,
+                         escala_y=self.escala_y, factor=self.factor, V=self.V,
+                         t_span=np.asarray(self.t_span, dtype=float),
+                         **{f"val_{k}": np.asarray(v) for k, v in self.validacion.items()})
+            os.replace(tmp, ruta)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta=RUTA):
+        """El emulador guardado en ruta, o None si no existe"""
+        if not os.path.exists(ruta):
+            return None
+        with np.load(ruta) as d:
+            validacion = {k[4:]: d[k] for k in d.files if k.startswith("val_")}
+            return cls(d["centros"], d["pesos"], d["cola"], d["residuos"], d["limites"],
+                       d["media_y"], d["escala_y"], d["factor"], float(d["V"]),
+                       tuple(d["t_span"]), validacion)
+
+
+def ventana(base, fraccion=0.2):
+    """Caja alrededor de `base` de ±fraccion del ancho de cada rango, recortada
+    a RANGOS. Sobre toda la caja de RANGOS la frontera de ignición deja errores
+    grandes casi en todas partes; en una ventana el emulador sí sirve."""
+    R = np.asarray(RANGOS, dtype=float)
+    medio = (R[:, 1] - R[:, 0]) * fraccion
+    base = np.asarray(base, dtype=float)
+    return np.column_stack([np.maximum(base - medio, R[:, 0]), np.minimum(base + medio, R[:, 1])])
+
+
+def _distancias(A, B):
+    d2 = (A**2).sum(axis=1)[:, None] + (B**2).sum(axis=1)[None] - 2 * A @ B.T
+    return np.sqrt(np.maximum(d2, 0.0))
+
+
+def _diagonal_inversa(lu, n, bloque=512):
+    """Los n primeros elementos de la diagonal de A⁻¹ a partir de la LU de A,
+    resolviendo contra bloques de vectores canónicos"""
+    m = len(lu[0])
+    diagonal = np.empty(n)
+    for i in range(0, n, bloque):
+        k = min(bloque, n - i)
+        E = np.zeros((m, k))
+        E[i + np.arange(k), np.arange(k)] = 1.0
+        diagonal[i:i + k] = lu_solve(lu, E, check_finite=False)[i + np.arange(k), np.arange(k)]
+    return diagonal
+
+
+def predecir_o_simular(emulador, P, V, tolerancias=TOLERANCIAS, t_span=(0, 4)):
+    """Predice con el emulador y simula sólo los puntos cuyo error estimado
+    supera `tolerancias` (una por salida). Devuelve (F, err, simulado) donde err
+    es 0 en los puntos simulados y `simulado` es la máscara de esos puntos."""
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    if emulador is None or emulador.V != V or tuple(emulador.t_span) != tuple(t_span):
+        return evaluar(P, V, t_span), np.zeros((len(P), len(SALIDAS))), np.ones(len(P), bool)
+    F, err = emulador.predecir(P)
+    simulado = (err > np.asarray(tolerancias)).any(axis=1)
+    if simulado.any():
+        F[simulado] = evaluar(P[simulado], V, t_span)
+        err[simulado] = 0.0
+    return F, err, simulado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrena el emulador del reactor TAC")
+    parser.add_argument("--n", type=int, default=2000,
+                        help=f"simulaciones de entrenamiento (a lo sumo {MAX_ENTRENAMIENTO})")
+    parser.add_argument("--fraccion", type=float, default=None,
+                        help="entrenar en ±fraccion de cada rango alrededor del caso por defecto "
+                             "(por defecto, toda la caja de RANGOS)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--salida", default=RUTA)
+    args = parser.parse_args()
+    if not 1 <= args.n <= MAX_ENTRENAMIENTO:
+        parser.error(f"--n debe estar entre 1 y {MAX_ENTRENAMIENTO}")
+
+    t_ini = time.perf_counter()
+    limites = RANGOS if args.fraccion is None else ventana(DEFECTO, args.fraccion)
+    em = Emulador.entrenar((1/7.484)*500, n=args.n, limites=limites, workers=args.workers)
+    print(f"Entrenado en {time.perf_counter() - t_ini:.1f} s -> {em.guardar(args.salida)}")
+    for k, v in em.validacion.items():
+        print(f"{k:10s}", np.round(v, 4) if np.ndim(v) else v)
@@ -0,0 +1,96 @@
+"""Trazas livianas para las figuras de las páginas.
+
+Las series largas se reducen con LTTB (Largest-Triangle-Three-Buckets,
+Steinarsson 2013) a ~2 puntos por píxel del ancho de la figura: conserva
+picos y quiebres, que es lo que importa en un arranque. Las series que aun
+así quedan grandes (nubes de puntos de un barrido) van con Scattergl, que
+dibuja con WebGL; no se usa siempre porque el navegador admite pocos
+contextos WebGL por página. En Python puro reducir 10⁶ puntos lleva ~60 ms;
+con TAC_BACKEND=numba (como kernel.py) LTTB se compila con Numba, ~4 ms, pero
+recién la primera vez que una serie supera el umbral: importar Numba y cargar
+la cache cuesta ~0.7 s y las series de las páginas rara vez lo superan.
+
+Uso: fig.add_trace(serie(t, T, mode="lines", name="T"))
+"""
+import os
+
+import numpy as np
+
+
+ANCHO = 1200        # px; st.plotly_chart con use_container_width rara vez supera esto
+PUNTOS_POR_PX = 2
+UMBRAL_GL = 5000    # puntos dibujados a partir de los cuales conviene WebGL
+
+
+def _lttb(x, y, n):
+    N = len(x)
+    bordes = np.linspace(1, N - 1, n - 1).astype(np.int64)
+    idx = np.empty(n, dtype=np.int64)
+    idx[0], idx[n - 1] = 0, N - 1
+    a = 0
+    for i in range(n - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        # el tercer vértice del triángulo es el promedio del balde siguiente
+        sig = bordes[i + 2] if i + 2 < n - 1 else N
+        mx, my = x[fin:sig].mean(), y[fin:sig].mean()
+        area = np.abs((x[a] - mx) * (y[ini:fin] - y[a]) - (x[a] - x[ini:fin]) * (my - y[a]))
+        a = ini + np.argmax(area)
+        idx[i + 1] = a
+    return idx
+
+
+_nucleo = None
+
+
+def _obtener_nucleo():
+    global _nucleo
+    if _nucleo is None:
+        _nucleo = _lttb
+        if os.environ.get("TAC_BACKEND", "").lower() == "numba":
+            try:
+                from numba import njit
+                _nucleo = njit(cache=True)(_lttb)
+            except ImportError:
+                pass
+    return _nucleo
+
+
+def lttb(x, y, n):
+    """Índices de los n puntos que conserva LTTB (todos si la serie es más corta)"""
+    x = np.ascontiguousarray(x, dtype=float)
+    y = np.ascontiguousarray(y, dtype=float)
+    if n >= len(x) or n < 3:
+        return np.arange(len(x))
+    return _obtener_nucleo()(x, y, int(n))
+
+
+def reducir(x, y, ancho=ANCHO):
+    """(x, y) reducidos a PUNTOS_POR_PX por píxel; x debe ser monótona"""
+    idx = lttb(x, y, ancho * PUNTOS_POR_PX)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+def serie(x, y, ancho=ANCHO, **kwargs):
+    """go.Scatter (o go.Scattergl si quedan muchos puntos) con la serie reducida.
+
+    Sólo se reducen las líneas; una nube de marcadores se dibuja completa. Si x
+    no es monótona (curva de fase como Ca(T)) se conservan los puntos que LTTB
+    elige para x y para y en función del índice."""
+    import plotly.graph_objects as go
+    x, y = np.asarray(x), np.asarray(y)
+    n = ancho * PUNTOS_POR_PX
+    if "lines" in kwargs.get("mode", "lines") and len(x) > n:
+        dx = np.diff(x)
+        if np.all(dx >= 0) or np.all(dx <= 0):
+            x, y = reducir(x, y, ancho)
+        else:
+            i = np.arange(len(x), dtype=float)
+            idx = np.union1d(lttb(i, x, n // 2), lttb(i, y, n // 2))
+            x, y = x[idx], y[idx]
+    traza = go.Scattergl if len(x) > UMBRAL_GL else go.Scatter
+    return traza(x=x, y=y, **kwargs)
+
+
+def carga(fig):
+    """Bytes del JSON que se manda al navegador para la figura"""
+    return len(fig.to_json().encode("utf-8"))
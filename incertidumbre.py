@@ -0,0 +1,195 @@
+"""Propagación de incertidumbre por Monte Carlo.
+
+Los parámetros inciertos se muestrean por bloques con hipercubo latino (cada
+bloque es un LHS propio, así que la unión sigue siendo un estimador insesgado)
+y se simulan en paralelo. Las estadísticas se acumulan en línea: medias y
+varianzas combinadas por bloques, histogramas de bordes fijos para las
+distribuciones y cuantiles, conteo de excedencias de T_lim y una muestra de
+reserva acotada para graficar. La memoria no depende del número de muestras.
+"""
+import os
+from concurrent.futures import wait, FIRST_COMPLETED
+
+import numpy as np
+
+from modelo import PARAMETROS, RANGOS
+from sensibilidad_global import evaluar, SALIDAS
+from barrido import obtener_pool
+
+
+# (tipo, a, b[, c]): normal (media, desvío), uniforme (mín, máx),
+# triangular (mín, moda, máx), lognormal (mediana, desvío del logaritmo)
+DISTRIBUCIONES = ("normal", "uniforme", "triangular", "lognormal")
+
+# cota física de T dentro de RANGOS (la de estados_estacionarios en el peor caso):
+# el calor de reacción por mol de A no alcanza a calentar más que 36000/35 °F
+# una corriente que lo lleva, por encima de la más caliente de T0 y Ta1
+T_MAX = max(RANGOS[PARAMETROS.index("T0")][1], RANGOS[PARAMETROS.index("Ta1")][1]) \
+    + 36000 / 35 + 1.0
+# bordes de los histogramas de cada salida (X_final, T_final, T_pico), de 0.5 °F en T
+_BORDES_T = np.linspace(0, 0.5 * np.ceil(2 * T_MAX), int(np.ceil(2 * T_MAX)) + 1)
+BORDES = (np.linspace(-0.05, 1.05, 221), _BORDES_T, _BORDES_T)
+
+
+def transformar(U, dist):
+    """Lleva U uniforme en (0, 1) a la distribución dist por su inversa"""
+    from scipy import stats  # scipy.stats es pesado: sólo se importa al muestrear
+    tipo, *p = dist
+    if tipo == "normal":
+        if p[1] < 0:
+            raise ValueError(f"Desvío negativo: {p[1]}")
+        if p[1] == 0:
+            return np.full_like(U, p[0], dtype=float)   # sin incertidumbre
+        return stats.norm.ppf(U, loc=p[0], scale=p[1])
+    if tipo == "uniforme":
+        return p[0] + U * (p[1] - p[0])
+    if tipo == "triangular":
+        lo, moda, hi = p
+        if not lo <= moda <= hi:
+            raise ValueError(f"Triangular con moda fuera de [mín, máx]: {p}")
+        if hi == lo:
+            return np.full_like(U, lo, dtype=float)
+        return stats.triang.ppf(U, c=(moda - lo) / (hi - lo), loc=lo, scale=hi - lo)
+    if tipo == "lognormal":
+        if p[1] < 0:
+            raise ValueError(f"Desvío negativo: {p[1]}")
+        return p[0] * np.exp(p[1] * stats.norm.ppf(U))
+    raise ValueError(f"Distribución desconocida: {tipo}")
+
+
+def muestrear(base, distribuciones, n, semilla=0):
+    """n filas de parámetros (orden de PARAMETROS) con los inciertos muestreados
+    por LHS y recortados a RANGOS"""
+    from scipy.stats import qmc
+    P = np.tile(np.asarray(base, dtype=float), (n, 1))
+    nombres = list(distribuciones)
+    U = qmc.LatinHypercube(d=len(nombres), seed=semilla).random(n)
+    for i, p in enumerate(nombres):
+        j = PARAMETROS.index(p)
+        P[:, j] = np.clip(transformar(U[:, i], distribuciones[p]), *RANGOS[j])
+    return P
+
+
+class Acumulador:
+    """Estadísticas de las salidas que se actualizan bloque a bloque"""
+
+    def __init__(self, T_lim, reserva=1000, semilla=0):
+        self.T_lim = T_lim
+        self.n = 0
+        self.media = np.zeros(len(SALIDAS))
+        self.m2 = np.zeros(len(SALIDAS))
+        self.minimo = np.full(len(SALIDAS), np.inf)
+        self.maximo = np.full(len(SALIDAS), -np.inf)
+        self.histogramas = [np.zeros(len(b) - 1, dtype=np.int64) for b in BORDES]
+        self.debajo = np.zeros(len(SALIDAS), dtype=np.int64)   # fuera de BORDES
+        self.encima = np.zeros(len(SALIDAS), dtype=np.int64)
+        self.excedencias = 0
+        self.reserva = reserva
+        self.muestra_P = np.empty((0, len(PARAMETROS)))
+        self.muestra_F = np.empty((0, len(SALIDAS)))
+        self._rng = np.random.default_rng(semilla)
+
+    def agregar(self, P, F):
+        m = len(F)
+        if m == 0:
+            return
+        # combinación de Chan et al. de medias y sumas de cuadrados
+        media_b = F.mean(axis=0)
+        m2_b = ((F - media_b)**2).sum(axis=0)
+        delta = media_b - self.media
+        total = self.n + m
+        self.media += delta * m / total
+        self.m2 += m2_b + delta**2 * self.n * m / total
+
+        self.minimo = np.minimum(self.minimo, F.min(axis=0))
+        self.maximo = np.maximum(self.maximo, F.max(axis=0))
+        for j, bordes in enumerate(BORDES):
+            # lo que cae fuera de los bordes se cuenta aparte para no deformar los cuantiles
+            self.histogramas[j] += np.histogram(F[:, j], bordes)[0]
+            self.debajo[j] += int((F[:, j] < bordes[0]).sum())
+            self.encima[j] += int((F[:, j] > bordes[-1]).sum())
+        self.excedencias += int((F[:, SALIDAS.index("T_pico")] > self.T_lim).sum())
+        self._reservar(P, F)
+        self.n = total
+
+    def _reservar(self, P, F):
+        # muestreo de reserva (algoritmo R) vectorizado por bloque
+        libres = max(self.reserva - len(self.muestra_F), 0)
+        self.muestra_P = np.vstack([self.muestra_P, P[:libres]])
+        self.muestra_F = np.vstack([self.muestra_F, F[:libres]])
+        if len(F) > libres:
+            posiciones = self.n + libres + np.arange(len(F) - libres)
+            destino = self._rng.integers(0, posiciones + 1)
+            for i in np.flatnonzero(destino < self.reserva):
+                self.muestra_P[destino[i]] = P[libres + i]
+                self.muestra_F[destino[i]] = F[libres + i]
+
+    def cuantiles(self, j, q):
+        """Cuantiles de la salida j interpolados sobre el histograma; -inf/inf si
+        caen entre las muestras que quedaron fuera de BORDES"""
+        n = max(self.n, 1)
+        acumulada = (self.debajo[j] + np.r_[0, np.cumsum(self.histogramas[j])]) / n
+        q = np.asarray(q, dtype=float)
+        return np.where(q < acumulada[0], -np.inf,
+                        np.where(q > acumulada[-1], np.inf, np.interp(q, acumulada, BORDES[j])))
+
+    def probabilidad(self):
+        """P(T_pico > T_lim) con intervalo de Wilson del 95 %"""
+        n, z = max(self.n, 1), 1.96
+        p = self.excedencias / n
+        centro = (p + z**2 / (2*n)) / (1 + z**2 / n)
+        ancho = z * np.sqrt(p*(1 - p)/n + z**2/(4*n**2)) / (1 + z**2 / n)
+        return p, max(centro - ancho, 0.0), min(centro + ancho, 1.0)
+
+    def resumen(self):
+        q = (0.05, 0.5, 0.95, 0.99)
+        return {
+            "n": self.n,
+            "media": self.media.copy(),
+            "desvio": np.sqrt(self.m2 / max(self.n - 1, 1)),
+            "minimo": self.minimo.copy(),
+            "maximo": self.maximo.copy(),
+            "cuantiles": {s: dict(zip(q, self.cuantiles(j, q))) for j, s in enumerate(SALIDAS)},
+            "prob_excedencia": self.probabilidad(),
+        }
+
+
+def montecarlo(base, V, distribuciones, n=10000, bloque=500, T_lim=180.0, t_span=(0, 4),
+               workers=None, semilla=0):
+    """Propaga la incertidumbre de `distribuciones` ({parámetro: dist}) alrededor
+    de `base` (orden de PARAMETROS).
+
+    Generador: después de cada bloque entrega el Acumulador actualizado. Con
+    workers=1 se simula en este proceso; si no, se mantienen a lo sumo dos
+    bloques por proceso en vuelo para que la memoria quede acotada.
+    """
+    acumulador = Acumulador(T_lim, semilla=semilla)
+    bloques = [(i, min(bloque, n - i)) for i in range(0, n, bloque)]
+
+    if workers == 1:
+        for k, (_, m) in enumerate(bloques):
+            P = muestrear(base, distribuciones, m, semilla=semilla + k)
+            acumulador.agregar(P, evaluar(P, V, t_span))
+            yield acumulador
+        return
+
+    pool = obtener_pool(workers)
+    en_vuelo = {}
+    pendientes = iter(enumerate(bloques))
+    max_en_vuelo = 2 * (workers or os.cpu_count() or 1)
+    try:
+        while True:
+            for k, (_, m) in pendientes:
+                P = muestrear(base, distribuciones, m, semilla=semilla + k)
+                en_vuelo[pool.submit(evaluar, P, V, t_span)] = P
+                if len(en_vuelo) >= max_en_vuelo:
+                    break
+            if not en_vuelo:
+                return
+            hechos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+            for fut in hechos:
+                acumulador.agregar(en_vuelo.pop(fut), fut.result())
+            yield acumulador
+    finally:
+        for fut in en_vuelo:
+            fut.cancel()
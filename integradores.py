@@ -0,0 +1,120 @@
+"""Integradores propios compatibles con solve_ivp (method=<clase>)."""
+import numpy as np
+from scipy.integrate import OdeSolver, DenseOutput
+from scipy.linalg import lu_factor, lu_solve
+
+
+class Rosenbrock23(OdeSolver):
+    """Rosenbrock modificado de orden 2(3) (Shampine y Reichelt, ode23s).
+
+    Linealmente implícito: cada paso factoriza W = I - h·d·J una sola vez y no
+    itera Newton, así que el costo por paso es fijo (3 evaluaciones del lado
+    derecho, 1 LU). Adecuado para tolerancias laxas en problemas rígidos.
+    Lleva la cuenta exacta de pasos rechazados en `n_rechazados`.
+    """
+    D = 1 / (2 + np.sqrt(2))
+    E32 = 6 + np.sqrt(2)
+    MAX_RECHAZOS = 50   # rechazos seguidos de un mismo paso antes de abandonar
+
+    def __init__(self, fun, t0, y0, t_bound, jac=None, rtol=1e-3, atol=1e-6,
+                 first_step=None, max_step=np.inf, vectorized=False, **extraneous):
+        super().__init__(fun, t0, y0, t_bound, vectorized)
+        self.rtol, self.atol = rtol, atol
+        self.max_step = max_step
+        self._jac = jac
+        self.f = self.fun(self.t, self.y)
+        self.njev = 0
+        self.nlu = 0
+        self.n_rechazados = 0
+        if first_step is None:
+            escala = atol + rtol * np.abs(self.y)
+            d0 = np.linalg.norm(self.f / escala) / np.sqrt(self.n)
+            first_step = 0.01 / max(d0, 1e-5)
+        self.h_abs = min(first_step, max_step, abs(t_bound - t0))
+        self._denso = None
+
+    def _jacobiano(self, t, y):
+        self.njev += 1
+        if self._jac is not None:
+            return np.atleast_2d(self._jac(t, y))
+        # diferencias hacia adelante si no se provee el Jacobiano
+        J = np.empty((self.n, self.n))
+        for i in range(self.n):
+            dy = np.zeros(self.n)
+            dy[i] = np.sqrt(np.finfo(float).eps) * max(1.0, abs(y[i]))
+            J[:, i] = (self.fun(t, y + dy) - self.f) / dy[i]
+        return J
+
+    def _step_impl(self):
+        t, y, f = self.t, self.y, self.f
+        J = self._jacobiano(t, y)
+        # derivada temporal explícita para lados derechos no autónomos
+        dt = np.sqrt(np.finfo(float).eps) * max(1.0, abs(t))
+        T = (self.fun(t + self.direction * dt, y) - f) / (self.direction * dt)
+        I = np.eye(self.n)
+
+        h_abs = self.h_abs
+        rechazos = 0
+        while True:
+            if h_abs < 10 * np.abs(np.nextafter(t, self.direction * np.inf) - t):
+                return False, self.TOO_SMALL_STEP
+            h = h_abs * self.direction
+            t_new = t + h
+            if self.direction * (t_new - self.t_bound) > 0:
+                t_new = self.t_bound
+                h = t_new - t
+                h_abs = abs(h)
+
+            # sin check_finite: un NaN debe llegar al error y rechazar el paso, no lanzar
+            LU = lu_factor(I - h * self.D * J, check_finite=False)
+            self.nlu += 1
+            k1 = lu_solve(LU, f + h * self.D * T, check_finite=False)
+            f1 = self.fun(t + 0.5 * h, y + 0.5 * h * k1)
+            k2 = lu_solve(LU, f1 - k1, check_finite=False) + k1
+            y_new = y + h * k2
+            f2 = self.fun(t_new, y_new)
+            k3 = lu_solve(LU, f2 - self.E32 * (k2 - f1) - 2 * (k1 - f) + h * self.D * T,
+                          check_finite=False)
+
+            escala = self.atol + self.rtol * np.maximum(np.abs(y), np.abs(y_new))
+            error = np.linalg.norm(h / 6 * (k1 - 2 * k2 + k3) / escala) / np.sqrt(self.n)
+            if not np.isfinite(error):
+                factor = 0.2    # NaN o inf (desborde del lado derecho): se achica el paso
+            elif error > 0:
+                factor = min(5.0, 0.8 * error ** (-1 / 3))
+            else:
+                factor = 5.0
+            if error <= 1:
+                break
+            self.n_rechazados += 1
+            rechazos += 1
+            if rechazos >= self.MAX_RECHAZOS:
+                return False, f"{rechazos} rechazos seguidos en t = {t:.6g}"
+            h_abs *= max(0.2, factor)
+
+        self.t_old = t
+        self.t, self.y, self.f = t_new, y_new, f2
+        self._denso = (y, k1, k2, h)
+        self.h_abs = min(self.max_step, h_abs * factor)
+        return True, None
+
+    def _dense_output_impl(self):
+        return _Rosenbrock23Densa(self.t_old, self.t, *self._denso, self.D)
+
+
+class _Rosenbrock23Densa(DenseOutput):
+    # extensión continua de ode23s: y(t0 + s·h) = y0 + h·(s(1-s)/(1-2d)·k1 + s(s-2d)/(1-2d)·k2)
+    def __init__(self, t_old, t, y_old, k1, k2, h, d):
+        super().__init__(t_old, t)
+        self.y_old, self.k1, self.k2, self.h, self.d = y_old, k1, k2, h, d
+
+    def _call_impl(self, t):
+        s = (np.asarray(t) - self.t_old) / self.h
+        a = s * (1 - s) / (1 - 2 * self.d)
+        b = s * (s - 2 * self.d) / (1 - 2 * self.d)
+        if s.ndim == 0:
+            return self.y_old + self.h * (a * self.k1 + b * self.k2)
+        return self.y_old[:, None] + self.h * (np.outer(self.k1, a) + np.outer(self.k2, b))
+
+
+METODOS = {"Rosenbrock23": Rosenbrock23}
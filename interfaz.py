@@ -0,0 +1,28 @@
+import streamlit as st
+
+
+def barra_lateral():
+    """Parámetros de operación comunes a las páginas de simulación"""
+    st.sidebar.header("Parámetros de simulación")
+    Fa0 = st.sidebar.number_input("Flujo A (lb-mol/h)", 1.0, 200.0, 80.0)
+    Fb0 = st.sidebar.number_input("Flujo B (lb-mol/h)", 1.0, 2000.0, 1000.0)
+    Fm0 = st.sidebar.number_input("Flujo Inerte (lb-mol/h)", 0.0, 500.0, 100.0)
+    T0 = st.sidebar.slider("Temperatura inicial (°F)", 30, 130, 75)
+    Ta1 = st.sidebar.slider("Temperatura del refrigerante (°F)", 20, 200, 60)
+    UA = st.sidebar.number_input("UA (BTU/h·°F)", 1000.0, 50000.0, 16000.0)
+    mc = st.sidebar.number_input("Flujo másico refrigerante (lb-mol/h)", 100.0, 5000.0, 1000.0)
+    return Fa0, Fb0, Fm0, T0, Ta1, UA, mc
+
+
+@st.cache_resource(show_spinner="Preparando el simulador...")
+def precarga():
+    """Imports pesados, núcleos compilados y caso por defecto, una vez por proceso"""
+    from precarga import precargar
+    return precargar()
+
+
+@st.cache_resource(show_spinner=False)
+def cargar_emulador():
+    """Emulador guardado en disco, o None; tras reentrenar llamar a cargar_emulador.clear()"""
+    from emulador import Emulador
+    return Emulador.cargar()
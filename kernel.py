@@ -0,0 +1,121 @@
+"""Núcleo del lado derecho del reactor con las constantes precalculadas.
+
+Por defecto es Python puro sobre escalares (math en lugar de numpy). Con
+TAC_BACKEND=numba y Numba instalado se compila (cache=True, se guarda en
+__pycache__): la llamada al lado derecho es ~3x más rápida, pero una
+integración completa apenas cambia porque el costo está en solve_ivp
+(benchmarks/bench_kernel.py), así que no justifica el arranque del JIT.
+"""
+import os
+import math
+
+import numpy as np
+
+try:
+    if os.environ.get("TAC_BACKEND", "").lower() != "numba":
+        raise ImportError
+    from numba import njit
+    BACKEND = "numba"
+except ImportError:
+    njit = None
+    BACKEND = "python"
+
+
+R = 1.987
+
+
+def constantes(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0):
+    """Términos que sólo dependen de los parámetros: se calculan una vez por simulación"""
+    v0 = Fa0/0.923 + Fb0/3.45 + Fm0/1.54
+    ThetaCp = 35 + Fb0/Fa0*18 + Fm0/Fa0*19.5
+    return np.array([
+        v0 / V,                                      # 1/tau
+        Fa0 / v0,                                    # Ca0
+        Fb0 / v0,                                    # Cb0
+        Fm0 / v0,                                    # Cm0
+        Fa0 * ThetaCp,
+        mc * 18 * (1 - math.exp(-UA/(18*mc))),       # Q = c5 * (Ta1 - T)
+        Ta1,
+        T0,
+        V,
+    ], dtype=float)
+
+
+def _rhs(y, c, out):
+    Ca, Cb, Cc, Cm, T = y[0], y[1], y[2], y[3], y[4]
+    k = 16.96e12 * math.exp(-32400 / (R * (T + 460)))
+    r = k * Ca
+    inv_tau = c[0]
+    V = c[8]
+
+    out[0] = (c[1] - Ca)*inv_tau - r
+    out[1] = (c[2] - Cb)*inv_tau - r
+    out[2] = -Cc*inv_tau + r
+    out[3] = (c[3] - Cm)*inv_tau
+    NCp = V*(Ca*35 + Cb*18 + Cc*46 + Cm*19.5) + 1e-8
+    out[4] = (c[5]*(c[6] - T) - c[4]*(T - c[7]) + 36000*r*V) / NCp
+    return out
+
+
+def _jac(y, c, out):
+    Ca, Cb, Cc, Cm, T = y[0], y[1], y[2], y[3], y[4]
+    k = 16.96e12 * math.exp(-32400 / (R * (T + 460)))
+    dk_dT = k * 32400 / (R * (T + 460)**2)
+    inv_tau = c[0]
+    V = c[8]
+
+    for i in range(5):
+        for j in range(5):
+            out[i, j] = 0.0
+
+    out[0, 0] = -inv_tau - k
+    out[0, 4] = -dk_dT * Ca
+    out[1, 0] = -k
+    out[1, 1] = -inv_tau
+    out[1, 4] = -dk_dT * Ca
+    out[2, 0] = k
+    out[2, 2] = -inv_tau
+    out[2, 4] = dk_dT * Ca
+    out[3, 3] = -inv_tau
+
+    D = V*(Ca*35 + Cb*18 + Cc*46 + Cm*19.5) + 1e-8
+    dT_dt = (c[5]*(c[6] - T) - c[4]*(T - c[7]) + 36000*k*Ca*V) / D
+    out[4, 0] = (36000*k*V - dT_dt*35*V) / D
+    out[4, 1] = -dT_dt*18*V / D
+    out[4, 2] = -dT_dt*46*V / D
+    out[4, 3] = -dT_dt*19.5*V / D
+    out[4, 4] = (-c[5] - c[4] + 36000*dk_dT*Ca*V) / D
+    return out
+
+
+if njit is not None:
+    _rhs = njit(cache=True)(_rhs)
+    _jac = njit(cache=True)(_jac)
+
+
+def crear_rhs(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0):
+    """Devuelve (fun, jac) para solve_ivp con las constantes ya calculadas.
+
+    Cada llamada devuelve un arreglo nuevo: Radau y los Rosenbrock guardan
+    f entre pasos, así que no se puede reutilizar el buffer de salida.
+    """
+    c = constantes(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+
+    def fun(t, y):
+        return _rhs(np.asarray(y, dtype=float), c, np.empty(5))
+
+    def jac(t, y):
+        return _jac(np.asarray(y, dtype=float), c, np.empty((5, 5)))
+
+    return fun, jac
+
+
+def calentar():
+    """Fuerza la compilación (o la carga desde la cache de Numba) de los núcleos"""
+    c = constantes(80.0, 1000.0, 100.0, 500/7.484, 16000.0, 60.0, 1000.0, 75.0)
+    y = np.array([0.0, 3.45, 0.0, 0.0, 75.0])
+    _rhs(y, c, np.empty(5))
+    _jac(y, c, np.empty((5, 5)))
+
+
+calentar()
@@ -0,0 +1,173 @@
+"""Mapas de 2 o 3 parámetros con refinamiento adaptativo.
+
+Los puntos viven en una grilla global con 2**NIVEL_MAX divisiones por eje
+sobre RANGOS, así que un mismo punto siempre cae en el mismo valor exacto:
+al acercarse a una zona se reutilizan las simulaciones ya hechas. Se parte de
+una grilla gruesa y se subdividen sólo las celdas donde las salidas cambian
+mucho entre esquinas o donde T_pico cruza el límite de runaway.
+"""
+import threading
+from collections import OrderedDict
+from itertools import product
+
+import numpy as np
+
+from modelo import PARAMETROS, RANGOS
+from sensibilidad_global import evaluar_paralelo, SALIDAS
+
+
+NIVEL_MAX = 12
+_DIV = 2**NIVEL_MAX
+
+# Memoria de simulaciones compartida entre mapas (y entre reruns y sesiones de
+# Streamlit, que corren en hilos distintos: se accede sólo con el lock tomado)
+MAX_MEMORIA = 200_000
+_memoria = OrderedDict()
+_lock = threading.Lock()
+
+
+def _valores(j, k):
+    lo, hi = RANGOS[j]
+    return lo + np.asarray(k) * (hi - lo) / _DIV
+
+
+def _indices(j, a, b):
+    lo, hi = RANGOS[j]
+    ka = int(np.clip(np.floor((a - lo) / (hi - lo) * _DIV), 0, _DIV))
+    kb = int(np.clip(np.ceil((b - lo) / (hi - lo) * _DIV), 0, _DIV))
+    return ka, max(kb, ka + 1)
+
+
+def mapa_adaptativo(ejes, ventanas, base, V, t_span=(0, 4), n_inicial=9, niveles=4,
+                    tol=0.05, T_lim=180.0, max_puntos=20000, workers=None, progreso=None):
+    """Evalúa X_final, T_final y T_pico sobre una ventana de 2 o 3 parámetros.
+
+    ejes: nombres de PARAMETROS; ventanas: (desde, hasta) de cada eje; base:
+    valores de los 7 parámetros (orden de PARAMETROS) para los que quedan
+    fijos. Devuelve {"ejes", "ventanas", "puntos" (n, d), "salidas" (n, 3),
+    "nuevos", "reutilizados", "T_lim"}. progreso(fraccion) se llama entre
+    bloques de simulaciones; si lanza una excepción el mapa se corta ahí.
+    """
+    d = len(ejes)
+    cols = [PARAMETROS.index(p) for p in ejes]
+    base = np.asarray(base, dtype=float)
+    clave_base = (V, tuple(t_span))
+
+    # grilla inicial alineada con múltiplos del paso para reutilizar puntos
+    ejes_k = []
+    for j, (a, b) in zip(cols, ventanas):
+        ka, kb = _indices(j, min(a, b), max(a, b))
+        paso = 2**max(int(np.floor(np.log2((kb - ka) / max(n_inicial - 1, 1)))), 0)
+        ejes_k.append(np.arange(ka // paso * paso, -(-kb // paso) * paso + 1, paso))
+    H0 = np.array([k[1] - k[0] for k in ejes_k])
+
+    indice = {}
+    K_tot, F_tot = [], []
+    cuenta = {"nuevos": 0, "reutilizados": 0}
+
+    def avance(nivel, hechos=1, total=1):
+        # cada nivel (la grilla inicial es el 0) pesa lo mismo; puede terminar antes
+        if progreso is not None:
+            progreso((nivel + hechos / total) / (niveles + 1))
+
+    def asegurar(K, nivel):
+        faltan = list(dict.fromkeys(tuple(k) for k in K.tolist() if tuple(k) not in indice))
+        if not faltan:
+            return
+        P = np.tile(base, (len(faltan), 1))
+        Kf = np.array(faltan)
+        for i, j in enumerate(cols):
+            P[:, j] = _valores(j, Kf[:, i])
+        claves = [clave_base + tuple(fila) for fila in P.tolist()]
+        F = np.empty((len(P), len(SALIDAS)))
+        sin_memoria = []
+        with _lock:
+            for i, c in enumerate(claves):
+                if c in _memoria:
+                    _memoria.move_to_end(c)
+                    F[i] = _memoria[c]
+                else:
+                    sin_memoria.append(i)
+        if sin_memoria:
+            # la simulación corre sin el lock; otra sesión puede estar usando la memoria
+            F[sin_memoria] = evaluar_paralelo(P[sin_memoria], V, t_span, workers=workers,
+                                              progreso=lambda h, t: avance(nivel, h, t))
+            with _lock:
+                for i in sin_memoria:
+                    _memoria[claves[i]] = F[i]
+                while len(_memoria) > MAX_MEMORIA:
+                    _memoria.popitem(last=False)
+        cuenta["nuevos"] += len(sin_memoria)
+        cuenta["reutilizados"] += len(P) - len(sin_memoria)
+        for k, f in zip(faltan, F):
+            indice[k] = len(K_tot)
+            K_tot.append(k)
+            F_tot.append(f)
+
+    esquinas = np.array(list(product((0, 1), repeat=d)))
+    hijos = np.array(list(product((0, 1, 2), repeat=d)))
+
+    C = np.array(list(product(*(k[:-1] for k in ejes_k))))
+    H = np.tile(H0, (len(C), 1))
+    asegurar(np.array(list(product(*ejes_k))), 0)
+    avance(0)
+
+    for nivel in range(1, niveles + 1):
+        divisibles = (H >= 2).all(axis=1)
+        if not divisibles.any():
+            break
+        F_todas = np.array(F_tot)
+        escala = np.ptp(F_todas, axis=0) + 1e-12
+        Fc = np.array([[F_tot[indice[tuple(k)]] for k in c + esquinas * h]
+                       for c, h in zip(C.tolist(), H.tolist())])
+        variacion = (np.ptp(Fc, axis=1) / escala).max(axis=1)
+        Tp = Fc[:, :, SALIDAS.index("T_pico")]
+        cruza = (Tp.min(axis=1) < T_lim) & (Tp.max(axis=1) >= T_lim)
+        prioridad = np.where(cruza, 1 + variacion, variacion)
+        refinar = divisibles & ((variacion > tol) | cruza)
+
+        cupo = (max_puntos - len(K_tot)) // (len(hijos) - len(esquinas))
+        if cupo <= 0 or not refinar.any():
+            break
+        elegidas = np.flatnonzero(refinar)
+        elegidas = elegidas[np.argsort(-prioridad[elegidas])][:cupo]
+
+        medio = H[elegidas] // 2
+        asegurar((C[elegidas, None] + hijos[None] * medio[:, None]).reshape(-1, d), nivel)
+        nuevas_C = (C[elegidas, None] + esquinas[None] * medio[:, None]).reshape(-1, d)
+        nuevas_H = np.repeat(medio, len(esquinas), axis=0)
+        resto = np.setdiff1d(np.arange(len(C)), elegidas)
+        C = np.vstack([C[resto], nuevas_C])
+        H = np.vstack([H[resto], nuevas_H])
+        avance(nivel)
+
+    K = np.array(K_tot)
+    puntos = np.column_stack([_valores(j, K[:, i]) for i, j in enumerate(cols)])
+    return {"ejes": tuple(ejes), "ventanas": tuple(map(tuple, ventanas)), "puntos": puntos,
+            "salidas": np.array(F_tot), "T_lim": T_lim, **cuenta}
+
+
+def interpolar(mapa, resolucion=150, corte=None):
+    """Lleva el mapa a una grilla uniforme para graficar.
+
+    Devuelve (x, y, Z) con Z de forma (resolucion, resolucion, 3) en el orden
+    de SALIDAS. En mapas 3-D, `corte` fija el valor del tercer eje.
+    """
+    puntos = mapa["puntos"]
+    lo, hi = puntos.min(axis=0), puntos.max(axis=0)
+    escala = np.where(hi > lo, hi - lo, 1.0)
+    # se normaliza cada eje para que la triangulación no dependa de las unidades
+    if "_interpolador" not in mapa:
+        # scipy.interpolate arrastra scipy.optimize: sólo se importa al dibujar un mapa
+        from scipy.interpolate import LinearNDInterpolator
+        mapa["_interpolador"] = LinearNDInterpolator((puntos - lo) / escala, mapa["salidas"])
+
+    (x0, x1), (y0, y1) = mapa["ventanas"][:2]
+    x = np.linspace(min(x0, x1), max(x0, x1), resolucion)
+    y = np.linspace(min(y0, y1), max(y0, y1), resolucion)
+    XX, YY = np.meshgrid(x, y)
+    malla = [XX.ravel(), YY.ravel()]
+    if len(mapa["ejes"]) == 3:
+        malla.append(np.full(XX.size, mapa["ventanas"][2][0] if corte is None else corte))
+    Z = mapa["_interpolador"]((np.column_stack(malla) - lo) / escala)
+    return x, y, Z.reshape(resolucion, resolucion, -1)
@@ -0,0 +1,128 @@
+import numpy as np
+
+from modelo import simular_sensibilidades, sensibilidad_conversion, PARAMETROS, RANGOS
+from barrido import obtener_pool
+
+
+# Variables de decisión por defecto: T0 es la temperatura de arranque y de
+# alimentación, no una variable de operación
+VARIABLES = ("Fa0", "Fb0", "Fm0", "Ta1", "UA", "mc")
+
+
+class _Problema:
+    """Objetivo y restricción con sus gradientes a partir de una sola
+    integración con sensibilidades (se reutiliza mientras x no cambie)"""
+
+    def __init__(self, base, V, T_lim, variables, objetivo, t_span, n_puntos):
+        self.base = dict(zip(PARAMETROS, base))
+        self.V = V
+        self.T_lim = T_lim
+        self.variables = list(variables)
+        self.objetivo = objetivo
+        self.t_span = t_span
+        self.t_eval = np.linspace(t_span[0], t_span[1], n_puntos)
+        lim = np.array([RANGOS[PARAMETROS.index(v)] for v in self.variables])
+        self.lo, self.ancho = lim[:, 0], lim[:, 1] - lim[:, 0]
+        self.n_eval = 0
+        self.escala_f = 1.0
+        self._x = None
+
+    def parametros(self, x):
+        p = dict(self.base)
+        p.update(zip(self.variables, self.lo + np.asarray(x) * self.ancho))
+        return p
+
+    def _evaluar(self, x):
+        if self._x is not None and np.array_equal(x, self._x):
+            return
+        self.n_eval += 1
+        p = self.parametros(x)
+        Fa0, Fb0, Fm0 = p["Fa0"], p["Fb0"], p["Fm0"]
+        t, y, S = simular_sensibilidades(Fa0, Fb0, Fm0, self.V, p["UA"], p["Ta1"],
+                                         p["mc"], p["T0"], self.t_span, self.t_eval,
+                                         parametros=self.variables)
+        v0 = Fa0/0.923 + Fb0/3.45 + Fm0/1.54
+        if self.objetivo == "X":
+            f = 1 - y[0, -1] * v0 / Fa0
+            df = sensibilidad_conversion(y[0, -1], S[0, :, -1], Fa0, Fb0, Fm0,
+                                         self.variables)
+        else:
+            # producción de C a la salida: Fc = Cc * v0 (lb-mol/h)
+            d_v0 = {"Fa0": 1/0.923, "Fb0": 1/3.45, "Fm0": 1/1.54}
+            f = y[2, -1] * v0
+            df = S[2, :, -1] * v0 + y[2, -1] * np.array([d_v0.get(v, 0.0)
+                                                         for v in self.variables])
+        i_pico = np.argmax(y[4])
+
+        self._x = np.array(x)
+        self.f, self.df = f, df * self.ancho
+        self.T_pico = y[4, i_pico]
+        self.dT_pico = S[4, :, i_pico] * self.ancho
+        self.X = 1 - y[0, -1] * v0 / Fa0
+
+    # minimize trabaja con -objetivo/escala_f y restricción escalada g >= 0,
+    # ambos de orden 1 para que SLSQP no quede mal condicionado
+    def fun(self, x):
+        self._evaluar(x)
+        return -self.f / self.escala_f
+
+    def jac(self, x):
+        self._evaluar(x)
+        return -self.df / self.escala_f
+
+    def g(self, x):
+        self._evaluar(x)
+        return (self.T_lim - self.T_pico) / self.T_lim
+
+    def jac_g(self, x):
+        self._evaluar(x)
+        return -self.dT_pico / self.T_lim
+
+
+def optimizar(base, V, T_lim=180.0, x0=None, variables=VARIABLES, objetivo="X",
+              t_span=(0, 4), n_puntos=400, max_iter=60):
+    """Maximiza la conversión final (objetivo="X") o la producción de C
+    (objetivo="produccion") con la temperatura pico por debajo de T_lim.
+
+    base: valores de los siete parámetros (orden de PARAMETROS); x0 es el punto
+    inicial en [0, 1] sobre el rango de cada variable (por defecto, base).
+    """
+    prob = _Problema(base, V, T_lim, variables, objetivo, t_span, n_puntos)
+    if x0 is None:
+        x0 = [(prob.base[v] - lo) / a for v, lo, a in zip(prob.variables, prob.lo, prob.ancho)]
+    x0 = np.clip(x0, 0.0, 1.0)
+    prob._evaluar(x0)
+    prob.escala_f = max(abs(prob.f), 1e-8)
+
+    from scipy.optimize import minimize     # scipy.optimize es pesado: sólo al optimizar
+    res = minimize(prob.fun, x0, jac=prob.jac, method="SLSQP",
+                   bounds=[(0.0, 1.0)] * len(prob.variables),
+                   constraints=[{"type": "ineq", "fun": prob.g, "jac": prob.jac_g}],
+                   options={"maxiter": max_iter, "ftol": 1e-6})
+
+    prob._evaluar(res.x)
+    return {
+        "parametros": prob.parametros(res.x),
+        "objetivo": prob.f,
+        "X": prob.X,
+        "T_pico": prob.T_pico,
+        "factible": prob.T_pico <= T_lim * (1 + 1e-6),
+        "exito": bool(res.success),
+        "mensaje": res.message,
+        "evaluaciones": prob.n_eval,
+    }
+
+
+def optimizar_multistart(base, V, T_lim=180.0, n_inicios=8, semilla=0, workers=None,
+                         variables=VARIABLES, **kwargs):
+    """Lanza optimizar() desde n_inicios puntos (hipercubo latino) en paralelo.
+
+    Devuelve la lista de resultados ordenada: factibles primero, luego por objetivo.
+    """
+    from scipy.stats import qmc  # scipy.stats es pesado: sólo se importa al muestrear
+    inicios = qmc.LatinHypercube(d=len(variables), seed=semilla).random(n_inicios)
+    pool = obtener_pool(workers)
+    futuros = [pool.submit(optimizar, base, V, T_lim, x0, variables, **kwargs)
+               for x0 in inicios]
+    resultados = [f.result() for f in futuros]
+    return sorted(resultados, key=lambda r: (not r["factible"], -r["objetivo"]))
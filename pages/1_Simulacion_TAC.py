@@ -1,9 +1,15 @@
+import time
 import streamlit as st
 import numpy as np
-from scipy.integrate import solve_ivp
 import plotly.graph_objects as go
 import pandas as pd
-from modelo import *
+from modelo import (Reactor, PARAMETROS, TASA_ESTACIONARIA, simular_sensibilidades,
+                    sensibilidad_conversion)
+from interfaz import barra_lateral, precarga, cargar_emulador
+from cache_simulacion import simular, cache
+from optimizacion import optimizar_multistart, VARIABLES
+from diagnostico import iniciar_captura, carrera, METODOS
+from graficos import serie, carga
 
 st.set_page_config(
     page_title="TAC",
@@ -16,48 +22,123 @@ df = pd.DataFrame()
 
 st.title("Simulador de Arranque - Reactor TAC")
 
-st.sidebar.header("Parámetros de simulación")
-Fa0 = st.sidebar.number_input("Flujo A (lb-mol/h)", 1.0, 200.0, 80.0)
-Fb0 = st.sidebar.number_input("Flujo B (lb-mol/h)", 1.0, 2000.0, 1000.0)
-Fm0 = st.sidebar.number_input("Flujo Inerte (lb-mol/h)", 0.0, 500.0, 100.0)
-T0 = st.sidebar.slider("Temperatura inicial (°F)", 30, 130, 75)
-Ta1 = st.sidebar.slider("Temperatura del refrigerante (°F)", 20, 200, 60)
-UA = st.sidebar.number_input("UA (BTU/h·°F)", 1000.0, 50000.0, 16000.0)
-mc = st.sidebar.number_input("Flujo másico refrigerante (lb-mol/h)", 100.0, 5000.0, 1000.0)
+# registros de todas las integraciones de esta ejecución de la página
+t_pagina = time.perf_counter()
+integraciones = iniciar_captura()
+tiempos_precarga = precarga()
+
+Fa0, Fb0, Fm0, T0, Ta1, UA, mc = barra_lateral()
+T_lim = st.sidebar.number_input("Límite de temperatura (°F)", 50.0, 400.0, 180.0)
+modo_progresivo = st.sidebar.checkbox("Horizonte adaptativo (hasta estado estacionario)")
+if modo_progresivo:
+    t_max = st.sidebar.number_input("Horizonte máximo (h)", 1.0, 200.0, 24.0)
+mostrar_diagnostico = st.sidebar.checkbox("Mostrar diagnóstico del integrador")
+vista_previa = st.sidebar.checkbox("Vista previa con el emulador")
 V = (1/7.484)*500   
+t_span = (0, 4)
+
+if vista_previa:
+    from emulador import TOLERANCIAS
+    # dentro de tolerancia responde el emulador sin integrar; fuera, el integrador
+    emulador = cargar_emulador()
+    if emulador is None:
+        st.sidebar.info("No hay emulador entrenado (se entrena desde el barrido de la página 2).")
+    else:
+        F, err = emulador.predecir([Fa0, Fb0, Fm0, T0, Ta1, UA, mc])
+        # sólo vale para el volumen y el horizonte con que se entrenó
+        if emulador.V == V and tuple(emulador.t_span) == t_span \
+                and (err[0] <= TOLERANCIAS).all():
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Conversión (emulador)", f"{F[0, 0]:.3f} ± {err[0, 0]:.3f}")
+            col2.metric("T final (emulador)", f"{F[0, 1]:.1f} ± {err[0, 1]:.1f} °F")
+            col3.metric("T pico (emulador)", f"{F[0, 2]:.1f} ± {err[0, 2]:.1f} °F")
+            # respuesta instantánea: la integración y las pestañas quedan a pedido
+            if not st.checkbox("Integrar la trayectoria completa", key="integrar_vista_previa"):
+                st.caption("Valores del emulador dentro de la tolerancia. Las trayectorias, "
+                           "gráficas y demás pestañas se calculan al marcar la casilla.")
+                st.stop()
+        else:
+            st.caption("El error estimado del emulador supera la tolerancia en este punto: "
+                       "se usan sólo los resultados del integrador.")
 
 y0 = [0.0, 3.45, 0.0, 0.0, T0]
-t_span = (0, 4)
 t_eval = np.linspace(0, 4, 300)
 
-sol = solve_ivp(cstr_odes, t_span, y0,
-                args=(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0),
-                t_eval=t_eval, method="BDF")
+if modo_progresivo:
+    from simulacion_progresiva import simular_progresivo
+    # se integra por tramos hasta el estado estacionario (o t_max), mostrando el avance
+    avance = st.empty()
+    tramos_t, tramos_y = [], []
+    for t_tramo, y_tramo, t_est in simular_progresivo(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0,
+                                                      y0=y0, t_max=t_max):
+        tramos_t.append(t_tramo)
+        tramos_y.append(y_tramo)
+        fig_avance = go.Figure(serie(np.concatenate(tramos_t),
+                                     np.concatenate([y_[4] for y_ in tramos_y]),
+                                     mode="lines", name="T", line=dict(color="red")))
+        fig_avance.update_layout(title="Arranque en curso", xaxis_title="Tiempo (h)",
+                                 yaxis_title="Temperatura (°F)")
+        avance.plotly_chart(fig_avance, use_container_width=True)
+    avance.empty()
+    t, y = np.concatenate(tramos_t), np.hstack(tramos_y)
+else:
+    # la integración se detiene al alcanzar el estado estacionario
+    t, y, t_est = simular(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval, y0=y0,
+                          tasa_estacionaria=TASA_ESTACIONARIA)
+Ca, Cb, Cc, Cm, T = y
+
+reactor = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+X_final = reactor.conversion(Ca[-1])
 
-t = sol.t
-Ca, Cb, Cc, Cm, T = sol.y
+if t_est is None:
+    t_est = "No alcanzado en el rango simulado"
 
-v0 = Fa0/0.923 + Fb0/3.45 + Fm0/1.54
-X_final = (Fa0 - Ca[-1] * v0) / Fa0
 
-epsilon = 0.001 
-t_est = None
 
-for i in range(1, len(t)):
-    crit_Ca = abs(Ca[i] - Ca[i-1]) / max(abs(Ca[i]), 1e-8)
-    crit_T = abs(T[i] - T[i-1]) / max(abs(T[i]), 1e-8)
-    
-    if crit_Ca < epsilon and crit_T < epsilon:
-        t_est = t[i]
-        break
 
-if t_est is None:
-    t_est = "No alcanzado en el rango simulado"
+# las figuras se reutilizan mientras no cambie la trayectoria: un cambio en otra
+# pestaña no las vuelve a armar y el navegador recibe exactamente el mismo JSON
+@st.cache_resource(max_entries=32, show_spinner=False)
+def figuras_arranque(t, y, t_est, T_lim):
+    t_ini = time.perf_counter()
+    Ca, T = y[0], y[4]
+    fig1 = go.Figure()
+    fig1.add_trace(serie(t, Ca, mode="lines", name="Ca"))
+    fig1.update_layout(title="Concentraciones vs Tiempo",
+                       xaxis_title="Tiempo (h)", yaxis_title="Concentración (lb-mol/L)")
 
+    if isinstance(t_est, (float, int)):
+        fig1.add_vline(x=t_est, line=dict(color="blue", dash="dot"),
+                       annotation_text=f"Estabilización {t_est:.2f} h",
+                       annotation_position="top right")
+
+    fig2 = go.Figure()
+    fig2.add_trace(serie(t, T, mode="lines", name="T", line=dict(color="red")))
+    fig2.add_hline(y=T_lim, line=dict(color="red", dash="dash"),
+                   annotation_text=f"Límite {T_lim:g} °K", annotation_position="top left")
+    fig2.update_layout(title="Temperatura vs Tiempo",
+                       xaxis_title="Tiempo (h)", yaxis_title="Temperatura (°F)")
+
+    if isinstance(t_est, (float, int)):
+        fig2.add_vline(x=t_est, line=dict(color="blue", dash="dot"),
+                       annotation_text=f"Estabilización {t_est:.2f} h",
+                       annotation_position="top right")
+
+    fig3 = go.Figure()
+    fig3.add_trace(serie(T, Ca, mode="lines", name="Ca(T)", line=dict(color="green")))
+    fig3.add_vline(x=T_lim, line=dict(color="red", dash="dash"),
+                   annotation_text=f"Límite {T_lim:g} °K", annotation_position="top left")
+    fig3.update_layout(title="Concentración vs Temperatura",
+                       xaxis_title="Temperatura (°K)", yaxis_title="Ca (lb-mol/pie3)")
+    armado_figuras["ms"] = (time.perf_counter() - t_ini) * 1e3
+    return fig1, fig2, fig3
 
 
+armado_figuras = {"ms": 0.0}   # queda en 0 si las figuras salieron de la caché
 
-tab1, tab2, tab3, tab4 = st.tabs(["Funcionamiento","Resultados Numéricos", "Gráficas", "Configuración"])
+pestanas = st.tabs(["Funcionamiento","Resultados Numéricos", "Gráficas", "Configuración", "Sensibilidades", "Optimización"]
+                   + (["Diagnóstico"] if mostrar_diagnostico else []))
+tab1, tab2, tab3, tab4, tab5, tab6 = pestanas[:6]
 with tab1:
     st.markdown(
     """
@@ -105,6 +186,8 @@ with tab1:
         - Temperatura vs. tiempo (con límite de seguridad).  
         - Diagrama de fase concentración-temperatura.  
     - **Resumen de parámetros** empleados en la simulación.  
+    - **Optimización**: busca automáticamente las condiciones de operación que maximizan la conversión o la producción de propilenglicol sin superar el límite de temperatura.  
+    - **Sensibilidades locales**: cómo cambian la conversión y la temperatura en cada instante ante un pequeño cambio de cada parámetro ($\partial X_A/\partial p$, $\partial T/\partial p$).  
 
     ---
     """
@@ -118,42 +201,17 @@ with tab2:
     st.write(f"**Cm final:** {Cm[-1]:.3f} lb-mol/pie3")
     st.write(f"**T final:** {T[-1]:.2f} °F")
     st.write(f"**Conversión final de A:** {X_final:.3f}")
-    st.write(f"**Tiempo de estabilización:** {t_est:.2f} horas")
+    if isinstance(t_est, (float, int)):
+        st.write(f"**Tiempo de estabilización:** {t_est:.2f} horas")
+    else:
+        st.write(f"**Tiempo de estabilización:** {t_est}")
 
 with tab3:
     st.subheader("Evolución temporal")
 
-    fig1 = go.Figure()
-    fig1.add_trace(go.Scatter(x=t, y=Ca, mode="lines", name="Ca"))
-    fig1.update_layout(title="Concentraciones vs Tiempo",
-                       xaxis_title="Tiempo (h)", yaxis_title="Concentración (lb-mol/L)")
-
-    if isinstance(t_est, (float, int)):
-        fig1.add_vline(x=t_est, line=dict(color="blue", dash="dot"),
-                       annotation_text=f"Estabilización {t_est:.2f} h",
-                       annotation_position="top right")
+    fig1, fig2, fig3 = figuras_arranque(t, y, t_est, T_lim)
     st.plotly_chart(fig1, use_container_width=True)
-
-    T_lim = 180 
-    fig2 = go.Figure()
-    fig2.add_trace(go.Scatter(x=t, y=T, mode="lines", name="T", line=dict(color="red")))
-    fig2.add_hline(y=T_lim, line=dict(color="red", dash="dash"), 
-               annotation_text=f"Límite {T_lim} °K", annotation_position="top left")
-    fig2.update_layout(title="Temperatura vs Tiempo",
-                       xaxis_title="Tiempo (h)", yaxis_title="Temperatura (°F)")
-
-    if isinstance(t_est, (float, int)):
-        fig2.add_vline(x=t_est, line=dict(color="blue", dash="dot"),
-                       annotation_text=f"Estabilización {t_est:.2f} h",
-                       annotation_position="top right")
     st.plotly_chart(fig2, use_container_width=True)
-
-    fig3 = go.Figure()
-    fig3.add_trace(go.Scatter(x=T, y=Ca, mode="lines", name="Ca(T)", line=dict(color="green")))
-    fig3.add_vline(x=T_lim, line=dict(color="red", dash="dash"), 
-               annotation_text=f"Límite {T_lim} °K", annotation_position="top left")
-    fig3.update_layout(title="Concentración vs Temperatura",
-                       xaxis_title="Temperatura (°K)", yaxis_title="Ca (lb-mol/pie3)")
     st.plotly_chart(fig3, use_container_width=True)
 
 
@@ -169,4 +227,135 @@ with tab4:
         "mc": mc,
         "V": V })
 
-
+    st.caption("Cache de simulaciones")
+    st.json(cache.stats)
+
+    st.caption("Precarga al iniciar el servidor (ms, una vez por proceso)")
+    st.json({k: round(v, 1) for k, v in tiempos_precarga.items()})
+
+
+# es la integración más cara de la página (5·(1 + p) ecuaciones con rtol=1e-6):
+# se hace sólo a pedido y una vez por combinación de entradas
+@st.cache_data(max_entries=32, show_spinner="Integrando sensibilidades...")
+def sensibilidades_cacheadas(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval, parametros):
+    return simular_sensibilidades(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval,
+                                  parametros=list(parametros))
+
+
+with tab5:
+    st.subheader("Sensibilidades locales de la trayectoria")
+    params_sens = st.multiselect("Parámetros", list(PARAMETROS), default=["UA", "Ta1", "mc"])
+    normalizar = st.checkbox("Normalizar (p/y · ∂y/∂p)", value=True)
+    calcular_sens = st.checkbox("Calcular sensibilidades", value=False,
+                                help="Las pestañas se ejecutan en cada cambio de la barra "
+                                     "lateral: activarlo sólo mientras se miran.")
+
+    if params_sens and calcular_sens:
+        t_s, y_s, S = sensibilidades_cacheadas(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0,
+                                               t_span, t_eval, tuple(params_sens))
+        X_s = reactor.conversion(y_s[0])
+        dX = sensibilidad_conversion(y_s[0], S[0], Fa0, Fb0, Fm0, params_sens)
+        dT = S[4]
+        valores = dict(zip(PARAMETROS, (Fa0, Fb0, Fm0, T0, Ta1, UA, mc)))
+
+        fig_sx = go.Figure()
+        fig_st = go.Figure()
+        for j, p in enumerate(params_sens):
+            if normalizar:
+                # sensibilidad relativa: % de cambio en la salida por % de cambio en p
+                sx = dX[j] * valores[p] / np.maximum(np.abs(X_s), 1e-8)
+                st_ = dT[j] * valores[p] / y_s[4]
+            else:
+                sx, st_ = dX[j], dT[j]
+            fig_sx.add_trace(serie(t_s, sx, mode="lines", name=p))
+            fig_st.add_trace(serie(t_s, st_, mode="lines", name=p))
+
+        fig_sx.update_layout(title="Sensibilidad de la conversión",
+                             xaxis_title="Tiempo (h)",
+                             yaxis_title="(p/X)·∂X/∂p" if normalizar else "∂X/∂p")
+        fig_st.update_layout(title="Sensibilidad de la temperatura",
+                             xaxis_title="Tiempo (h)",
+                             yaxis_title="(p/T)·∂T/∂p" if normalizar else "∂T/∂p (°F por unidad de p)")
+        st.plotly_chart(fig_sx, use_container_width=True)
+        st.plotly_chart(fig_st, use_container_width=True)
+
+
+with tab6:
+    st.subheader("Punto de operación óptimo")
+    st.write(f"Restricción: la temperatura máxima del arranque no debe superar **{T_lim:.0f} °F**.")
+
+    objetivo = st.radio("Objetivo", ["Conversión final de A", "Producción de C (lb-mol/h)"],
+                        horizontal=True)
+    vars_opt = st.multiselect("Variables a optimizar", list(VARIABLES), default=list(VARIABLES))
+    n_inicios = st.slider("Puntos de partida (en paralelo)", 1, 32, 4)
+
+    if st.button("Optimizar") and vars_opt:
+        with st.spinner("Optimizando..."):
+            resultados = optimizar_multistart(
+                [Fa0, Fb0, Fm0, T0, Ta1, UA, mc], V, T_lim, n_inicios=n_inicios,
+                variables=vars_opt,
+                objetivo="X" if objetivo.startswith("Conversión") else "produccion")
+        mejor = resultados[0]
+
+        if not mejor["factible"]:
+            st.error("No se encontró un punto que respete el límite de temperatura.")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Objetivo", f"{mejor['objetivo']:.3f}")
+        col2.metric("Conversión final", f"{mejor['X']:.3f}")
+        col3.metric("T pico (°F)", f"{mejor['T_pico']:.1f}")
+
+        st.write("**Condiciones de operación sugeridas:**")
+        st.json({p: round(float(v), 3) for p, v in mejor["parametros"].items()})
+
+        st.write("**Todos los puntos de partida:**")
+        st.dataframe(pd.DataFrame([{
+            "objetivo": r["objetivo"], "X": r["X"], "T_pico": r["T_pico"],
+            "factible": r["factible"], "evaluaciones": r["evaluaciones"],
+            **{v: r["parametros"][v] for v in vars_opt}
+        } for r in resultados]))
+
+
+if mostrar_diagnostico:
+    with pestanas[6]:
+        st.subheader("Integraciones de esta ejecución")
+        t_total = (time.perf_counter() - t_pagina) * 1e3
+        t_integracion = sum(r["tiempo_ms"] for r in integraciones)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Página (ms)", f"{t_total:.0f}")
+        col2.metric("Integración (ms)", f"{t_integracion:.0f}")
+        col3.metric("Resto: interfaz y gráficos (ms)", f"{t_total - t_integracion:.0f}")
+        if integraciones:
+            st.dataframe(pd.DataFrame(integraciones))
+        else:
+            st.info("La trayectoria salió de la caché: no se integró nada en esta ejecución.")
+
+        st.subheader("Figuras de la pestaña Gráficas")
+        st.write(f"Armado en esta ejecución: **{armado_figuras['ms']:.1f} ms** "
+                 "(0 si se reutilizaron las de una ejecución anterior).")
+        st.dataframe(pd.DataFrame([{
+            "figura": fig.layout.title.text,
+            "puntos": sum(len(tr.x) for tr in fig.data),
+            "puntos simulados": len(t),
+            "KB enviados": carga(fig) / 1024,
+        } for fig in figuras_arranque(t, y, t_est, T_lim)]))
+
+        st.subheader("Carrera de integradores")
+        st.write("Resuelve el arranque actual con cada método y recomienda el más rápido "
+                 "cuyo error frente a una integración de referencia (Radau, rtol=1e-10) "
+                 "no supera la tolerancia.")
+        col1, col2 = st.columns(2)
+        metodos_carrera = col1.multiselect("Métodos", list(METODOS), default=list(METODOS))
+        tolerancia = col2.number_input("Tolerancia (error relativo)", 1e-4, 0.5, 0.02,
+                                       format="%.4f")
+
+        if st.button("Comparar métodos") and metodos_carrera:
+            with st.spinner("Integrando..."):
+                filas, recomendado = carrera(
+                    lambda method, **tol: reactor.simulate(t_span, t_eval, y0=y0,
+                                                           method=method, **tol),
+                    metodos_carrera, tolerancia)
+            st.dataframe(pd.DataFrame(filas))
+            if recomendado is None:
+                st.warning("Ningún método cumple la tolerancia con rtol=1e-3.")
+            else:
+                st.success(f"Método recomendado: **{recomendado}**")
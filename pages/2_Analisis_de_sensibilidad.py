@@ -1,10 +1,15 @@
 import streamlit as st
 import numpy as np
-from scipy.integrate import solve_ivp
 import plotly.graph_objects as go
-import io
+import os
 import pandas as pd
-from modelo import *
+from modelo import Reactor, PARAMETROS, RANGOS, TASA_ESTACIONARIA
+from interfaz import barra_lateral, precarga, cargar_emulador
+from cache_simulacion import simular
+from mapas import interpolar, SALIDAS
+from almacen import AlmacenBarrido, FINALES, VARIABLES, excel_en_segundo_plano
+from graficos import serie
+from trabajos import enviar, obtener, cancelar, listar, valido
 
 st.set_page_config(
     page_title="TAC",
@@ -17,40 +22,25 @@ df = pd.DataFrame()
 
 st.title("Simulador de Arranque - Reactor TAC")
 
-st.sidebar.header("Parámetros de simulación")
-Fa0 = st.sidebar.number_input("Flujo A (lb-mol/h)", 1.0, 200.0, 80.0)
-Fb0 = st.sidebar.number_input("Flujo B (lb-mol/h)", 1.0, 2000.0, 1000.0)
-Fm0 = st.sidebar.number_input("Flujo Inerte (lb-mol/h)", 0.0, 500.0, 100.0)
-T0 = st.sidebar.slider("Temperatura inicial (°F)", 30, 130, 75)
-Ta1 = st.sidebar.slider("Temperatura del refrigerante (°F)", 20, 200, 60)
-UA = st.sidebar.number_input("UA (BTU/h·°F)", 1000.0, 50000.0, 16000.0)
-mc = st.sidebar.number_input("Flujo másico refrigerante (lb-mol/h)", 100.0, 5000.0, 1000.0)
+precarga()
+Fa0, Fb0, Fm0, T0, Ta1, UA, mc = barra_lateral()
 V = (1/7.484)*500   
 
 y0 = [0.0, 3.45, 0.0, 0.0, T0]
 t_span = (0, 4)
 t_eval = np.linspace(0, 4, 300)
+BLOQUE_LOTE = 256   # puntos por sistema en el motor vectorizado
+MOTORES = {"Lote vectorizado": "lote", "Procesos en paralelo": "paralelo",
+           "Estado estacionario (solo valores finales)": "estacionario",
+           "Emulador (respaldo con el integrador)": "emulador"}
 
-sol = solve_ivp(cstr_odes, t_span, y0,
-                args=(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0),
-                t_eval=t_eval, method="BDF")
+# la integración se detiene al alcanzar el estado estacionario
+t, y, t_est = simular(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_span, t_eval, y0=y0,
+                      tasa_estacionaria=TASA_ESTACIONARIA)
+Ca, Cb, Cc, Cm, T = y
 
-t = sol.t
-Ca, Cb, Cc, Cm, T = sol.y
-
-v0 = Fa0/0.923 + Fb0/3.45 + Fm0/1.54
-X_final = (Fa0 - Ca[-1] * v0) / Fa0
-
-epsilon = 0.001 
-t_est = None
-
-for i in range(1, len(t)):
-    crit_Ca = abs(Ca[i] - Ca[i-1]) / max(abs(Ca[i]), 1e-8)
-    crit_T = abs(T[i] - T[i-1]) / max(abs(T[i]), 1e-8)
-    
-    if crit_Ca < epsilon and crit_T < epsilon:
-        t_est = t[i]
-        break
+reactor = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+X_final = reactor.conversion(Ca[-1])
 
 if t_est is None:
     t_est = "No alcanzado en el rango simulado"
@@ -58,7 +48,8 @@ if t_est is None:
 
 
 
-tab1, tab2 = st.tabs(["Funcionamiento","Barrido de parametros"])
+tab1, tab2, tab3, tab4 = st.tabs(["Funcionamiento","Barrido de parametros", "Diagrama de bifurcación",
+                                  "Mapas 2-D/3-D"])
 
 with tab1:
     st.markdown(
@@ -77,10 +68,25 @@ with tab1:
     - Gráficos que relacionan el parámetro barrido con las variables de salida (concentraciones, temperatura, conversión).  
     - Posibilidad de graficar dos variables a la vez.  
     - Los resultados se pueden exportar en **CSV o Excel** para análisis externo.
+    - Con el motor **Estado estacionario** no se integra el arranque: se calculan directamente todos los estados estacionarios de cada punto y su estabilidad, lo que permite detectar **multiplicidad** de estados.
+    - El barrido corre **en segundo plano**: se puede seguir usando la página, cancelarlo o volver más tarde (el id del trabajo queda en la dirección de la página). Si otra persona ya pidió el mismo barrido, se reutiliza su resultado.
+    - Con el motor **Emulador** los valores finales (conversión, T final y T pico) salen de un modelo sustituto entrenado con simulaciones alrededor de los parámetros actuales: la respuesta es instantánea y cada punto trae su **error estimado**. Los puntos cuyo error supera el máximo elegido se simulan con el integrador.
+
+    ### 2. Diagrama de bifurcación
+    En la pestaña **"Diagrama de bifurcación"** se sigue de forma continua la curva de estados estacionarios (curva en S) al variar un parámetro.  
+    - Los tramos **estables** se dibujan con línea continua y los **inestables** con línea punteada.  
+    - Se marcan los **puntos límite** (ignición/extinción) y los **puntos de Hopf** (aparición de oscilaciones), con el valor exacto del parámetro.
+
+    ### Mapas 2-D/3-D
+    En la pestaña **"Mapas 2-D/3-D"** se varían dos o tres parámetros a la vez (por ejemplo Ta1 × UA).  
+    - Se muestran mapas de **conversión** y **temperatura pico**, con la **frontera de runaway** (T_pico = T_lim) marcada.  
+    - La grilla es **adaptativa**: se refina sólo donde las salidas cambian bruscamente o cerca de la frontera.  
+    - Los puntos ya simulados se guardan, así que al acercarse a una zona se reutilizan.  
+    - El mapa se calcula en segundo plano, con su avance y la opción de cancelarlo.
 
     ---
 
-    ### 2. Objetivo del análisis de sensibilidad
+    ### 3. Objetivo del análisis de sensibilidad
     El análisis de sensibilidad busca:
     - Identificar qué parámetros de operación afectan más el desempeño del reactor.  
     - Explorar condiciones que conduzcan a una operación estable y segura.  
@@ -89,7 +95,7 @@ with tab1:
 
     ---
 
-    ### 3. Objetivos del análisis de sensibilidad
+    ### 4. Objetivos del análisis de sensibilidad
     - Identificar **qué parámetros afectan más** la operación del reactor.
     - Evaluar el impacto de variaciones en las condiciones de alimentación o enfriamiento.
     - Estudiar escenarios que conduzcan a **mayor conversión** o **estabilidad térmica**.
@@ -100,6 +106,33 @@ with tab1:
 )
     
 
+# Los barridos corren como trabajos en segundo plano (trabajos.py): la página
+# sólo consulta el avance, así que tocar un widget no corta la simulación.
+@st.fragment(run_every=1.0)
+def seguimiento(id, vars_to_plot=()):
+    """Avance de un trabajo en curso; cuando termina se vuelve a ejecutar la página"""
+    trabajo = obtener(id)
+    if trabajo is None or not trabajo.activo:
+        st.rerun()
+    st.progress(trabajo.progreso, text=f"Trabajo {id}: {trabajo.estado} ({trabajo.progreso:.0%})")
+    if st.button("Cancelar", key=f"cancelar_{id}"):
+        cancelar(id)
+
+    # resultados parciales de los barridos que guardan trayectorias
+    parcial = trabajo.resultado() if trabajo.tipo == "barrido" else None
+    if isinstance(parcial, AlmacenBarrido) and parcial.hecho.any():
+        param = trabajo.spec["param"]
+        hechos = np.flatnonzero(parcial.hecho)
+        df_parcial = pd.DataFrame(parcial.finales(hechos), columns=FINALES)
+        df_parcial.insert(0, param, parcial.P[hechos, PARAMETROS.index(param)])
+        st.dataframe(df_parcial)
+        if len(vars_to_plot) > 0 and vars_to_plot[0] in df_parcial:
+            fig_parcial = go.Figure(serie(df_parcial[param], df_parcial[vars_to_plot[0]],
+                                          mode="markers", name=vars_to_plot[0]))
+            fig_parcial.update_layout(title=f"Barrido de {param} (en curso)", xaxis_title=param)
+            st.plotly_chart(fig_parcial, use_container_width=True)
+
+
 with tab2:
     st.subheader("Análisis de sensibilidad por barrido de un parámetro")
 
@@ -110,9 +143,59 @@ with tab2:
     )
     start_val = st.number_input("Valor inicial", value=50.0)
     end_val = st.number_input("Valor final", value=150.0)
-    n_points = st.slider("Cantidad de puntos", 2, 20, 5)
-
-    variables_disp = ["Ca_final", "Cb_final", "Cc_final", "Cm_final", "T_final", "X_final"]
+    n_points = st.slider("Cantidad de puntos", 2, 1000, 5)
+
+    motor = st.radio("Motor de cálculo",
+                     ["Lote vectorizado", "Procesos en paralelo",
+                      "Estado estacionario (solo valores finales)",
+                      "Emulador (respaldo con el integrador)"],
+                     horizontal=True)
+    if motor == "Procesos en paralelo":
+        chunk = st.number_input("Puntos por bloque", 1, 200, 8)
+    if motor == "Emulador (respaldo con el integrador)":
+        from emulador import ventana, TOLERANCIAS, RUTA, MAX_ENTRENAMIENTO
+        # sólo valores finales; los puntos con error estimado alto se simulan
+        emulador = cargar_emulador()
+        if emulador is None:
+            st.info("Todavía no hay un emulador entrenado.")
+        else:
+            lo, hi = emulador.limites.T
+            st.caption("Emulador entrenado en: " + ", ".join(
+                f"{p} ∈ [{a:.4g}, {b:.4g}]" for p, a, b in zip(PARAMETROS, lo, hi)))
+            if emulador.validacion:
+                st.caption("Error en validación (RMSE): " + ", ".join(
+                    f"{nombre} {e:.3g}" for nombre, e in zip(("X", "T_final", "T_pico"),
+                                                   emulador.validacion["rmse"])))
+        col1, col2, col3 = st.columns(3)
+        tolerancias = (col1.number_input("Error máx. X", 1e-4, 1.0, TOLERANCIAS[0], format="%.4f"),
+                       col2.number_input("Error máx. T final (°F)", 0.01, 100.0, TOLERANCIAS[1]),
+                       col3.number_input("Error máx. T pico (°F)", 0.01, 100.0, TOLERANCIAS[2]))
+
+        with st.expander("Entrenar emulador alrededor de los parámetros actuales"):
+            fraccion = st.slider("Ancho de la ventana (± fracción de cada rango)", 0.02, 0.5, 0.1)
+            n_entrenamiento = st.number_input("Simulaciones de entrenamiento", 100,
+                                              MAX_ENTRENAMIENTO, 1000)
+            if st.button("Entrenar"):
+                limites = ventana([Fa0, Fb0, Fm0, T0, Ta1, UA, mc], fraccion)
+                st.session_state["entrenamiento"] = enviar("emulador", {
+                    "V": V, "n": int(n_entrenamiento), "t_span": list(t_span),
+                    "limites": limites.tolist()}).id
+
+            entrenamiento = st.session_state.get("entrenamiento")
+            trabajo = obtener(entrenamiento) if entrenamiento else None
+            if trabajo is not None and trabajo.activo:
+                seguimiento(trabajo.id)
+            elif trabajo is not None:
+                # el emulador nuevo ya está en disco: se descarta el cargado
+                st.session_state.pop("entrenamiento")
+                cargar_emulador.clear()
+                if trabajo.estado == "terminado":
+                    st.rerun()
+                st.warning(f"El entrenamiento terminó como **{trabajo.estado}**"
+                           + (f": {trabajo.error}" if trabajo.error else "."))
+
+    variables_disp = ["Ca_final", "Cb_final", "Cc_final", "Cm_final", "T_final", "X_final",
+                      "T_pico"]
     vars_to_plot = st.multiselect(
         "Selecciona variables a graficar",
         variables_disp,
@@ -120,76 +203,117 @@ with tab2:
     )
 
     if st.button("Ejecutar barrido"):
-        results = []
-
-        values = np.linspace(start_val, end_val, n_points)
-        for val in values:
-            # Copia de parámetros
-            Fa, Fb, Fm, T0, UA_, Ta, mc_ = Fa0, Fb0, Fm0, T0, UA, Ta1, mc
-            if param_to_vary == "Fa0": Fa = val
-            elif param_to_vary == "Fb0": Fb = val
-            elif param_to_vary == "Fm0": Fm = val
-            elif param_to_vary == "T0": T0 = val
-            elif param_to_vary == "UA": UA_ = val
-            elif param_to_vary == "Ta1": Ta = val
-            elif param_to_vary == "mc": mc_ = val
-
-            # Simulación
-            sol = solve_ivp(cstr_odes, t_span, y0,
-                            args=(Fa, Fb, Fm, V, UA_, Ta, mc_, T0),
-                            t_eval=t_eval, method="BDF")
-
-            Ca, Cb, Cc, Cm, T = sol.y
-            v0 = Fa/0.923 + Fb/3.45 + Fm/1.54
-            X_final = (Fa - Ca[-1] * v0) / Fa
-
-            results.append({
-                param_to_vary: val,
-                "Ca_final": Ca[-1],
-                "Cb_final": Cb[-1],
-                "Cc_final": Cc[-1],
-                "Cm_final": Cm[-1],
-                "T_final": T[-1],
-                "X_final": X_final
-            })
-
-        df = pd.DataFrame(results)
+        # mismo pedido -> mismo trabajo (de esta sesión o de otra); se guarda el id
+        # también en la URL para poder volver a los resultados
+        motor_id = MOTORES[motor]
+        spec = {
+            "motor": motor_id, "param": param_to_vary,
+            "inicio": start_val, "fin": end_val, "n": n_points,
+            "base": [float(v) for v in (Fa0, Fb0, Fm0, T0, Ta1, UA, mc)],
+            "V": V, "t_span": list(t_span), "n_t": len(t_eval), "y0": [float(v) for v in y0],
+            "chunk": BLOQUE_LOTE if motor_id == "lote" else
+                     int(chunk) if motor_id == "paralelo" else None,
+            "tolerancias": list(tolerancias) if motor_id == "emulador" else None,
+            # un emulador reentrenado invalida los barridos hechos con el anterior
+            "emulador": os.path.getmtime(RUTA) if motor_id == "emulador"
+                        and os.path.exists(RUTA) else None,
+        }
+        st.session_state["barrido"] = {"trabajo": enviar("barrido", spec).id}
+        st.query_params["trabajo"] = st.session_state["barrido"]["trabajo"]
+
+    with st.expander("Barridos recientes (de todas las sesiones)"):
+        recientes = [t for t in listar() if t.tipo == "barrido"]
+        if recientes:
+            st.dataframe(pd.DataFrame([{
+                "id": t.id, "estado": t.estado, "avance": f"{t.progreso:.0%}",
+                "motor": t.spec["motor"], "parámetro": t.spec["param"],
+                "rango": f"{t.spec['inicio']:g} a {t.spec['fin']:g} ({t.spec['n']} puntos)",
+                "creado": pd.Timestamp(t.creado, unit="s").strftime("%Y-%m-%d %H:%M:%S"),
+            } for t in recientes]))
+        id_elegido = st.text_input("Id de un trabajo")
+        if st.button("Abrir") and id_elegido:
+            if valido(id_elegido.strip()):
+                st.session_state["barrido"] = {"trabajo": id_elegido.strip()}
+                st.query_params["trabajo"] = id_elegido.strip()
+            else:
+                st.error("El id de un trabajo son 16 caracteres hexadecimales.")
+
+    # al abrir la página con ?trabajo=<id> se recupera ese barrido
+    if "barrido" not in st.session_state and valido(st.query_params.get("trabajo")):
+        st.session_state["barrido"] = {"trabajo": st.query_params["trabajo"]}
+
+    # Los resultados se leen del directorio del trabajo en cada rerun
+    barrido = st.session_state.get("barrido")
+    trabajo = obtener(barrido["trabajo"]) if barrido is not None else None
+    if barrido is not None and trabajo is None:
+        st.warning(f"No se encontró el trabajo {barrido['trabajo']}: puede haberse borrado.")
+        st.session_state.pop("barrido")
+    elif trabajo is not None and trabajo.activo:
+        seguimiento(trabajo.id, vars_to_plot)
+    elif trabajo is not None and trabajo.estado != "terminado":
+        st.warning(f"El barrido {trabajo.id} terminó como **{trabajo.estado}**"
+                   + (f": {trabajo.error}" if trabajo.error else "."))
+        if st.button("Volver a ejecutar"):
+            enviar(trabajo.tipo, trabajo.spec)
+            st.rerun()
+
+    if trabajo is not None and trabajo.estado == "terminado":
+        param = trabajo.spec["param"]
+        resultado = trabajo.resultado()
+        almacen = None
+        if isinstance(resultado, AlmacenBarrido):
+            almacen = resultado
+            df = pd.DataFrame(almacen.finales(), columns=FINALES)
+            df.insert(0, param, almacen.P[:, PARAMETROS.index(param)])
+        else:
+            df = pd.DataFrame(resultado)
+            if "fuente" in df:
+                st.caption(f"{(df['fuente'] == 'integrador').sum()} de {len(df)} puntos "
+                           "se simularon por superar el error máximo del emulador.")
+            if "n_estados" in df and (df["n_estados"] > 1).any():
+                st.warning("Hay puntos con múltiples estados estacionarios: "
+                           "riesgo de ignición/runaway según el arranque.")
+
         st.dataframe(df)
+        # cada motor produce sólo algunas de las columnas
+        vars_to_plot = [v for v in vars_to_plot if v in df]
 
         fig1 = go.Figure()
+        # con varios estados por punto no tiene sentido unir con líneas
+        modo = "markers" if "n_estados" in df and (df["n_estados"] > 1).any() else "lines+markers"
 
         if len(vars_to_plot) > 0:
-            fig1.add_trace(go.Scatter(
-                x=df[param_to_vary],
-                y=df[vars_to_plot[0]],
-                mode="lines+markers",
+            fig1.add_trace(serie(
+                df[param],
+                df[vars_to_plot[0]],
+                mode=modo,
                 name=vars_to_plot[0],
                 yaxis="y1"
             ))
 
         if len(vars_to_plot) > 1:
-            fig1.add_trace(go.Scatter(
-                x=df[param_to_vary],
-                y=df[vars_to_plot[1]],
-                mode="lines+markers",
+            fig1.add_trace(serie(
+                df[param],
+                df[vars_to_plot[1]],
+                mode=modo,
                 name=vars_to_plot[1],
                 yaxis="y2"
             ))
 
         if len(vars_to_plot) > 2:
             for var in vars_to_plot[2:]:
-                fig1.add_trace(go.Scatter(
-                    x=df[param_to_vary],
-                    y=df[var],
-                    mode="lines+markers",
+                fig1.add_trace(serie(
+                    df[param],
+                    df[var],
+                    mode=modo,
                     name=var,
                     yaxis="y1"
                 ))
 
         # Configuración de los ejes
         fig1.update_layout(
-            title=f"Barrido de {param_to_vary}",
-            xaxis_title=param_to_vary,
+            title=f"Barrido de {param}",
+            xaxis_title=param,
             yaxis=dict(
                 title=vars_to_plot[0] if len(vars_to_plot) > 0 else "Valor",
                 side="left"
@@ -204,27 +328,210 @@ with tab2:
 
         st.plotly_chart(fig1, use_container_width=True)
 
-        
-
-        # Exportación
-        csv = df.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            label="📥 Descargar resultados en CSV",
-            data=csv,
-            file_name=f"barrido_{param_to_vary}.csv",
-            mime="text/csv",
-            key="barrido_csv"
-        )
-
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Barrido")
+        if almacen is not None:
+            # sólo se lee del disco la trayectoria elegida
+            st.markdown("#### Trayectoria de un punto del barrido")
+            i = st.slider("Punto", 0, len(almacen) - 1, 0, key="barrido_punto")
+            variable = st.selectbox("Variable", VARIABLES, index=4, key="barrido_variable")
+            fig_tray = go.Figure(serie(
+                almacen.t, almacen.trayectoria(i)[VARIABLES.index(variable)],
+                mode="lines", name=variable))
+            fig_tray.update_layout(title=f"{param} = {almacen.P[i, PARAMETROS.index(param)]:.4g}",
+                                   xaxis_title="Tiempo (h)", yaxis_title=variable)
+            st.plotly_chart(fig_tray, use_container_width=True)
+
+        # Exportación: los archivos se escriben por bloques en el directorio del barrido
+        if almacen is not None:
+            with open(almacen.exportar_csv(), "rb") as f:
+                st.download_button(
+                    label="📥 Descargar resultados en CSV",
+                    data=f,
+                    file_name=f"barrido_{param}.csv",
+                    mime="text/csv",
+                    key="barrido_csv"
+                )
+
+            ruta_tray = os.path.join(almacen.directorio, "trayectorias.csv")
+            if os.path.exists(ruta_tray):
+                with open(ruta_tray, "rb") as f:
+                    st.download_button(
+                        label="📥 Descargar trayectorias completas en CSV",
+                        data=f,
+                        file_name=f"barrido_{param}_trayectorias.csv",
+                        mime="text/csv",
+                        key="barrido_tray_csv"
+                    )
+            elif st.button("Preparar CSV de trayectorias completas"):
+                almacen.exportar_csv(trayectorias=True)
+                st.rerun()
+        else:
+            st.download_button(
+                label="📥 Descargar resultados en CSV",
+                data=df.to_csv(index=False).encode("utf-8"),
+                file_name=f"barrido_{param}.csv",
+                mime="text/csv",
+                key="barrido_csv"
+            )
+
+        # El Excel es opcional y se arma en un hilo aparte sin frenar la página
+        if st.checkbox("Generar también Excel (en segundo plano)", key="barrido_excel_on"):
+            clave = trabajo.id
+            excel = st.session_state.get("barrido_excel")
+            if excel is None or excel[0] != clave:
+                ruta = os.path.join(trabajo.directorio, "resumen.xlsx")
+                if almacen is not None:
+                    filas = almacen.filas_resumen()
+                    encabezado = [*PARAMETROS, *FINALES]
+                else:
+                    filas = df.itertuples(index=False)
+                    encabezado = list(df.columns)
+                excel = (clave, excel_en_segundo_plano(ruta, encabezado, filas))
+                st.session_state["barrido_excel"] = excel
+
+            futuro = excel[1]
+            if futuro.done() and futuro.exception() is not None:
+                st.error(f"No se pudo generar el Excel: {futuro.exception()}")
+            elif futuro.done():
+                with open(futuro.result(), "rb") as f:
+                    st.download_button(
+                        label="📊 Descargar resultados en Excel",
+                        data=f,
+                        file_name=f"barrido_{param}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        key="barrido_excel"
+                    )
+            else:
+                st.info("Generando el Excel…")
+                st.button("Actualizar", key="barrido_excel_actualizar")
+
+
+with tab3:
+    st.subheader("Curva de estados estacionarios por continuación")
+
+    param_cont = st.selectbox("Parámetro de continuación", list(PARAMETROS), index=4)
+    col1, col2 = st.columns(2)
+    # el rango por defecto es el de la barra lateral para ese parámetro
+    lo, hi = RANGOS[PARAMETROS.index(param_cont)]
+    p_ini = col1.number_input("Desde", value=float(lo), key=f"cont_desde_{param_cont}")
+    p_fin = col2.number_input("Hasta", value=float(hi), key=f"cont_hasta_{param_cont}")
+
+    if st.button("Trazar diagrama"):
+        from continuacion import continuar
+        res = continuar(param_cont, min(p_ini, p_fin), max(p_ini, p_fin),
+                        [Fa0, Fb0, Fm0, T0, Ta1, UA, mc], V)
+
+        fig_bif = go.Figure()
+        for rama in res["ramas"]:
+            p, T, est = rama["p"], rama["y"][:, 4], rama["estable"]
+            # un trazo por cada tramo de igual estabilidad
+            cortes = np.flatnonzero(est[1:] != est[:-1]) + 1
+            for a, b in zip(np.r_[0, cortes], np.r_[cortes, len(p)]):
+                estable = est[a]
+                b = min(b + 1, len(p))
+                fig_bif.add_trace(go.Scatter(
+                    x=p[a:b], y=T[a:b], mode="lines",
+                    line=dict(color="blue" if estable else "red",
+                              dash="solid" if estable else "dot"),
+                    name="Estable" if estable else "Inestable",
+                    legendgroup="estable" if estable else "inestable",
+                    showlegend=False
+                ))
 
-        st.download_button(
-            label="📊 Descargar resultados en Excel",
-            data=output.getvalue(),
-            file_name=f"barrido_{param_to_vary}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            key="barrido_excel"
-        )
+        for tipo, nombre, simbolo in (("LP", "Punto límite", "square"), ("H", "Hopf", "star")):
+            pts = [e for e in res["especiales"] if e["tipo"] == tipo]
+            if pts:
+                fig_bif.add_trace(go.Scatter(
+                    x=[e["p"] for e in pts], y=[e["y"][4] for e in pts],
+                    mode="markers", marker=dict(symbol=simbolo, size=10, color="black"),
+                    name=nombre
+                ))
 
+        fig_bif.update_layout(title=f"Estados estacionarios vs {param_cont}",
+                              xaxis_title=param_cont, yaxis_title="T estacionaria (°F)")
+        st.plotly_chart(fig_bif, use_container_width=True)
+        st.caption("Línea continua azul: estable · Línea punteada roja: inestable")
+
+        if res["especiales"]:
+            st.dataframe(pd.DataFrame([{
+                "Tipo": e["tipo"],
+                param_cont: e["p"],
+                "Ca": e["y"][0],
+                "T": e["y"][4]
+            } for e in res["especiales"]]))
+        else:
+            st.info("No se detectaron puntos límite ni de Hopf en el rango.")
+
+
+
+with tab4:
+    st.subheader("Mapas de dos o tres parámetros")
+
+    ejes = st.multiselect("Parámetros (2 o 3)", list(PARAMETROS), default=["Ta1", "UA"],
+                          max_selections=3)
+    ventanas = []
+    for p in ejes:
+        lo, hi = RANGOS[PARAMETROS.index(p)]
+        col1, col2 = st.columns(2)
+        ventanas.append((col1.number_input(f"{p} desde", lo, hi, lo, key=f"mapa_{p}_desde"),
+                         col2.number_input(f"{p} hasta", lo, hi, hi, key=f"mapa_{p}_hasta")))
+
+    col1, col2, col3 = st.columns(3)
+    T_lim_mapa = col1.number_input("T límite (°F)", 100.0, 400.0, 180.0, key="mapa_T_lim")
+    n_inicial = col2.slider("Puntos iniciales por eje", 3, 33, 9)
+    niveles = col3.slider("Niveles de refinamiento", 0, 6, 4)
+    tol = st.slider("Tolerancia de refinamiento", 0.01, 0.5, 0.05)
+
+    if len(ejes) >= 2 and st.button("Calcular mapa"):
+        # el refinamiento puede llevar minutos: corre como trabajo en segundo plano
+        st.session_state["mapa"] = {"trabajo": enviar("mapa", {
+            "ejes": list(ejes), "ventanas": [[float(a), float(b)] for a, b in ventanas],
+            "base": [float(v) for v in (Fa0, Fb0, Fm0, T0, Ta1, UA, mc)],
+            "V": V, "t_span": list(t_span), "n_inicial": n_inicial, "niveles": niveles,
+            "tol": tol, "T_lim": T_lim_mapa,
+        }).id}
+
+    pedido = st.session_state.get("mapa")
+    trabajo_mapa = obtener(pedido["trabajo"]) if pedido is not None else None
+    mapa = None
+    if trabajo_mapa is not None and trabajo_mapa.activo:
+        seguimiento(trabajo_mapa.id)
+    elif trabajo_mapa is not None and trabajo_mapa.estado != "terminado":
+        st.warning(f"El mapa {trabajo_mapa.id} terminó como **{trabajo_mapa.estado}**"
+                   + (f": {trabajo_mapa.error}" if trabajo_mapa.error else "."))
+    elif trabajo_mapa is not None:
+        # se lee una vez por sesión: interpolar() guarda la triangulación en el dict
+        if pedido.get("id") != trabajo_mapa.id:
+            datos = trabajo_mapa.resultado()
+            datos["puntos"] = np.asarray(datos["puntos"], dtype=float)
+            datos["salidas"] = np.asarray(datos["salidas"], dtype=float)
+            pedido.update(id=trabajo_mapa.id, datos=datos)
+        mapa = pedido["datos"]
+
+    if mapa is not None:
+        st.caption(f"{len(mapa['puntos'])} puntos: {mapa['nuevos']} simulados y "
+                   f"{mapa['reutilizados']} reutilizados de mapas anteriores")
+
+        salida = st.selectbox("Variable", SALIDAS, key="mapa_salida")
+        corte = None
+        if len(mapa["ejes"]) == 3:
+            z0, z1 = sorted(mapa["ventanas"][2])
+            corte = st.slider(f"Corte en {mapa['ejes'][2]}", float(z0), float(z1), float(z0))
+
+        x, y, Z = interpolar(mapa, corte=corte)
+        fig_mapa = go.Figure(go.Heatmap(x=x, y=y, z=Z[:, :, SALIDAS.index(salida)],
+                                        colorbar=dict(title=salida)))
+        fig_mapa.add_trace(go.Contour(
+            x=x, y=y, z=Z[:, :, SALIDAS.index("T_pico")],
+            contours=dict(coloring="none", start=mapa["T_lim"], end=mapa["T_lim"], size=1,
+                          showlabels=True),
+            line=dict(color="red", width=3), showscale=False,
+            name=f"Runaway (T_pico = {mapa['T_lim']:g} °F)", showlegend=True))
+        if len(mapa["ejes"]) == 2 and st.checkbox("Mostrar puntos simulados"):
+            # pueden ser decenas de miles: serie() pasa a WebGL
+            fig_mapa.add_trace(serie(mapa["puntos"][:, 0], mapa["puntos"][:, 1],
+                                     mode="markers", marker=dict(size=2, color="black"),
+                                     name="Puntos simulados"))
+        fig_mapa.update_layout(xaxis_title=mapa["ejes"][0], yaxis_title=mapa["ejes"][1],
+                               title=f"{salida} vs {mapa['ejes'][0]} y {mapa['ejes'][1]}",
+                               legend=dict(orientation="h", y=-0.2))
+        st.plotly_chart(fig_mapa, use_container_width=True)
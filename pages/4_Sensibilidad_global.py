@@ -0,0 +1,115 @@
+import streamlit as st
+import plotly.graph_objects as go
+import pandas as pd
+from modelo import PARAMETROS, RANGOS
+from sensibilidad_global import sobol, morris, SALIDAS
+from interfaz import barra_lateral
+
+st.set_page_config(
+    page_title="TAC",
+    page_icon="👋",
+)
+
+st.title("Análisis de sensibilidad global")
+
+V = (1/7.484)*500
+
+# el análisis es local al punto de operación elegido, igual que en las otras páginas
+base = barra_lateral()
+st.sidebar.header("Rango de los parámetros")
+variacion = st.sidebar.slider("Variación alrededor de los valores de simulación (±%)",
+                              1, 100, 20)
+fijos = st.sidebar.multiselect("Parámetros fijos", list(PARAMETROS), default=[])
+
+# rango de cada parámetro: ±variación, recortado a los límites de la barra lateral
+limites = []
+for nombre, valor, (lo, hi) in zip(PARAMETROS, base, RANGOS):
+    if nombre in fijos:
+        limites.append((valor, valor))
+    else:
+        limites.append((max(lo, valor*(1 - variacion/100)), min(hi, valor*(1 + variacion/100))))
+
+tab1, tab2 = st.tabs(["Funcionamiento", "Análisis global"])
+
+with tab1:
+    st.markdown(
+    """
+    ## Guía de uso del Análisis de sensibilidad global
+    A diferencia del barrido de un parámetro, aquí se varían **todos los parámetros a la vez** dentro de su rango, lo que permite ordenar su importancia e identificar **interacciones** (por ejemplo entre UA, Ta1 y mc).
+
+    ---
+
+    ### 1. Métodos disponibles
+    - **Sobol (diseño de Saltelli):** descompone la varianza de cada salida.  
+        - $S_1$: efecto de primer orden (el parámetro solo).  
+        - $S_T$: efecto total (incluye todas sus interacciones).  
+        - $S_T - S_1$ grande indica que el parámetro actúa principalmente a través de interacciones.  
+    - **Morris (efectos elementales):** cribado barato.  
+        - $\\mu^*$: importancia global del parámetro.  
+        - $\\sigma$: no linealidad o interacciones.  
+
+    ### 2. Salidas analizadas
+    - **X_final:** conversión final de A.  
+    - **T_final:** temperatura final.  
+    - **T_pico:** temperatura máxima durante el arranque.  
+
+    Los rangos se centran en los parámetros de simulación de la barra lateral. Los intervalos corresponden a un 95 % de confianza (bootstrap). Las simulaciones se reparten entre los núcleos del servidor y las estimaciones se actualizan a medida que avanzan.
+    """
+    )
+
+with tab2:
+    st.dataframe(pd.DataFrame(limites, index=PARAMETROS, columns=["Mínimo", "Máximo"]))
+
+    metodo = st.radio("Método", ["Sobol", "Morris"], horizontal=True)
+    salida = st.selectbox("Salida", list(SALIDAS))
+    j = SALIDAS.index(salida)
+    k = sum(hi > lo for lo, hi in limites)
+
+    if metodo == "Sobol":
+        n_base = st.select_slider("Muestras base", [64, 128, 256, 512, 1024, 2048, 4096], 256)
+        st.caption(f"Simulaciones necesarias: {n_base * (k + 2)}")
+    else:
+        r = st.slider("Trayectorias", 4, 200, 20)
+        st.caption(f"Simulaciones necesarias: {r * (k + 1)}")
+
+    if st.button("Ejecutar análisis") and k > 0:
+        progreso = st.progress(0.0)
+        tabla = st.empty()
+        grafico = st.empty()
+
+        if metodo == "Sobol":
+            pasos = sobol(limites, V, n_base=n_base)
+            total = n_base
+        else:
+            pasos = morris(limites, V, r=r)
+            total = r
+
+        for res in pasos:
+            progreso.progress(res["n"] / total)
+
+            if metodo == "Sobol":
+                df = pd.DataFrame({
+                    "S1": res["S1"][:, j], "S1 ±": res["S1_ic"][:, j],
+                    "ST": res["ST"][:, j], "ST ±": res["ST_ic"][:, j],
+                }, index=res["parametros"])
+                fig = go.Figure([
+                    go.Bar(x=df.index, y=df["S1"], name="S1",
+                           error_y=dict(type="data", array=df["S1 ±"])),
+                    go.Bar(x=df.index, y=df["ST"], name="ST",
+                           error_y=dict(type="data", array=df["ST ±"])),
+                ])
+                fig.update_layout(barmode="group", yaxis_title="Índice")
+            else:
+                df = pd.DataFrame({
+                    "mu*": res["mu_estrella"][:, j], "mu* ±": res["mu_estrella_ic"][:, j],
+                    "sigma": res["sigma"][:, j],
+                }, index=res["parametros"])
+                fig = go.Figure(go.Scatter(
+                    x=df["mu*"], y=df["sigma"], mode="markers+text", text=df.index,
+                    textposition="top center",
+                    error_x=dict(type="data", array=df["mu* ±"])))
+                fig.update_layout(xaxis_title="μ*", yaxis_title="σ")
+
+            fig.update_layout(title=f"{metodo}: {salida} ({res['evaluaciones']} simulaciones)")
+            tabla.dataframe(df)
+            grafico.plotly_chart(fig, use_container_width=True)
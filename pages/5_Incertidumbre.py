@@ -0,0 +1,138 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+import pandas as pd
+from modelo import PARAMETROS
+from interfaz import barra_lateral, precarga
+from incertidumbre import montecarlo, DISTRIBUCIONES, BORDES, SALIDAS
+
+st.set_page_config(
+    page_title="TAC",
+    page_icon="👋",
+)
+
+st.title("Propagación de incertidumbre (Monte Carlo)")
+
+precarga()
+Fa0, Fb0, Fm0, T0, Ta1, UA, mc = barra_lateral()
+T_lim = st.sidebar.number_input("Límite de temperatura (°F)", 50.0, 400.0, 180.0)
+V = (1/7.484)*500
+base = [Fa0, Fb0, Fm0, T0, Ta1, UA, mc]
+
+tab1, tab2 = st.tabs(["Funcionamiento", "Monte Carlo"])
+
+with tab1:
+    st.markdown(
+    """
+    ## Guía de uso de la propagación de incertidumbre
+    En planta, el caudal de alimentación (Fa0), la temperatura del refrigerante (Ta1) y el coeficiente UA (por ensuciamiento) no son fijos sino que **derivan**. Esta página estima cómo esa variabilidad se traslada a la operación del reactor.
+
+    ---
+
+    ### 1. Cómo se usa
+    - El punto de operación es el de la barra lateral.  
+    - Para cada parámetro incierto se elige una **distribución**: normal, uniforme, triangular o lognormal.  
+    - Se simulan miles de arranques con muestras por **hipercubo latino**, por bloques y en paralelo.  
+
+    ### 2. Resultados
+    - Distribución de la **conversión final** y de la **temperatura pico**.  
+    - **Probabilidad de superar T_lim**, con su intervalo de confianza del 95 %.  
+    - Cuantiles (P5, P50, P95, P99) para evaluar el riesgo en las colas.  
+
+    Las estadísticas se actualizan a medida que avanzan los bloques y no guardan todas las muestras, así que se pueden usar decenas de miles sin agotar la memoria.
+    """
+    )
+
+with tab2:
+    inciertos = st.multiselect("Parámetros inciertos", list(PARAMETROS), default=["Fa0", "Ta1", "UA"])
+    valores = dict(zip(PARAMETROS, base))
+
+    distribuciones = {}
+    errores = []
+    for p in inciertos:
+        v = float(valores[p])
+        col1, col2, col3 = st.columns([2, 3, 3])
+        tipo = col1.selectbox(p, DISTRIBUCIONES, key=f"mc_{p}_tipo",
+                              index=1 if p == "UA" else 0)
+        if tipo == "normal":
+            desvio = col2.number_input("Desvío", 0.0, None, 0.05 * abs(v), key=f"mc_{p}_{tipo}_a")
+            distribuciones[p] = ("normal", v, desvio)
+        elif tipo == "lognormal":
+            s = col2.number_input("Desvío del logaritmo", 0.0, 2.0, 0.05, key=f"mc_{p}_{tipo}_a")
+            distribuciones[p] = ("lognormal", v, s)
+        else:
+            # UA por defecto sólo puede bajar (ensuciamiento)
+            lo = col2.number_input("Mínimo", value=0.7 * v if p == "UA" else 0.95 * v,
+                                   key=f"mc_{p}_{tipo}_a")
+            hi = col3.number_input("Máximo", value=v if p == "UA" else 1.05 * v,
+                                   key=f"mc_{p}_{tipo}_b")
+            distribuciones[p] = ("uniforme", lo, hi) if tipo == "uniforme" \
+                else ("triangular", lo, v, hi)
+            if lo > hi:
+                errores.append(f"{p}: el mínimo ({lo:g}) supera al máximo ({hi:g}).")
+            elif tipo == "triangular" and not lo <= v <= hi:
+                errores.append(f"{p}: la moda triangular es el valor actual ({v:g}) y debe "
+                               f"quedar entre el mínimo y el máximo.")
+    for error in errores:
+        st.error(error)
+
+    col1, col2 = st.columns(2)
+    n = col1.select_slider("Muestras", [500, 1000, 2000, 5000, 10000, 20000, 50000], 2000)
+    bloque = col2.select_slider("Muestras por bloque", [100, 250, 500, 1000], 250)
+
+    if st.button("Ejecutar Monte Carlo", disabled=bool(errores)) and distribuciones:
+        progreso = st.progress(0.0)
+        metricas = st.empty()
+        tabla = st.empty()
+        graficos = st.empty()
+
+        for acc in montecarlo(base, V, distribuciones, n=n, bloque=bloque, T_lim=T_lim):
+            res = acc.resumen()
+            progreso.progress(res["n"] / n)
+
+            p, p_lo, p_hi = res["prob_excedencia"]
+            with metricas.container():
+                c1, c2, c3 = st.columns(3)
+                c1.metric(f"P(T pico > {T_lim:g} °F)", f"{100*p:.2f} %",
+                          help=f"IC 95 %: {100*p_lo:.2f} – {100*p_hi:.2f} %")
+                c2.metric("X final (media ± desvío)",
+                          f"{res['media'][0]:.3f} ± {res['desvio'][0]:.3f}")
+                c3.metric("T pico (media ± desvío)",
+                          f"{res['media'][2]:.1f} ± {res['desvio'][2]:.1f} °F")
+
+            tabla.dataframe(pd.DataFrame({
+                s: {"media": res["media"][j], "desvío": res["desvio"][j],
+                    "mín": res["minimo"][j], "máx": res["maximo"][j],
+                    **{f"P{round(100*q)}": v for q, v in res["cuantiles"][s].items()}}
+                for j, s in enumerate(SALIDAS)}).T)
+
+            with graficos.container():
+                for j, s in ((0, "X_final"), (2, "T_pico")):
+                    centros = (BORDES[j][1:] + BORDES[j][:-1]) / 2
+                    h = acc.histogramas[j]
+                    usados = np.flatnonzero(h)
+                    if usados.size == 0:
+                        continue
+                    a, b = usados[0], usados[-1] + 1
+                    fig = go.Figure(go.Bar(x=centros[a:b], y=h[a:b] / res["n"], name=s))
+                    if s == "T_pico":
+                        fig.add_vline(x=T_lim, line_dash="dash", line_color="red",
+                                      annotation_text="T_lim")
+                    fig.update_layout(title=f"Distribución de {s} ({res['n']} muestras)",
+                                      xaxis_title=s, yaxis_title="Frecuencia relativa",
+                                      bargap=0)
+                    st.plotly_chart(fig, use_container_width=True)
+
+        progreso.empty()
+
+        # muestra de reserva: relación de cada parámetro incierto con la temperatura pico
+        fig = go.Figure()
+        for p in distribuciones:
+            fig.add_trace(go.Scatter(x=acc.muestra_P[:, PARAMETROS.index(p)],
+                                     y=acc.muestra_F[:, 2], mode="markers",
+                                     marker=dict(size=4), name=p,
+                                     visible=True if p == inciertos[0] else "legendonly"))
+        fig.add_hline(y=T_lim, line_dash="dash", line_color="red")
+        fig.update_layout(title=f"T pico vs parámetro (muestra de {len(acc.muestra_F)} puntos)",
+                          xaxis_title="Valor del parámetro", yaxis_title="T pico (°F)")
+        st.plotly_chart(fig, use_container_width=True)
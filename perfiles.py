@@ -0,0 +1,152 @@
+import numpy as np
+
+from modelo import Reactor, cstr_odes_lote, cstr_jac_lote
+from diagnostico import resolver
+
+
+# Perfiles temporales del caudal de refrigerante mc(t).
+# Cada perfil se compila en tramos suaves separados por sus discontinuidades
+# (cortes); la integración se reinicia en cada corte, de modo que el lado
+# derecho nunca evalúa condiciones ni el BDF atraviesa un salto.
+
+class Perfil:
+    __slots__ = ("nombre", "tramos")
+
+    def __init__(self, nombre, tramos):
+        # tramos: lista ordenada de (t_inicio, función vectorizada de t)
+        self.nombre = nombre
+        self.tramos = tramos
+
+    @property
+    def cortes(self):
+        return [t for t, _ in self.tramos[1:]]
+
+    def tramo(self, t):
+        i = np.searchsorted([a for a, _ in self.tramos], t, side="right") - 1
+        return self.tramos[max(i, 0)][1]
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=float)
+        inicios = np.array([a for a, _ in self.tramos])
+        idx = np.clip(np.searchsorted(inicios, t, side="right") - 1, 0, None)
+        salida = np.empty(t.shape)
+        for i, (_, f) in enumerate(self.tramos):
+            m = idx == i
+            if np.any(m):
+                salida[m] = f(t[m])
+        return salida if salida.ndim else float(salida)
+
+
+def _constante(valor):
+    return lambda t: np.full(np.shape(t), float(valor))
+
+
+def compilar_perfil(perfil, mc0, mc1, t_step, t_end, tau_exp=1.0):
+    """Step / Rampa lineal / Exponencial con la misma definición que la página 3"""
+    if perfil == "Step":
+        if t_end < t_step:
+            return Perfil(perfil, [(-np.inf, _constante(mc0))])
+        return Perfil(perfil, [(-np.inf, _constante(mc0)), (t_step, _constante(mc1)),
+                               (t_end, _constante(mc0))])
+    elif perfil == "Rampa lineal":
+        if t_end <= t_step:
+            return Perfil(perfil, [(-np.inf, _constante(mc0)), (t_step, _constante(mc1))])
+        pendiente = (mc1 - mc0) / (t_end - t_step)
+        return Perfil(perfil, [(-np.inf, _constante(mc0)),
+                               (t_step, lambda t: mc0 + pendiente*(t - t_step)),
+                               (t_end, _constante(mc1))])
+    elif perfil == "Exponencial":
+        return Perfil(perfil, [(-np.inf, _constante(mc0)),
+                               (t_step, lambda t: mc1 - (mc1 - mc0)*np.exp(-(t - t_step)/tau_exp))])
+    return Perfil(perfil, [(-np.inf, _constante(mc0))])
+
+
+def perfil_por_tramos(tiempos, valores, interpolacion="escalon", nombre="Por tramos"):
+    """Perfil definido por el usuario: valores[i] a partir de tiempos[i].
+
+    interpolacion="escalon" mantiene cada valor hasta el siguiente tiempo;
+    "lineal" interpola entre puntos (sin saltos, pero con cortes en los
+    quiebres de pendiente). Antes del primer tiempo vale valores[0].
+    Tiempos repetidos no definen un valor único: se rechazan con ValueError.
+    """
+    tiempos = np.asarray(tiempos, dtype=float)
+    valores = np.asarray(valores, dtype=float)
+    repetidos = np.unique(tiempos[np.flatnonzero(np.diff(np.sort(tiempos)) == 0)])
+    if len(repetidos):
+        raise ValueError("Tiempos repetidos en el perfil por tramos: "
+                         + ", ".join(f"{t:g}" for t in repetidos))
+    orden = np.argsort(tiempos)
+    tiempos, valores = tiempos[orden], valores[orden]
+
+    tramos = [(-np.inf, _constante(valores[0]))]
+    for i in range(len(tiempos)):
+        if interpolacion == "lineal" and i + 1 < len(tiempos):
+            t_a, t_b, v_a, v_b = tiempos[i], tiempos[i+1], valores[i], valores[i+1]
+            tramos.append((t_a, lambda t, t_a=t_a, v_a=v_a, m=(v_b - v_a)/(t_b - t_a):
+                           v_a + m*(t - t_a)))
+        else:
+            tramos.append((tiempos[i], _constante(valores[i])))
+    return Perfil(nombre, tramos)
+
+
+def _intervalos(t_span, cortes):
+    bordes = [t_span[0]] + sorted(c for c in set(cortes) if t_span[0] < c < t_span[1]) \
+        + [t_span[1]]
+    return list(zip(bordes[:-1], bordes[1:]))
+
+
+def _t_eval_tramo(t_eval, a, b, ultimo):
+    if t_eval is None:
+        return None
+    m = (t_eval >= a) & ((t_eval <= b) if ultimo else (t_eval < b))
+    return t_eval[m]
+
+
+def _con_final(te, b):
+    # se agrega b a la grilla para obtener el estado exacto al final del tramo
+    if te is None or (len(te) and te[-1] == b):
+        return te
+    return np.r_[te, b]
+
+
+def simular_perfil(perfil, Fa0, Fb0, Fm0, V, UA, Ta1, T0, t_span, t_eval, y0=None,
+                   rtol=1e-3, atol=1e-6):
+    """Integra el arranque con mc(t) = perfil(t), reiniciando en cada corte.
+
+    Devuelve (t, y, stats) con stats = nfev, njev, nlu sumados sobre los tramos.
+    """
+    sol = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, perfil, T0).simulate(
+        t_span, t_eval, y0=y0, rtol=rtol, atol=atol)
+    return sol.t, sol.y, {k: getattr(sol, k) for k in ("nfev", "njev", "nlu")}
+
+
+def simular_perfiles(perfiles, Fa0, Fb0, Fm0, V, UA, Ta1, T0, t_span, t_eval,
+                     rtol=1e-3, atol=1e-6):
+    """Integra varios perfiles a la vez como un único sistema por bloques.
+
+    Devuelve (t, Y) con Y de forma (N, 5, len(t_eval)).
+    """
+    n = len(perfiles)
+    t_eval = np.asarray(t_eval, dtype=float)
+    Y0 = np.tile([0.0, 3.45, 0.0, 0.0, T0], n)
+    escala = np.sqrt(n)
+    cortes = [c for p in perfiles for c in p.cortes]
+
+    Y = []
+    intervalos = _intervalos(t_span, cortes)
+    for k, (a, b) in enumerate(intervalos):
+        funciones = [p.tramo((a + b) / 2) for p in perfiles]
+
+        def args(t):
+            mc_t = np.array([f(t) for f in funciones], dtype=float)
+            return (Fa0, Fb0, Fm0, V, UA, Ta1, mc_t, T0)
+
+        te = _t_eval_tramo(t_eval, a, b, k == len(intervalos) - 1)
+        sol = resolver(lambda t, y: cstr_odes_lote(t, y, *args(t)), (a, b), Y0,
+                       method="BDF", jac=lambda t, y: cstr_jac_lote(t, y, *args(t)),
+                       t_eval=_con_final(te, b), rtol=rtol/escala, atol=atol/escala,
+                       etiqueta=f"simular_perfiles (tramo {k + 1})")
+        Y0 = sol.y[:, -1]
+        Y.append(sol.y[:, :len(te)])
+
+    return t_eval, np.hstack(Y).reshape(n, 5, -1)
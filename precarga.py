@@ -0,0 +1,49 @@
+"""Precarga del simulador para acortar el arranque en frío.
+
+`precargar` paga de una vez los imports pesados, la carga de los núcleos
+compilados y la simulación del caso por defecto (que queda en la cache de
+cache_simulacion, compartida por todas las sesiones del proceso). En la app
+se llama a través de interfaz.precarga, envuelta en st.cache_resource para
+que corra una sola vez por proceso aunque lleguen varias sesiones a la vez.
+"""
+import time
+
+
+def _ms(t_ini):
+    return (time.perf_counter() - t_ini) * 1e3
+
+
+def precargar(graficos=True):
+    """Devuelve los tiempos (ms) de cada etapa"""
+    tiempos = {}
+
+    t_ini = time.perf_counter()
+    import numpy as np
+    from modelo import DEFECTO, TASA_ESTACIONARIA
+    from cache_simulacion import simular
+    tiempos["núcleo (numpy, scipy, modelo)"] = _ms(t_ini)
+
+    t_ini = time.perf_counter()
+    import kernel   # con TAC_BACKEND=numba compila o carga de la cache de Numba
+    tiempos[f"kernel ({kernel.BACKEND})"] = _ms(t_ini)
+
+    if graficos:
+        t_ini = time.perf_counter()
+        import pandas  # noqa: F401
+        import plotly.graph_objects  # noqa: F401
+        tiempos["pandas y plotly"] = _ms(t_ini)
+
+        t_ini = time.perf_counter()
+        from graficos import lttb
+        lttb(np.arange(10.0), np.arange(10.0), 5)    # compila o carga la reducción LTTB
+        tiempos["reducción de series (LTTB)"] = _ms(t_ini)
+
+    # mismos argumentos que la simulación inicial de las páginas 1 y 2
+    t_ini = time.perf_counter()
+    Fa0, Fb0, Fm0, T0, Ta1, UA, mc = DEFECTO
+    simular(Fa0, Fb0, Fm0, (1/7.484)*500, UA, Ta1, mc, T0, (0, 4), np.linspace(0, 4, 300),
+            y0=[0.0, 3.45, 0.0, 0.0, T0], tasa_estacionaria=TASA_ESTACIONARIA)
+    tiempos["caso por defecto"] = _ms(t_ini)
+
+    tiempos["total"] = sum(tiempos.values())
+    return tiempos
@@ -0,0 +1,200 @@
+import os
+
+import numpy as np
+
+from modelo import simular_lote, PARAMETROS
+from barrido import obtener_pool
+
+
+# Salidas escalares de cada simulación
+SALIDAS = ("X_final", "T_final", "T_pico")
+
+
+def evaluar(P, V, t_span=(0, 4), t_eval=None, lote=256):
+    """Simula las filas de P en lotes y devuelve (N, 3): X_final, T_final, T_pico"""
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    if t_eval is None:
+        t_eval = np.linspace(t_span[0], t_span[1], 300)
+    salida = np.empty((len(P), len(SALIDAS)))
+    for inicio in range(0, len(P), lote):
+        bloque = P[inicio:inicio + lote]
+        _, Y = simular_lote(bloque, V, t_span, t_eval)
+        Fa, Fb, Fm = bloque[:, 0], bloque[:, 1], bloque[:, 2]
+        v0 = Fa/0.923 + Fb/3.45 + Fm/1.54
+        salida[inicio:inicio + lote, 0] = (Fa - Y[:, 0, -1] * v0) / Fa
+        salida[inicio:inicio + lote, 1] = Y[:, 4, -1]
+        salida[inicio:inicio + lote, 2] = Y[:, 4, :].max(axis=1)
+    return salida
+
+
+def evaluar_paralelo(P, V, t_span=(0, 4), workers=None, lote=None, progreso=None):
+    """evaluar() repartido en bloques sobre el pool de procesos (en este proceso
+    con workers=1). Por defecto los bloques reparten P en partes iguales entre
+    los workers, de a lo sumo 256 filas. progreso(hechos, total) se llama al
+    terminar cada bloque, en orden."""
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    n_workers = workers or os.cpu_count() or 1
+    if lote is None:
+        lote = int(min(256, max(8, np.ceil(len(P) / n_workers))))
+    if workers == 1:
+        salida = []
+        for i in range(0, len(P), lote):
+            salida.append(evaluar(P[i:i + lote], V, t_span, lote=lote))
+            if progreso is not None:
+                progreso(min(i + lote, len(P)), len(P))
+        return np.vstack(salida)
+    pool = obtener_pool(workers)
+    futuros = [pool.submit(evaluar, P[i:i + lote], V, t_span, None, lote)
+               for i in range(0, len(P), lote)]
+    salida = []
+    try:
+        for k, fut in enumerate(futuros):
+            salida.append(fut.result())
+            if progreso is not None:
+                progreso(min((k + 1) * lote, len(P)), len(P))
+    finally:
+        # si progreso corta (cancelación) o el consumidor se va, no dejar bloques en el pool
+        for fut in futuros:
+            fut.cancel()
+    return np.vstack(salida)
+
+
+def _escalar(U, limites):
+    lo, hi = np.asarray(limites, dtype=float).T
+    return lo + U * (hi - lo)
+
+
+# --- Sobol (diseño de Saltelli) ---
+
+def _indices_sobol(fA, fB, fAB):
+    # estimadores de Saltelli (2010) para S1 y de Jansen para ST
+    var = np.var(np.concatenate([fA, fB]), axis=0, ddof=1)
+    var = np.where(var > 0, var, np.nan)
+    S1 = np.mean(fB[None] * (fAB - fA[None]), axis=1) / var
+    ST = 0.5 * np.mean((fA[None] - fAB)**2, axis=1) / var
+    return S1, ST
+
+
+def sobol(limites, V, n_base=1024, bloque=128, n_boot=200, semilla=0, t_span=(0, 4),
+          workers=None):
+    """Índices de Sobol de primer orden y totales, calculados por bloques.
+
+    limites: (d, 2) con el rango de cada parámetro (orden de PARAMETROS);
+    los parámetros con rango nulo quedan fijos. Cada bloque de `bloque`
+    muestras base cuesta bloque*(k+2) simulaciones, k = parámetros variables.
+    Es un generador: después de cada bloque entrega la estimación acumulada
+    {"n", "evaluaciones", "S1", "ST", "S1_ic", "ST_ic"}, cada índice de forma
+    (k, 3) con los nombres en "parametros". Las simulaciones de cada bloque se
+    reparten entre `workers` procesos (evaluar_paralelo).
+    """
+    limites = np.asarray(limites, dtype=float)
+    variables = np.flatnonzero(limites[:, 1] > limites[:, 0])
+    k = len(variables)
+
+    from scipy.stats import qmc  # scipy.stats es pesado: sólo se importa al muestrear
+    muestreo = qmc.Sobol(d=2*k, scramble=True, seed=semilla)
+    rng = np.random.default_rng(semilla)
+    fijos = limites[:, 0]
+
+    fA_tot, fB_tot, fAB_tot = [], [], []
+    hechos = 0
+    while hechos < n_base:
+        n = min(bloque, n_base - hechos)
+        U = muestreo.random(n)
+        A = np.tile(fijos, (n, 1))
+        B = np.tile(fijos, (n, 1))
+        A[:, variables] = _escalar(U[:, :k], limites[variables])
+        B[:, variables] = _escalar(U[:, k:], limites[variables])
+        AB = np.repeat(A[None], k, axis=0)
+        for j, i in enumerate(variables):
+            AB[j, :, i] = B[:, i]
+
+        f = evaluar_paralelo(np.vstack([A, B, AB.reshape(-1, A.shape[1])]), V, t_span,
+                             workers=workers)
+        fA_tot.append(f[:n])
+        fB_tot.append(f[n:2*n])
+        fAB_tot.append(f[2*n:].reshape(k, n, -1))
+        hechos += n
+
+        fA = np.concatenate(fA_tot)
+        fB = np.concatenate(fB_tot)
+        fAB = np.concatenate(fAB_tot, axis=1)
+        S1, ST = _indices_sobol(fA, fB, fAB)
+
+        # intervalos de confianza del 95 % por bootstrap sobre las muestras base
+        boot1, bootT = [], []
+        for _ in range(n_boot):
+            idx = rng.integers(0, hechos, hechos)
+            b1, bT = _indices_sobol(fA[idx], fB[idx], fAB[:, idx])
+            boot1.append(b1)
+            bootT.append(bT)
+        yield {
+            "parametros": [PARAMETROS[i] for i in variables],
+            "n": hechos,
+            "evaluaciones": hechos * (k + 2),
+            "S1": S1,
+            "ST": ST,
+            "S1_ic": 1.96 * np.nanstd(boot1, axis=0),
+            "ST_ic": 1.96 * np.nanstd(bootT, axis=0),
+        }
+
+
+# --- Morris (efectos elementales) ---
+
+def morris(limites, V, r=50, niveles=4, bloque=16, n_boot=200, semilla=0, t_span=(0, 4),
+           workers=None):
+    """Cribado de Morris con r trayectorias; generador como sobol().
+
+    Entrega mu* (media del valor absoluto de los efectos elementales), sigma
+    y el intervalo de confianza de mu*, cada uno de forma (k, 3).
+    """
+    limites = np.asarray(limites, dtype=float)
+    variables = np.flatnonzero(limites[:, 1] > limites[:, 0])
+    k = len(variables)
+    rng = np.random.default_rng(semilla)
+    delta = niveles / (2 * (niveles - 1))
+    grilla = np.arange(niveles // 2) / (niveles - 1)
+
+    efectos = []
+    hechas = 0
+    while hechas < r:
+        n = min(bloque, r - hechas)
+        U = np.empty((n, k + 1, k))
+        signos = np.empty((n, k))
+        ordenes = np.empty((n, k), dtype=int)
+        for m in range(n):
+            # trayectoria: punto base en la grilla y un paso ±delta por parámetro
+            x = rng.choice(grilla, k)
+            orden = rng.permutation(k)
+            s = rng.choice([-1.0, 1.0], k)
+            x = np.where(s < 0, x + delta, x)
+            U[m, 0] = x
+            for paso, i in enumerate(orden):
+                x = x.copy()
+                x[i] += s[i] * delta
+                U[m, paso + 1] = x
+            signos[m], ordenes[m] = s, orden
+
+        P = np.tile(limites[:, 0], (n * (k + 1), 1))
+        P[:, variables] = _escalar(U.reshape(-1, k), limites[variables])
+        f = evaluar_paralelo(P, V, t_span, workers=workers).reshape(n, k + 1, -1)
+
+        ee = np.empty((n, k, f.shape[2]))
+        for m in range(n):
+            dif = np.diff(f[m], axis=0) / delta
+            ee[m, ordenes[m]] = dif * signos[m][ordenes[m], None]
+        efectos.append(ee)
+        hechas += n
+
+        EE = np.concatenate(efectos)
+        mu_estrella = np.abs(EE).mean(axis=0)
+        boot = [np.abs(EE[rng.integers(0, hechas, hechas)]).mean(axis=0)
+                for _ in range(n_boot)]
+        yield {
+            "parametros": [PARAMETROS[i] for i in variables],
+            "n": hechas,
+            "evaluaciones": hechas * (k + 1),
+            "mu_estrella": mu_estrella,
+            "sigma": EE.std(axis=0, ddof=1) if hechas > 1 else np.full_like(mu_estrella, np.nan),
+            "mu_estrella_ic": 1.96 * np.std(boot, axis=0),
+        }
@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+from scipy.optimize import brentq
+
+from modelo import Reactor, evento_estacionario, TASA_ESTACIONARIA
+from diagnostico import instrumentar, registrar
+
+
+def simular_progresivo(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, y0=None, t_max=24.0,
+                       tramo=0.25, tasa_estacionaria=TASA_ESTACIONARIA,
+                       puntos_por_paso=2, rtol=1e-3, atol=1e-6):
+    """Integra el arranque por tramos y los va entregando a medida que avanzan.
+
+    El horizonte no es fijo: se sigue integrando hasta que se alcanza el estado
+    estacionario (evento de modelo.evento_estacionario) o hasta t_max. La salida
+    se muestrea sobre los pasos del propio integrador usando su salida densa,
+    así que hay más puntos en los transitorios rápidos y pocos en las mesetas.
+
+    Generador de (t, y, t_est) con y de forma (5, n); t_est es None salvo en el
+    último tramo si se alcanzó el estado estacionario.
+    """
+    if y0 is None:
+        y0 = [0.0, 3.45, 0.0, 0.0, T0]
+    reactor = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+    evento = evento_estacionario(reactor.rhs, tasa_estacionaria)
+    BDF = instrumentar("BDF")
+    solver = BDF(reactor.rhs, 0.0, np.asarray(y0, dtype=float), t_max, jac=reactor.jac,
+                 rtol=rtol, atol=atol)
+    # sólo se mide el tiempo de integración, no el del consumidor entre tramos
+    tiempo = 0.0
+
+    ts, ys = [0.0], [np.array(y0, dtype=float)]
+    g_ant = evento(0.0, y0)
+    fin_tramo = tramo
+
+    while solver.status == "running":
+        t_ini = time.perf_counter()
+        mensaje = solver.step()
+        tiempo += time.perf_counter() - t_ini
+        if solver.status == "failed":
+            registrar("simular_progresivo", BDF, solver, tiempo, len(y0), 0.0, solver.t, -1, rtol)
+            raise RuntimeError(mensaje)
+
+        t_ant, t_act = solver.t_old, solver.t
+        densa = solver.dense_output()
+        g = evento(t_act, solver.y)
+
+        t_est = None
+        if g_ant > 0 >= g:
+            # cruce dentro del paso: se ubica sobre la salida densa
+            t_est = brentq(lambda s: evento(s, densa(s)), t_ant, t_act)
+            t_act = t_est
+        g_ant = g
+
+        s = np.linspace(t_ant, t_act, puntos_por_paso + 1)[1:]
+        ts.extend(s)
+        ys.extend(densa(s).T)
+
+        ultimo = t_est is not None or solver.status == "finished"
+        if ultimo:
+            registrar("simular_progresivo", BDF, solver, tiempo, len(y0), 0.0, t_act,
+                      1 if t_est is not None else 0, rtol)
+        if ultimo or t_act >= fin_tramo:
+            yield np.array(ts), np.array(ys).T, t_est
+            ts, ys = [], []
+            fin_tramo = t_act + tramo
+        if t_est is not None:
+            return
@@ -0,0 +1,79 @@
+import csv
+
+import numpy as np
+import pytest
+
+import almacen
+from almacen import AlmacenBarrido, FINALES, VARIABLES
+from modelo import DEFECTO, PARAMETROS, Reactor
+
+
+V = (1/7.484)*500
+
+
+@pytest.fixture
+def barrido(tmp_path, monkeypatch):
+    monkeypatch.setattr(almacen, "DIRECTORIO", str(tmp_path))
+    P = np.tile(DEFECTO, (5, 1)).astype(float)
+    P[:, PARAMETROS.index("Ta1")] = np.linspace(40, 80, 5)
+    t_eval = np.linspace(0, 1, 4)
+    Y = np.array([Reactor.desde_fila(fila, V).simulate((0, 1), t_eval).y for fila in P])
+    return AlmacenBarrido.crear(P, V, t_eval, param="Ta1"), P, t_eval, Y
+
+
+def test_escribir_por_bloques_y_releer(barrido):
+    a, P, t_eval, Y = barrido
+    a.escribir([0, 1], Y[:2])
+    assert not a.completo
+    np.testing.assert_array_equal(a.hecho, [True, True, False, False, False])
+    a.escribir(np.arange(2, 5), Y[2:])
+    assert a.completo
+
+    # otro lector abre los memmaps del directorio sin cargar Y entero
+    b = AlmacenBarrido(a.directorio)
+    assert isinstance(b.Y, np.memmap)
+    assert b.meta["param"] == "Ta1" and b.V == V
+    np.testing.assert_array_equal(b.P, P)
+    np.testing.assert_array_equal(b.t, t_eval)
+    np.testing.assert_array_equal(b.trayectoria(3), Y[3])
+
+
+def test_finales(barrido):
+    a, P, _, Y = barrido
+    a.escribir(np.arange(5), Y)
+    F = a.finales(bloque=2)
+    np.testing.assert_array_equal(F[:, :5], Y[:, :, -1])
+    X = [Reactor.desde_fila(fila, V).conversion(y[0, -1]) for fila, y in zip(P, Y)]
+    np.testing.assert_allclose(F[:, 5], X)
+    np.testing.assert_array_equal(a.finales([4, 1]), F[[4, 1]])
+
+
+def test_exportar_csv(barrido):
+    a, P, t_eval, Y = barrido
+    a.escribir(np.arange(5), Y)
+    with open(a.exportar_csv(), newline="", encoding="utf-8") as f:
+        filas = list(csv.reader(f))
+    assert filas[0] == [*PARAMETROS, *FINALES]
+    np.testing.assert_allclose(np.array(filas[1:], dtype=float),
+                               np.hstack([P, a.finales()]))
+
+    with open(a.exportar_csv(trayectorias=True), newline="", encoding="utf-8") as f:
+        filas = list(csv.reader(f))
+    assert filas[0] == ["punto", *PARAMETROS, "t", *VARIABLES]
+    datos = np.array(filas[1:], dtype=float)
+    assert len(datos) == len(P) * len(t_eval)
+    # formato largo: punto 2, tercer instante
+    fila = datos[2 * len(t_eval) + 2]
+    assert fila[0] == 2 and fila[1 + len(PARAMETROS)] == t_eval[2]
+    np.testing.assert_allclose(fila[-5:], Y[2, :, 2])
+
+
+def test_el_csv_se_genera_una_vez(barrido):
+    a, _, _, Y = barrido
+    a.escribir(np.arange(5), Y)
+    ruta = a.exportar_csv()
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write("marca\n")
+    assert a.exportar_csv() == ruta
+    with open(ruta, encoding="utf-8") as f:
+        assert f.read().endswith("marca\n")
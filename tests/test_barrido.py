@@ -0,0 +1,27 @@
+import numpy as np
+
+from modelo import DEFECTO, PARAMETROS, Reactor
+from barrido import obtener_pool, resolver_barrido, _resolver_bloque
+
+
+V = (1/7.484)*500
+
+
+def test_pedir_otro_tamano_no_cancela_lo_que_esta_en_vuelo():
+    P = np.tile(DEFECTO, (4, 1)).astype(float)
+    t_eval = np.linspace(0, 4, 20)
+    pool = obtener_pool(2)
+    futuro = pool.submit(_resolver_bloque, P, V, (0, 4), t_eval, None, "BDF", 1e-3, 1e-6)
+    assert obtener_pool(1) is not pool
+    assert obtener_pool(2) is pool
+    assert futuro.result(timeout=120).shape == (4, 5, 20)
+
+
+def test_barrido_paralelo_igual_al_serie():
+    P = np.tile(DEFECTO, (6, 1)).astype(float)
+    P[:, PARAMETROS.index("Fa0")] = np.linspace(50, 150, 6)
+    t_eval = np.linspace(0, 4, 30)
+    Y = resolver_barrido(P, V, (0, 4), t_eval, chunk=2, workers=2)
+    for fila, Yi in zip(P, Y):
+        sol = Reactor.desde_fila(fila, V).simulate((0, 4), t_eval)
+        np.testing.assert_allclose(Yi, sol.y, rtol=1e-12)
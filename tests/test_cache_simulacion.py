@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import cache_simulacion
+from cache_simulacion import CacheSimulacion
+
+
+V = (1/7.484)*500
+T_EVAL = np.linspace(0, 1, 11)
+
+
+def correr(cache, Ta1=60.0, **kwargs):
+    return cache.simular(80.0, 1000.0, 100.0, V, 16000.0, Ta1, 1000.0, 75.0, (0, 1), T_EVAL,
+                         **kwargs)
+
+
+def test_lru_descarta_el_menos_usado():
+    cache = CacheSimulacion(maxsize=2)
+    correr(cache, 50.0)
+    correr(cache, 60.0)
+    correr(cache, 50.0)         # 50 pasa a ser el más reciente
+    correr(cache, 70.0)         # y se descarta 60
+    assert cache.stats == {"hits_memoria": 1, "hits_disco": 0, "misses": 3}
+    correr(cache, 50.0)
+    assert cache.stats["hits_memoria"] == 2
+    correr(cache, 60.0)
+    assert cache.stats["misses"] == 4
+
+
+def test_resultados_compartidos_de_solo_lectura():
+    cache = CacheSimulacion()
+    t, y, _ = correr(cache)
+    assert correr(cache)[1] is y
+    with pytest.raises(ValueError):
+        y[0, 0] = 1.0
+
+
+def test_disco_ida_y_vuelta(tmp_path):
+    t, y, t_est = correr(CacheSimulacion(directorio=str(tmp_path)),
+                         tasa_estacionaria=1.0)
+    assert t_est is not None and t[-1] == t_est
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # otro proceso (otra instancia) lo lee del disco sin integrar
+    otra = CacheSimulacion(directorio=str(tmp_path))
+    t2, y2, t_est2 = correr(otra, tasa_estacionaria=1.0)
+    assert otra.stats == {"hits_memoria": 0, "hits_disco": 1, "misses": 0}
+    np.testing.assert_array_equal(t2, t)
+    np.testing.assert_array_equal(y2, y)
+    assert t_est2 == t_est
+    assert not y2.flags.writeable
+
+
+def test_cambiar_version_invalida_el_disco(tmp_path, monkeypatch):
+    correr(CacheSimulacion(directorio=str(tmp_path)))
+    monkeypatch.setattr(cache_simulacion, "VERSION", cache_simulacion.VERSION + 1)
+    otra = CacheSimulacion(directorio=str(tmp_path))
+    correr(otra)
+    assert otra.stats["misses"] == 1 and otra.stats["hits_disco"] == 0
+    assert len(list(tmp_path.glob("*.npz"))) == 2
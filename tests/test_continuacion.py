@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from continuacion import continuar, _Sistema, _cruces
+from modelo import DEFECTO, PARAMETROS, cstr_odes, estados_estacionarios
+
+
+V = (1/7.484)*500
+
+
+@pytest.mark.parametrize("param", PARAMETROS)
+def test_derivada_respecto_del_parametro(param):
+    # la columna analítica coincide con diferencias centradas sobre cstr_odes
+    escala = np.ones(6)
+    sis = _Sistema(DEFECTO, param, V, escala)
+    p = DEFECTO[PARAMETROS.index(param)]
+    y = np.array([0.05, 3.0, 0.2, 0.8, 140.0])
+    A, _ = sis.dF(np.r_[y, p])
+    h = 1e-6 * max(abs(p), 1.0)
+    Fp = (np.asarray(cstr_odes(0.0, y, *sis.args(p + h))) -
+          np.asarray(cstr_odes(0.0, y, *sis.args(p - h)))) / (2*h)
+    np.testing.assert_allclose(A[:, 5], Fp, rtol=1e-5, atol=1e-8)
+
+
+def test_curva_en_s_respecto_de_Ta1():
+    r = continuar("Ta1", 20, 200, DEFECTO, V)
+    limites = sorted(e["p"] for e in r["especiales"] if e["tipo"] == "LP")
+    np.testing.assert_allclose(limites, [50.03, 54.13], atol=5e-3)
+    # la rama intermedia entre los dos puntos límite es inestable
+    rama = r["ramas"][0]
+    assert rama["estable"].any() and not rama["estable"].all()
+
+
+def test_la_rama_pasa_por_los_estados_estacionarios():
+    r = continuar("Ta1", 20, 200, DEFECTO, V)
+    fila = np.array(DEFECTO, dtype=float)
+    fila[PARAMETROS.index("Ta1")] = 52.0
+    Fa0, Fb0, Fm0, T0, Ta1, UA, mc = fila
+    T_ss = sorted(e["y"][4] for e in estados_estacionarios(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0))
+    T_rama = sorted(T for rama in r["ramas"] for T in _cruces(rama, 52.0))
+    assert len(T_ss) == 3
+    # _cruces interpola linealmente entre pasos de la rama
+    np.testing.assert_allclose(T_rama, T_ss, atol=1.0)
@@ -0,0 +1,87 @@
+import csv
+
+import numpy as np
+import pytest
+
+import corridas
+from modelo import DEFECTO, PARAMETROS, Reactor, TASA_ESTACIONARIA
+
+
+def test_escenarios_desde_dict():
+    nombres, P, opciones = corridas.escenarios_desde_dict({
+        "base": {"UA": 20000},
+        "opciones": {"t_final": 2},
+        "escenarios": [{"nombre": "caliente", "Ta1": 90}, {"Fa0": 60}],
+        "barridos": [{"param": "Ta1", "desde": 40, "hasta": 80, "puntos": 3}],
+        "grilla": {"Ta1": [40, 60], "mc": {"desde": 500, "hasta": 1500, "puntos": 2}},
+    })
+    assert nombres[:5] == ["caliente", "escenario_1", "Ta1=40", "Ta1=60", "Ta1=80"]
+    assert nombres[5:] == ["Ta1=40,mc=500", "Ta1=40,mc=1500", "Ta1=60,mc=500",
+                           "Ta1=60,mc=1500"]
+    assert P.shape == (9, len(PARAMETROS))
+    assert opciones == {"t_final": 2}
+    # la base reemplaza a DEFECTO en todas las filas; el resto queda por defecto
+    assert np.all(P[:, PARAMETROS.index("UA")] == 20000)
+    assert np.all(P[:, PARAMETROS.index("T0")] == DEFECTO[PARAMETROS.index("T0")])
+    assert P[0, PARAMETROS.index("Ta1")] == 90 and P[1, PARAMETROS.index("Fa0")] == 60
+
+
+def test_leer_csv_y_yaml(tmp_path):
+    ruta = tmp_path / "escenarios.csv"
+    ruta.write_text("nombre,Ta1,UA\na,50,\nb,70,9000\n", encoding="utf-8")
+    nombres, P, _ = corridas.leer_escenarios(str(ruta))
+    assert nombres == ["a", "b"]
+    assert P[0, PARAMETROS.index("UA")] == DEFECTO[PARAMETROS.index("UA")]
+    assert P[1, PARAMETROS.index("UA")] == 9000
+
+    ruta = tmp_path / "escenarios.yaml"
+    ruta.write_text("barridos:\n  - {param: Ta1, desde: 40, hasta: 60, puntos: 2}\n",
+                    encoding="utf-8")
+    nombres, P, _ = corridas.leer_escenarios(str(ruta))
+    assert nombres == ["Ta1=40", "Ta1=60"]
+
+    with pytest.raises(SystemExit):
+        corridas.leer_escenarios(str(tmp_path / "escenarios.txt"))
+
+
+def test_ejecutar_en_orden_e_igual_al_modelo():
+    P = np.tile(DEFECTO, (5, 1)).astype(float)
+    P[:, PARAMETROS.index("Ta1")] = np.linspace(40, 80, 5)
+    avances = []
+    R = corridas.ejecutar(P, t_final=2.0, n_puntos=50, workers=2, chunk=2,
+                          progreso=lambda h, t: avances.append(h))
+    # los bloques llegan en el orden en que terminan; el avance es acumulado
+    assert len(avances) == 3 and avances == sorted(avances) and avances[-1] == 5
+
+    reactor = Reactor.desde_fila(P[3], corridas.V)
+    sol = reactor.simulate((0, 2.0), np.linspace(0, 2.0, 50),
+                           tasa_estacionaria=TASA_ESTACIONARIA)
+    y = sol.y_events[0][0] if len(sol.t_events[0]) else sol.y[:, -1]
+    np.testing.assert_allclose(R[3, :5], y, rtol=1e-10)
+    assert R[3, corridas.COLUMNAS.index("X_final")] == pytest.approx(reactor.conversion(y[0]))
+
+
+def test_main_de_punta_a_punta(tmp_path):
+    escenarios = tmp_path / "escenarios.yaml"
+    escenarios.write_text("opciones: {t_final: 1, puntos: 20}\n"
+                          "escenarios:\n  - {nombre: uno, Ta1: 50}\n  - {nombre: dos}\n",
+                          encoding="utf-8")
+    salida = tmp_path / "resultados.csv"
+    corridas.main([str(escenarios), "-o", str(salida), "--workers", "1"])
+    with open(salida, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert [f["nombre"] for f in filas] == ["uno", "dos"]
+    assert list(filas[0]) == ["nombre", *PARAMETROS, *corridas.COLUMNAS]
+    assert float(filas[0]["Ta1"]) == 50
+
+
+def test_guardar_parquet(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    P = np.tile(DEFECTO, (2, 1)).astype(float)
+    R = np.arange(2 * len(corridas.COLUMNAS), dtype=float).reshape(2, -1)
+    ruta = str(tmp_path / "resultados.parquet")
+    corridas.guardar(ruta, ["a", "b"], P, R)
+    df = pd.read_parquet(ruta)
+    assert list(df["nombre"]) == ["a", "b"]
+    np.testing.assert_array_equal(df[list(corridas.COLUMNAS)].to_numpy(), R)
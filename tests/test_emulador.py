@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pytest
+
+from modelo import DEFECTO
+from emulador import Emulador, ventana, _distancias, _cola
+
+
+V = (1/7.484)*500
+
+
+def test_loo_de_rippa_igual_al_explicito():
+    em = Emulador.entrenar(V, n=40, limites=ventana(DEFECTO, 0.1), n_validacion=0, workers=1)
+    X, n = em.centros, len(em.centros)
+    # salidas normalizadas reconstruidas desde el interpolante (que las reproduce exactas)
+    Yn = _distancias(X, X)**3 @ em.pesos + _cola(X) @ em.cola
+
+    for i in range(n):
+        resto = np.delete(np.arange(n), i)
+        Xr = X[resto]
+        A = np.zeros((n - 1 + 8, n - 1 + 8))
+        A[:n - 1, :n - 1] = _distancias(Xr, Xr)**3
+        A[:n - 1, n - 1:] = _cola(Xr)
+        A[n - 1:, :n - 1] = _cola(Xr).T
+        coef = np.linalg.solve(A, np.vstack([Yn[resto], np.zeros((8, 3))]))
+        pred = _distancias(X[i:i + 1], Xr)**3 @ coef[:n - 1] + _cola(X[i:i + 1]) @ coef[n - 1:]
+        np.testing.assert_allclose(np.abs(Yn[i] - pred[0]), em.residuos[i] / em.escala_y,
+                                   rtol=1e-5, atol=1e-8)
+
+
+def test_entrenar_rechaza_sistemas_demasiado_grandes():
+    from emulador import MAX_ENTRENAMIENTO
+    with pytest.raises(ValueError):
+        Emulador.entrenar(V, n=MAX_ENTRENAMIENTO + 1)
+
+
+def test_guardar_y_cargar(tmp_path):
+    em = Emulador.entrenar(V, n=20, limites=ventana(DEFECTO, 0.1), n_validacion=5, workers=1)
+    ruta = str(tmp_path / "emulador.npz")
+    em.guardar(ruta)
+    em.guardar(ruta)
+    assert os.listdir(tmp_path) == ["emulador.npz"]     # sin temporales sueltos
+    otro = Emulador.cargar(ruta)
+    P = np.array([DEFECTO])
+    np.testing.assert_allclose(otro.predecir(P)[0], em.predecir(P)[0])
+    assert otro.t_span == em.t_span and otro.V == em.V
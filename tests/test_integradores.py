@@ -0,0 +1,37 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from modelo import cstr_odes, cstr_jac, DEFECTO
+from integradores import Rosenbrock23
+
+
+Fa0, Fb0, Fm0, T0, Ta1, UA, mc = DEFECTO
+ARGS = (Fa0, Fb0, Fm0, (1/7.484)*500, UA, Ta1, mc, T0)
+Y0 = [0.0, 3.45, 0.0, 0.0, T0]
+
+
+def test_arranque_igual_a_bdf_estricto():
+    t_eval = np.linspace(0, 4, 50)
+    ref = solve_ivp(cstr_odes, (0, 4), Y0, method="BDF", jac=cstr_jac, args=ARGS,
+                    t_eval=t_eval, rtol=1e-10, atol=1e-12)
+    for jac in (cstr_jac, None):     # con Jacobiano analítico y por diferencias
+        sol = solve_ivp(cstr_odes, (0, 4), Y0, method=Rosenbrock23, jac=jac, args=ARGS,
+                        t_eval=t_eval, rtol=1e-6, atol=1e-8)
+        assert sol.success
+        escala = np.abs(ref.y).max(axis=1, keepdims=True)
+        assert np.max(np.abs(sol.y - ref.y) / escala) < 1e-4
+
+
+def test_rigido_con_pocos_pasos():
+    # y' = -1000 (y - cos t): un explícito necesita miles de pasos
+    sol = solve_ivp(lambda t, y: -1000 * (y - np.cos(t)), (0, 10), [0.0],
+                    method=Rosenbrock23, rtol=1e-3, atol=1e-6)
+    assert sol.success and sol.t.size < 300
+    assert abs(sol.y[0, -1] - np.cos(10)) < 1e-2
+
+
+def test_lado_derecho_nan_termina_con_error():
+    # antes un error NaN agrandaba el paso y rechazaba para siempre en t_bound
+    sol = solve_ivp(lambda t, y: -y if t < 0.5 else np.full_like(y, np.nan), (0, 1), [1.0],
+                    method=Rosenbrock23)
+    assert sol.status == -1 and sol.t[-1] < 0.5
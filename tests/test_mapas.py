@@ -0,0 +1,80 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+import mapas
+import trabajos
+from modelo import DEFECTO
+
+
+V = (1/7.484)*500
+EJES = ("Ta1", "UA")
+VENTANAS = ((40.0, 80.0), (8000.0, 24000.0))
+
+
+@pytest.fixture(autouse=True)
+def memoria(monkeypatch):
+    monkeypatch.setattr(mapas, "_memoria", OrderedDict())
+
+
+def calcular(**opciones):
+    return mapas.mapa_adaptativo(EJES, VENTANAS, DEFECTO, V, n_inicial=5, niveles=1,
+                                 workers=1, **opciones)
+
+
+def test_refina_y_reutiliza():
+    avances = []
+    mapa = calcular(progreso=avances.append)
+    assert mapa["puntos"].shape == (len(mapa["salidas"]), 2)
+    assert mapa["nuevos"] == len(mapa["puntos"]) > 25
+    # la grilla está alineada a la global, así que cubre la ventana (y puede pasarse)
+    assert np.all(mapa["puntos"].min(axis=0) <= np.min(VENTANAS, axis=1))
+    assert np.all(mapa["puntos"].max(axis=0) >= np.max(VENTANAS, axis=1))
+    assert avances == sorted(avances) and avances[-1] == 1.0
+
+    otra_vez = calcular()
+    assert otra_vez["nuevos"] == 0
+    np.testing.assert_array_equal(otra_vez["salidas"], mapa["salidas"])
+
+
+def test_cortar_desde_progreso_no_deja_memoria_a_medias():
+    def cortar(fraccion):
+        if fraccion > 0.5:
+            raise trabajos.Cancelado
+
+    with pytest.raises(trabajos.Cancelado):
+        calcular(progreso=cortar)
+    # quedan sólo los puntos de la grilla inicial, ya completos
+    guardados = len(mapas._memoria)
+    assert guardados > 0
+    assert calcular()["reutilizados"] == guardados
+
+
+def test_interpolar_queda_en_el_rango_simulado():
+    mapa = calcular()
+    x, y, Z = mapas.interpolar(mapa, resolucion=20)
+    assert Z.shape == (20, 20, 3)
+    assert x[0] == VENTANAS[0][0] and y[-1] == VENTANAS[1][1]
+    # interpolación lineal: no sale del rango de lo simulado
+    assert np.all(np.isfinite(Z))
+    assert np.all(Z >= mapa["salidas"].min(axis=0) - 1e-9)
+    assert np.all(Z <= mapa["salidas"].max(axis=0) + 1e-9)
+
+
+def test_mapa_como_trabajo(tmp_path, monkeypatch):
+    monkeypatch.setattr(trabajos, "DIRECTORIO_TRABAJOS", str(tmp_path))
+    spec = {"ejes": list(EJES), "ventanas": [list(v) for v in VENTANAS],
+            "base": list(DEFECTO), "V": V, "t_span": [0, 4], "n_inicial": 5, "niveles": 1,
+            "tol": 0.05, "T_lim": 180.0}
+    trabajo = trabajos.enviar("mapa", spec)
+    fin = time.time() + 120
+    while trabajos.obtener(trabajo.id).activo:
+        assert time.time() < fin, "el trabajo no terminó"
+        time.sleep(0.05)
+    trabajo = trabajos.obtener(trabajo.id)
+    assert trabajo.estado == "terminado", trabajo.error
+    datos = trabajo.resultado()
+    assert datos["ejes"] == list(EJES)
+    assert np.shape(datos["salidas"]) == (len(datos["puntos"]), 3)
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+import diagnostico
+from modelo import (cstr_odes, cstr_jac, cstr_dfdp, simular_lote, estados_estacionarios,
+                    Reactor, PARAMETROS, DEFECTO, LOTE_MINIMO)
+from kernel import constantes, _rhs, _jac
+
+
+V = (1/7.484)*500
+Fa0, Fb0, Fm0, T0, Ta1, UA, mc = DEFECTO
+ARGS = (Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0)
+# estados de prueba: arranque, cerca de la ignición y reactor encendido
+ESTADOS = [np.array([0.0, 3.45, 0.0, 0.0, 75.0]),
+           np.array([0.4, 2.9, 0.1, 0.3, 110.0]),
+           np.array([0.05, 2.6, 0.5, 0.3, 150.0])]
+
+
+def diferencias(f, x, h=1e-6):
+    """Jacobiano de f en x por diferencias centradas, con paso relativo"""
+    x = np.asarray(x, dtype=float)
+    columnas = []
+    for j in range(len(x)):
+        paso = h * max(abs(x[j]), 1.0)
+        dx = np.zeros_like(x)
+        dx[j] = paso
+        columnas.append((np.asarray(f(x + dx)) - np.asarray(f(x - dx))) / (2 * paso))
+    return np.column_stack(columnas)
+
+
+@pytest.mark.parametrize("y", ESTADOS)
+def test_jacobiano_igual_a_diferencias(y):
+    numerico = diferencias(lambda z: cstr_odes(0.0, z, *ARGS), y)
+    np.testing.assert_allclose(cstr_jac(0.0, y, *ARGS), numerico, rtol=1e-5, atol=1e-7)
+
+
+@pytest.mark.parametrize("y", ESTADOS)
+def test_dfdp_igual_a_diferencias(y):
+    def f(p):
+        d = dict(zip(PARAMETROS, p))
+        return cstr_odes(0.0, y, d["Fa0"], d["Fb0"], d["Fm0"], V, d["UA"], d["Ta1"], d["mc"],
+                         d["T0"])
+    numerico = diferencias(f, DEFECTO)
+    np.testing.assert_allclose(cstr_dfdp(0.0, y, *ARGS), numerico, rtol=1e-5, atol=1e-7)
+
+
+@pytest.mark.parametrize("y", ESTADOS)
+def test_kernel_igual_al_modelo(y):
+    c = constantes(*ARGS)
+    np.testing.assert_allclose(_rhs(y, c, np.empty(5)), cstr_odes(0.0, y, *ARGS),
+                               rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(_jac(y, c, np.empty((5, 5))), cstr_jac(0.0, y, *ARGS),
+                               rtol=1e-12, atol=1e-12)
+
+
+def test_estado_estacionario_igual_a_integracion_larga():
+    estables = [e["y"] for e in estados_estacionarios(*ARGS) if e["estable"]]
+    sol = solve_ivp(cstr_odes, (0, 200), ESTADOS[0], method="BDF", jac=cstr_jac, args=ARGS,
+                    rtol=1e-10, atol=1e-12)
+    final = sol.y[:, -1]
+    distancias = [np.max(np.abs(final - y) / np.maximum(np.abs(y), 1.0)) for y in estables]
+    assert min(distancias) < 1e-6
+
+
+@pytest.mark.parametrize("n", [5, LOTE_MINIMO + 8])     # en serie y en lote
+def test_simular_lote_igual_a_cada_fila(n):
+    P = np.tile(DEFECTO, (n, 1)).astype(float)
+    P[:, PARAMETROS.index("Fa0")] = np.linspace(50, 150, n)
+    t_eval = np.linspace(0, 4, 50)
+    _, Y = simular_lote(P, V, (0, 4), t_eval, rtol=1e-8, atol=1e-10)
+    for fila, Yi in zip(P, Y):
+        d = dict(zip(PARAMETROS, fila))
+        args = (d["Fa0"], d["Fb0"], d["Fm0"], V, d["UA"], d["Ta1"], d["mc"], d["T0"])
+        sol = solve_ivp(cstr_odes, (0, 4), [0.0, 3.45, 0.0, 0.0, d["T0"]], method="BDF",
+                        jac=cstr_jac, args=args, t_eval=t_eval, rtol=1e-10, atol=1e-12)
+        escala = np.abs(sol.y).max(axis=1, keepdims=True)
+        assert np.max(np.abs(Yi - sol.y) / escala) < 1e-5
+
+
+def test_simular_lote_que_falla_se_integra_por_punto(monkeypatch):
+    resolver = diagnostico.resolver
+
+    def falla_el_lote(*args, etiqueta="", **kwargs):
+        sol = resolver(*args, etiqueta=etiqueta, **kwargs)
+        if etiqueta == "simular_lote":
+            sol.status, sol.success = -1, False
+            sol.t, sol.y = sol.t[:3], sol.y[:, :3]     # trayectoria truncada
+        return sol
+
+    monkeypatch.setattr(diagnostico, "resolver", falla_el_lote)
+    P = np.tile(DEFECTO, (LOTE_MINIMO, 1)).astype(float)
+    t_eval = np.linspace(0, 4, 20)
+    t, Y = simular_lote(P, V, (0, 4), t_eval)
+    assert Y.shape == (LOTE_MINIMO, 5, 20) and np.isfinite(Y).all()
+    np.testing.assert_array_equal(t, t_eval)
+
+
+def test_tramos_sin_t_eval_no_repiten_tiempos():
+    def mc(t):
+        return 1000.0 if t < 1 else 2000.0 if t < 2 else 1500.0
+    mc.cortes = (1.0, 2.0)
+    sol = Reactor(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0).simulate((0, 4))
+    assert sol.success and np.all(np.diff(sol.t) > 0)
+    assert sol.t[0] == 0 and sol.t[-1] == 4
+    assert sol.y.shape == (5, len(sol.t))
+
+
+def test_simulacion_progresiva_igual_a_simulate():
+    from simulacion_progresiva import simular_progresivo
+    tramos = list(simular_progresivo(Fa0, Fb0, Fm0, V, UA, Ta1, mc, T0, t_max=4.0,
+                                     tasa_estacionaria=0.0, rtol=1e-8, atol=1e-10))
+    t = np.concatenate([tr[0] for tr in tramos])
+    y = np.hstack([tr[1] for tr in tramos])
+    ref = Reactor(*ARGS).simulate((0, 4), t, rtol=1e-10, atol=1e-12)
+    escala = np.abs(ref.y).max(axis=1, keepdims=True)
+    assert np.max(np.abs(y - ref.y) / escala) < 1e-5
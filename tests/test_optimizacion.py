@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from modelo import DEFECTO, PARAMETROS
+from optimizacion import _Problema, optimizar, optimizar_multistart, VARIABLES
+
+
+V = (1/7.484)*500
+
+
+@pytest.mark.parametrize("objetivo", ["X", "produccion"])
+def test_gradientes_por_sensibilidades(objetivo):
+    # los gradientes de las ecuaciones de sensibilidad contra diferencias centradas
+    prob = _Problema(DEFECTO, V, 180.0, VARIABLES, objetivo, (0, 4), 400)
+    x = np.full(len(VARIABLES), 0.4)
+    analitico = prob.jac(x), prob.jac_g(x)
+    h = 1e-5
+    numerico = np.zeros((2, len(x)))
+    for j in range(len(x)):
+        e = np.zeros(len(x))
+        e[j] = h
+        numerico[0, j] = (prob.fun(x + e) - prob.fun(x - e)) / (2*h)
+        numerico[1, j] = (prob.g(x + e) - prob.g(x - e)) / (2*h)
+    np.testing.assert_allclose(analitico[0], numerico[0], rtol=1e-3, atol=1e-5)
+    np.testing.assert_allclose(analitico[1], numerico[1], rtol=1e-3, atol=1e-5)
+
+
+def test_optimo_sobre_el_limite_de_temperatura():
+    r = optimizar(DEFECTO, V, variables=("Ta1",), n_puntos=100)
+    assert r["exito"] and r["factible"]
+    # partiendo de DEFECTO (T_pico ~151 °F) conviene calentar hasta tocar el límite
+    assert r["T_pico"] == pytest.approx(180.0, abs=0.1)
+    assert r["parametros"]["Ta1"] > DEFECTO[PARAMETROS.index("Ta1")]
+    assert r["X"] > 0.9
+
+
+def test_multistart_ordena_factibles_primero():
+    resultados = optimizar_multistart(DEFECTO, V, n_inicios=3, workers=2, variables=("Ta1",),
+                                      n_puntos=100, max_iter=5)
+    assert len(resultados) == 3
+    claves = [(not r["factible"], -r["objetivo"]) for r in resultados]
+    assert claves == sorted(claves)
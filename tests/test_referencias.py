@@ -0,0 +1,18 @@
+"""Los casos de benchmarks/suite.py contra sus trayectorias de referencia."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "benchmarks"))
+import suite  # noqa: E402
+
+
+@pytest.mark.parametrize("nombre", list(suite.CASOS))
+def test_caso_igual_a_la_referencia(nombre):
+    referencia = np.load(suite.RUTA_REFERENCIAS)[nombre]
+    resultado, _ = suite.CASOS[nombre][0](**suite.VERIFICACION)
+    error = suite.error_relativo(resultado, referencia, suite.EJE_VARIABLES[nombre])
+    assert error <= suite.TOLERANCIAS[nombre]
@@ -0,0 +1,33 @@
+import numpy as np
+
+from modelo import DEFECTO, PARAMETROS
+from sensibilidad_global import evaluar, evaluar_paralelo, sobol, morris
+
+
+V = (1/7.484)*500
+
+
+def _puntos(n):
+    P = np.tile(DEFECTO, (n, 1)).astype(float)
+    P[:, PARAMETROS.index("Ta1")] = np.linspace(40, 80, n)
+    return P
+
+
+def test_paralelo_igual_a_evaluar():
+    P = _puntos(10)
+    avances = []
+    Y = evaluar_paralelo(P, V, workers=2, lote=4, progreso=lambda h, t: avances.append((h, t)))
+    np.testing.assert_allclose(Y, evaluar(P, V), rtol=1e-10)
+    assert avances == [(4, 10), (8, 10), (10, 10)]
+
+
+def test_sobol_y_morris_sobre_el_pool():
+    limites = [(v, v) for v in DEFECTO]
+    i = PARAMETROS.index("Ta1")
+    limites[i] = (50.0, 70.0)
+    pasos = list(sobol(limites, V, n_base=8, bloque=8, n_boot=10, workers=2))
+    assert pasos[-1]["parametros"] == ["Ta1"]
+    assert pasos[-1]["n"] == 8
+    pasos = list(morris(limites, V, r=4, bloque=4, n_boot=10, workers=2))
+    assert pasos[-1]["n"] == 4
+    assert np.all(np.isfinite(pasos[-1]["mu_estrella"]))
@@ -0,0 +1,93 @@
+import os
+import json
+import time
+
+import pytest
+
+import trabajos
+
+
+@pytest.fixture(autouse=True)
+def directorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(trabajos, "DIRECTORIO_TRABAJOS", str(tmp_path))
+    return tmp_path
+
+
+def esperar(id, limite=60):
+    fin = time.time() + limite
+    while trabajos.obtener(id).activo:
+        assert time.time() < fin, "el trabajo no terminó"
+        time.sleep(0.05)
+    return trabajos.obtener(id)
+
+
+def lento(trabajo):
+    for i in range(400):
+        time.sleep(0.01)
+        trabajo.avanzar(i / 400)
+
+
+def test_ids_con_otro_formato_no_tocan_el_disco(directorio):
+    (directorio.parent / "trabajo.json").write_text(json.dumps({"id": "x"}))
+    for id in ("../x", "..", "", None, "0123456789abcdeF", "0123456789abcdef0"):
+        assert not trabajos.valido(id)
+        assert trabajos.obtener(id) is None
+    assert trabajos.valido(trabajos.huella("barrido", {}))
+
+
+def test_barrido_terminado_se_reutiliza(monkeypatch):
+    monkeypatch.setitem(trabajos.TIPOS, "barrido", lambda t: t.guardar_resultado([1, 2]))
+    primero = esperar(trabajos.enviar("barrido", {"n": 3}).id)
+    segundo = trabajos.enviar("barrido", {"n": 3})
+    assert segundo.estado == "terminado" and segundo.id == primero.id
+    assert segundo.resultado() == [1, 2]
+
+
+def test_emulador_terminado_se_vuelve_a_correr(monkeypatch):
+    corridas = []
+    monkeypatch.setitem(trabajos.TIPOS, "emulador", corridas.append)
+    esperar(trabajos.enviar("emulador", {"n": 3}).id)
+    esperar(trabajos.enviar("emulador", {"n": 3}).id)
+    assert len(corridas) == 2
+
+
+def test_cancelar(monkeypatch):
+    monkeypatch.setitem(trabajos.TIPOS, "barrido", lento)
+    trabajo = trabajos.enviar("barrido", {"n": 4})
+    time.sleep(0.1)
+    trabajos.cancelar(trabajo.id)
+    assert esperar(trabajo.id).estado == "cancelado"
+
+
+def test_cancelar_desde_otro_proceso_por_archivo(monkeypatch):
+    monkeypatch.setitem(trabajos.TIPOS, "barrido", lento)
+    trabajo = trabajos.enviar("barrido", {"n": 5})
+    # lo que hace cancelar() en otro proceso: sólo el archivo marcador
+    open(os.path.join(trabajo.directorio, "cancelar"), "w").close()
+    trabajo.latir()
+    assert esperar(trabajo.id).estado == "cancelado"
+
+
+def test_latido_vencido_es_interrumpido(directorio):
+    id = trabajos.huella("barrido", {"n": 6})
+    os.makedirs(directorio / id)
+    trabajo = trabajos.Trabajo(id, "barrido", {"n": 6}, estado="en curso")
+    trabajo.guardar()
+    assert trabajos.obtener(id).estado == "en curso"     # otro proceso, latido fresco
+
+    datos = json.loads((directorio / id / "trabajo.json").read_text())
+    datos["latido"] = time.time() - 2 * trabajos.VENCIDO
+    (directorio / id / "trabajo.json").write_text(json.dumps(datos))
+    assert trabajos.obtener(id).estado == "interrumpido"
+
+
+def test_latido_de_un_trabajo_viejo_no_pisa_el_reenvio(monkeypatch):
+    monkeypatch.setitem(trabajos.TIPOS, "barrido", lambda t: 1 / 0)
+    viejo = trabajos.enviar("barrido", {"n": 7})   # el objeto que tiene el hilo de latido
+    esperar(viejo.id)
+    monkeypatch.setitem(trabajos.TIPOS, "barrido", lento)
+    nuevo = trabajos.enviar("barrido", {"n": 7})
+    viejo.latir()
+    assert trabajos._cargar(nuevo.id).estado in trabajos.ACTIVOS   # lo que hay en disco
+    trabajos.cancelar(nuevo.id)
+    esperar(nuevo.id)
@@ -0,0 +1,353 @@
+"""Trabajos en segundo plano: barridos y estudios por lotes fuera del script de Streamlit.
+
+Cada trabajo corre en un hilo del servidor (a lo sumo TAC_TRABAJOS a la vez;
+los barridos en paralelo y los mapas usan además el pool de procesos), así
+que un rerun o un cambio de widget no lo interrumpe y la página sólo consulta
+su avance. El id es una huella de (tipo, especificación): pedir dos veces el
+mismo barrido, desde la misma sesión o desde otra, devuelve el mismo trabajo.
+Los entrenamientos del emulador sólo se deduplican mientras están activos: al
+terminar pisan el modelo compartido, así que volver a pedirlos los vuelve a correr.
+
+Cada trabajo tiene un directorio en DIRECTORIO/trabajos/<id> con su estado
+(trabajo.json) y su resultado (un AlmacenBarrido o resultado.json), de modo
+que los resultados sobreviven a reruns, sesiones y reinicios del servidor.
+Mientras un trabajo está vivo, un hilo de latido refresca cada LATIDO segundos
+el pid y la hora en trabajo.json; uno que quedó "en curso" en disco con el latido
+vencido (servidor caído o reiniciado) se informa como "interrumpido" y puede
+volver a enviarse. Para cancelar desde otro proceso se deja un archivo
+"cancelar" en su directorio, que el proceso dueño ve en el siguiente latido.
+"""
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from almacen import DIRECTORIO, AlmacenBarrido
+
+
+DIRECTORIO_TRABAJOS = os.path.join(DIRECTORIO, "trabajos")
+MAX_SIMULTANEOS = int(os.environ.get("TAC_TRABAJOS", "2"))
+MAX_GUARDADOS = 50          # trabajos terminados que se conservan en disco
+ACTIVOS = ("en cola", "en curso")
+CON_EFECTOS = {"emulador"}  # tipos cuyo resultado no queda sólo en su directorio
+LATIDO = 5.0                # s entre latidos de los trabajos vivos
+VENCIDO = 30.0              # s sin latido para dar un trabajo por interrumpido
+
+ID = re.compile(r"[0-9a-f]{16}")   # formato de huella(); los ids llegan de la URL
+
+_trabajos = {}              # id -> Trabajo con hilo vivo en este proceso
+_lock = threading.Lock()
+_ejecutor = None
+
+
+class Cancelado(Exception):
+    pass
+
+
+class Trabajo:
+
+    def __init__(self, id, tipo, spec, estado="en cola", progreso=0.0, creado=None,
+                 terminado=None, error=None, pid=None, latido=None):
+        self.id = id
+        self.tipo = tipo
+        self.spec = spec
+        self.estado = estado
+        self.progreso = progreso
+        self.creado = creado or time.time()
+        self.terminado = terminado
+        self.error = error
+        self.pid = pid or os.getpid()
+        self.latido = latido or time.time()
+        self._cancelar = threading.Event()
+        self._guardado = 0.0
+        self._lock_disco = threading.Lock()
+
+    @property
+    def directorio(self):
+        return os.path.join(DIRECTORIO_TRABAJOS, self.id)
+
+    @property
+    def activo(self):
+        return self.estado in ACTIVOS
+
+    @property
+    def vencido(self):
+        return time.time() - self.latido > VENCIDO
+
+    def cancelar(self):
+        self._cancelar.set()
+        # el hilo puede estar en otro proceso: se le avisa por disco
+        try:
+            open(os.path.join(self.directorio, "cancelar"), "w").close()
+        except OSError:
+            pass
+
+    def latir(self):
+        """Refresca el latido en disco y recoge un pedido de cancelación de otro proceso.
+
+        Sólo escribe si sigue siendo el trabajo vivo con ese id: uno que ya
+        terminó no debe pisar el trabajo.json de un reenvío con la misma huella."""
+        with _lock:
+            if _trabajos.get(self.id) is not self:
+                return
+            if os.path.exists(os.path.join(self.directorio, "cancelar")):
+                self._cancelar.set()
+            self.guardar()
+
+    def avanzar(self, fraccion):
+        """Lo llama el trabajo entre bloques; si se pidió cancelar, lo corta acá"""
+        self.progreso = float(fraccion)
+        if self._cancelar.is_set():
+            raise Cancelado
+        # el estado en disco es para otros procesos: basta con refrescarlo cada tanto
+        if time.monotonic() - self._guardado > 1.0:
+            self.guardar()
+
+    def a_dict(self):
+        return {"id": self.id, "tipo": self.tipo, "spec": self.spec, "estado": self.estado,
+                "progreso": self.progreso, "creado": self.creado,
+                "terminado": self.terminado, "error": self.error, "pid": self.pid,
+                "latido": self.latido}
+
+    def guardar(self):
+        # lo llaman el hilo del trabajo y el de latido
+        with self._lock_disco:
+            self._guardado = time.monotonic()
+            self.latido = time.time()
+            ruta = os.path.join(self.directorio, "trabajo.json")
+            with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self.a_dict(), f)
+            os.replace(ruta + ".tmp", ruta)
+
+    def resultado(self):
+        """AlmacenBarrido si el trabajo guardó trayectorias, si no lo de resultado.json"""
+        if os.path.exists(os.path.join(self.directorio, "meta.json")):
+            return AlmacenBarrido(self.directorio)
+        ruta = os.path.join(self.directorio, "resultado.json")
+        if os.path.exists(ruta):
+            with open(ruta, encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def guardar_resultado(self, datos):
+        with open(os.path.join(self.directorio, "resultado.json"), "w", encoding="utf-8") as f:
+            json.dump(datos, f)
+
+
+def huella(tipo, spec):
+    texto = json.dumps([tipo, spec], sort_keys=True, default=float)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:16]
+
+
+def _obtener_ejecutor():
+    global _ejecutor
+    if _ejecutor is None:
+        _ejecutor = ThreadPoolExecutor(max_workers=MAX_SIMULTANEOS,
+                                       thread_name_prefix="tac-trabajo")
+        threading.Thread(target=_latir, name="tac-latido", daemon=True).start()
+    return _ejecutor
+
+
+def _latir():
+    while True:
+        time.sleep(LATIDO)
+        with _lock:
+            vivos = list(_trabajos.values())
+        for trabajo in vivos:
+            try:
+                trabajo.latir()
+            except OSError:
+                pass    # directorio borrado a mano: el trabajo falla por su cuenta
+
+
+def valido(id):
+    """Si id tiene el formato de huella(); cualquier otra cosa no se junta a una ruta"""
+    return isinstance(id, str) and ID.fullmatch(id) is not None
+
+
+def _cargar(id):
+    if not valido(id):
+        return None
+    ruta = os.path.join(DIRECTORIO_TRABAJOS, id, "trabajo.json")
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            datos = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if datos.get("id") != id:
+        return None
+    trabajo = Trabajo(**datos)
+    if trabajo.activo and trabajo.vencido:
+        trabajo.estado = "interrumpido"
+    return trabajo
+
+
+def obtener(id):
+    """El trabajo con ese id (vivo o guardado en disco), o None"""
+    with _lock:
+        return _trabajos.get(id) or _cargar(id)
+
+
+def enviar(tipo, spec):
+    """Encola el trabajo, o devuelve el que ya existe con la misma huella si
+    está en curso o terminado (sólo en curso para los tipos de CON_EFECTOS).
+    Los cancelados, fallidos o interrumpidos se vuelven a correr desde cero."""
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+    id = huella(tipo, spec)
+    with _lock:
+        trabajo = _trabajos.get(id) or _cargar(id)
+        reutilizables = ACTIVOS if tipo in CON_EFECTOS else ACTIVOS + ("terminado",)
+        if trabajo is not None and trabajo.estado in reutilizables:
+            return trabajo
+        shutil.rmtree(os.path.join(DIRECTORIO_TRABAJOS, id), ignore_errors=True)
+        trabajo = Trabajo(id, tipo, spec)
+        os.makedirs(trabajo.directorio)
+        trabajo.guardar()
+        _trabajos[id] = trabajo
+        _obtener_ejecutor().submit(_correr, trabajo)
+    limpiar()
+    return trabajo
+
+
+def cancelar(id):
+    """Pide cortar el trabajo, corra en este proceso o en otro"""
+    trabajo = obtener(id)
+    if trabajo is not None and trabajo.activo:
+        trabajo.cancelar()
+
+
+def listar(n=20):
+    """Los n trabajos más recientes, vivos o en disco"""
+    if not os.path.isdir(DIRECTORIO_TRABAJOS):
+        return []
+    trabajos = [obtener(id) for id in os.listdir(DIRECTORIO_TRABAJOS) if valido(id)]
+    trabajos = [t for t in trabajos if t is not None]
+    return sorted(trabajos, key=lambda t: t.creado, reverse=True)[:n]
+
+
+def limpiar(max_guardados=MAX_GUARDADOS):
+    """Borra los trabajos terminados más viejos; los activos no se tocan"""
+    viejos = [t for t in listar(n=None) if not t.activo][max_guardados:]
+    for trabajo in viejos:
+        shutil.rmtree(trabajo.directorio, ignore_errors=True)
+
+
+def _correr(trabajo):
+    estado, error = "terminado", None
+    try:
+        trabajo.avanzar(0.0)    # cancelado mientras esperaba en la cola
+        trabajo.estado = "en curso"
+        trabajo.guardar()
+        TIPOS[trabajo.tipo](trabajo)
+    except Cancelado:
+        estado = "cancelado"
+    except Exception as e:
+        estado, error = "error", f"{type(e).__name__}: {e}"
+    # el cierre va entero bajo el lock: enviar() ve el trabajo activo o ya guardado
+    # y fuera del registro, nunca a medias (si no, un reenvío borraría el
+    # directorio mientras este hilo todavía escribe en él)
+    with _lock:
+        trabajo.estado, trabajo.error = estado, error
+        if estado == "terminado":
+            trabajo.progreso = 1.0
+        trabajo.terminado = time.time()
+        try:
+            trabajo.guardar()
+        finally:
+            _trabajos.pop(trabajo.id, None)
+
+
+# --- tipos de trabajo ---
+
+def _barrido(trabajo):
+    """spec: motor ("lote", "paralelo", "estacionario", "emulador"), param,
+    inicio, fin, n, base (7 parámetros), V, t_span, n_t, y0, chunk, tolerancias"""
+    from modelo import PARAMETROS, Reactor, simular_lote
+
+    spec = trabajo.spec
+    valores = np.linspace(spec["inicio"], spec["fin"], spec["n"])
+    P = np.tile(np.asarray(spec["base"], dtype=float), (len(valores), 1))
+    P[:, PARAMETROS.index(spec["param"])] = valores
+    V, t_span = spec["V"], tuple(spec["t_span"])
+
+    if spec["motor"] == "estacionario":
+        # sin integrar en el tiempo: todos los estados estacionarios de cada punto
+        filas = []
+        for k, (val, fila) in enumerate(zip(valores, P)):
+            estados = Reactor.desde_fila(fila, V).steady_state()
+            for ss in estados:
+                Ca, Cb, Cc, Cm, T = ss["y"]
+                filas.append({spec["param"]: val, "Ca_final": Ca, "Cb_final": Cb,
+                              "Cc_final": Cc, "Cm_final": Cm, "T_final": T,
+                              "X_final": ss["X"], "estable": bool(ss["estable"]),
+                              "n_estados": len(estados)})
+            trabajo.avanzar((k + 1) / len(P))
+        trabajo.guardar_resultado(filas)
+
+    elif spec["motor"] == "emulador":
+        from emulador import Emulador, predecir_o_simular
+        F, err, simulado = predecir_o_simular(Emulador.cargar(), P, V, spec["tolerancias"],
+                                              t_span)
+        filas = [{spec["param"]: val, "X_final": f[0], "T_final": f[1], "T_pico": f[2],
+                  "error_X": e[0], "error_T_final": e[1], "error_T_pico": e[2],
+                  "fuente": "integrador" if s else "emulador"}
+                 for val, f, e, s in zip(valores, F.tolist(), err.tolist(), simulado)]
+        trabajo.guardar_resultado(filas)
+
+    elif spec["motor"] in ("lote", "paralelo"):
+        # las trayectorias completas van a disco por bloques
+        t_eval = np.linspace(t_span[0], t_span[1], spec["n_t"])
+        almacen = AlmacenBarrido.crear(P, V, t_eval, directorio=trabajo.directorio,
+                                       param=spec["param"])
+        if spec["motor"] == "lote":
+            # cada bloque se simula como un único sistema
+            for inicio in range(0, len(P), spec["chunk"]):
+                idx = np.arange(inicio, min(inicio + spec["chunk"], len(P)))
+                _, Y = simular_lote(P[idx], V, t_span, t_eval, y0=spec["y0"])
+                almacen.escribir(idx, Y)
+                trabajo.avanzar(almacen.hecho.mean())
+        else:
+            from barrido import barrido_paralelo
+            # al cortar el generador (cancelación) se cancelan los bloques pendientes
+            for idx, Y in barrido_paralelo(P, V, t_span, t_eval, y0=spec["y0"],
+                                           chunk=spec["chunk"]):
+                almacen.escribir(idx, Y)
+                trabajo.avanzar(almacen.hecho.mean())
+
+    else:
+        raise ValueError(f"Motor de barrido desconocido: {spec['motor']}")
+
+
+def _emulador(trabajo):
+    """spec: V, n, limites (7 x 2), t_span. Entrena y guarda el emulador en emulador.RUTA"""
+    from emulador import Emulador
+    spec = trabajo.spec
+    emulador = Emulador.entrenar(spec["V"], n=spec["n"], limites=spec["limites"],
+                                 t_span=tuple(spec["t_span"]),
+                                 progreso=lambda hechos, total: trabajo.avanzar(hechos / total))
+    emulador.guardar()
+    trabajo.guardar_resultado({k: np.asarray(v).tolist()
+                               for k, v in emulador.validacion.items()})
+
+
+def _mapa(trabajo):
+    """spec: ejes, ventanas, base (7 parámetros), V, t_span, n_inicial, niveles, tol, T_lim.
+    Guarda el resultado de mapas.mapa_adaptativo con los arreglos como listas"""
+    from mapas import mapa_adaptativo
+    spec = trabajo.spec
+    mapa = mapa_adaptativo(spec["ejes"], spec["ventanas"], spec["base"], spec["V"],
+                           tuple(spec["t_span"]), n_inicial=spec["n_inicial"],
+                           niveles=spec["niveles"], tol=spec["tol"], T_lim=spec["T_lim"],
+                           progreso=trabajo.avanzar)
+    trabajo.guardar_resultado({k: np.asarray(v).tolist() if isinstance(v, np.ndarray) else v
+                               for k, v in mapa.items()})
+
+
+TIPOS = {"barrido": _barrido, "emulador": _emulador, "mapa": _mapa}